@@ -0,0 +1,183 @@
+"""
+Benchmarks of pfpy against equivalent hand-written Python.
+
+Run from the root of the repository with
+
+    python benchmarks/bench.py [--quick] [--output results.json] [--compare baseline.json]
+
+Every benchmark reports the best time per call in nanoseconds, measured with timeit over
+several repeats, for both pfpy and its baseline. Results are written as JSON so that runs of
+different releases can be compared with --compare.
+"""
+from argparse import ArgumentParser
+from math import factorial
+from timeit import Timer
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pfpy import Function, Predicate, PipelineCache, identity, curry, rcurry  # noqa: E402
+from pfpy import curried  # noqa: E402
+
+def measure(f, number, repeat):
+    """Return the best time in nanoseconds per call of the nullary function f."""
+    return min(Timer(f).repeat(repeat=repeat, number=number)) / number * 1e9
+
+def add1(x):
+    return x + 1
+
+def is_positive(x):
+    return x > 0
+
+def is_even(x):
+    return x % 2 == 0
+
+def is_small(x):
+    return abs(x) < 100
+
+def composition(depth):
+    """Return a chain of depth compositions of add1 built with >> and its hand-written baseline."""
+    f = Function(add1)
+    for _ in range(depth - 1):
+        f = f >> add1
+
+    def baseline(x):
+        for _ in range(depth):
+            x = add1(x)
+        return x
+    return f, baseline
+
+def taylor(terms):
+    """Return the Taylor series of sine from the README with the given number of terms and its baseline."""
+    f = sum((pow(-1, k) / factorial(2 * k + 1)) * (identity ** (2 * k + 1)) for k in range(terms))
+    coefficients = [(pow(-1, k) / factorial(2 * k + 1), 2 * k + 1) for k in range(terms)]
+
+    def baseline(x):
+        return sum(c * x ** n for c, n in coefficients)
+    return f, baseline
+
+def benchmarks(quick):
+    """Yield the name, pfpy function, baseline function and argument of every benchmark."""
+    for depth in ([1, 10, 100] if quick else [1, 10, 100, 1000]):
+        f, baseline = composition(depth)
+        yield "composition/depth={}".format(depth), f, baseline, 1
+
+    for terms in [5, 20]:
+        f, baseline = taylor(terms)
+        yield "taylor/terms={}".format(terms), f, baseline, 0.5
+        yield "taylor/terms={}/compiled".format(terms), f.compile(), baseline, 0.5
+
+    add3 = curry(3)(lambda x, y, z: x + y + z)
+    yield "curry/one-at-a-time", lambda x: add3(1)(2)(x), lambda x: 1 + 2 + x, 3
+    yield "curry/together", lambda x: add3(1, 2)(x), lambda x: 1 + 2 + x, 3
+    pow2 = rcurry(2)(pow)(2)
+    yield "rcurry/bound", pow2, lambda x: pow(x, 2), 3
+
+    p, q, r = Predicate(is_positive), Predicate(is_even), Predicate(is_small)
+    yield "predicate/and", p & q & r, lambda x: is_positive(x) and is_even(x) and is_small(x), 42
+    yield "predicate/or", p | q | r, lambda x: is_positive(x) or is_even(x) or is_small(x), -41
+    yield "predicate/and/compiled", (p & q & r).compile(), lambda x: is_positive(x) and is_even(x) and is_small(x), 42
+
+    data = list(range(-500, 500))
+    pipeline = curried.map(curried.mul(3)) >> curried.filter(curried.gt(0)) >> curried.map(curried.add(1)) >> sum
+    yield ("curried/map-filter", pipeline,
+           lambda xs: sum(x * 3 + 1 for x in xs if x * 3 > 0), data)
+    yield ("curried/map-filter/stream", pipeline.stream(),
+           lambda xs: sum(x * 3 + 1 for x in xs if x * 3 > 0), data)
+
+def construction(number, repeat):
+    """Return the time in nanoseconds to build a Function and to compose two of them, and bytes per Function."""
+    f = Function(add1)
+    results = {"construct_ns": measure(lambda: Function(add1), number, repeat),
+               "compose_ns": measure(lambda: f >> f, number, repeat)}
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    functions = [Function(add1) for _ in range(10000)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    results["bytes_per_function"] = size / len(functions)
+    return results
+
+def rule(k):
+    """Return the k-th of a set of rules on records, as a worker would build them on startup."""
+    return ((curried.getitem("a") >> curried.gt(k)) & (curried.getitem("b") >> curried.lt(k * 2))
+            | (curried.getitem("c") >> curried.eq(str(k))))
+
+def startup(quick, repeat):
+    """
+    Return the time in nanoseconds per function for a worker to build and compile a set of Taylor series
+    and of rules, and to load them from a warm PipelineCache instead, keyed by their structure or by name.
+    """
+    results = {}
+    for name, build, count in [("taylor", lambda k: taylor(10 + k % 10)[0], 200), ("rules", rule, 500)]:
+        count = count // 10 if quick else count
+        with tempfile.TemporaryDirectory() as directory:
+            cache = PipelineCache(directory)
+            for k in range(count):
+                cache.compile(build(k))
+                cache.get(str(k), lambda: build(k))
+            for key, start in [("compile_ns", lambda k: build(k).compile()),
+                               ("cache_compile_ns", lambda k: cache.compile(build(k))),
+                               ("cache_get_ns", lambda k: cache.get(str(k), lambda: build(k)))]:
+                times = []
+                for _ in range(repeat):
+                    begin = time.perf_counter()
+                    for k in range(count):
+                        start(k)
+                    times.append(time.perf_counter() - begin)
+                results["{}/{}".format(name, key)] = min(times) / count * 1e9
+    return results
+
+def run(quick):
+    """Return the results of every benchmark as a JSON serializable dict."""
+    number, repeat = (1000, 3) if quick else (10000, 5)
+    results = {}
+    for name, f, baseline, x in benchmarks(quick):
+        assert f(x) == baseline(x), name
+        scale = 100 if isinstance(x, list) else 1  # Loops over data are much slower per call
+        pfpy_ns = measure(lambda: f(x), max(number // scale, 1), repeat)
+        baseline_ns = measure(lambda: baseline(x), max(number // scale, 1), repeat)
+        results[name] = {"pfpy_ns": pfpy_ns, "baseline_ns": baseline_ns, "overhead": pfpy_ns / baseline_ns}
+    results["construction"] = construction(number, repeat)
+    results["startup"] = startup(quick, repeat)
+    return {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "quick": quick, "results": results}
+
+def compare(results, baseline):
+    """Print the ratio of every pfpy time in results to the same time in baseline."""
+    for name, result in results["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        for key, value in result.items():
+            if key.endswith("_ns") and key != "baseline_ns":
+                print("{:40} {:16} {:8.2f}x".format(name, key, value / before[key]))
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="use fewer and shorter runs")
+    parser.add_argument("--output", help="file to write the results to instead of standard output")
+    parser.add_argument("--compare", help="results of a previous run to compare against")
+    args = parser.parse_args()
+
+    results = run(args.quick)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,33 @@
 from pfpy._function import *
 from pfpy._predicate import *
 from pfpy._curry import *
+from pfpy._pipeline import *
+from pfpy import _function, _predicate, _curry, _pipeline
+
+# Names of the optional features mapped to the modules defining them, which are only imported once used
+features = {
+    "AdaptivePredicate": "_adaptive",
+    "CacheInfo": "_memoize",
+    "AsyncFunction": "_async", "asynchronous": "_async", "amap": "_async",
+    "structure": "_structure", "rebuild": "_structure", "fingerprint": "_structure",
+    "PipelineCache": "_cache",
+    "Profile": "_profile",
+    "external_sorted": "_sorting",
+    "SlidingWindow": "_window",
+    "read_lines": "_source", "read_records": "_source", "read_chunks": "_source",
+    "Dataset": "_dataset",
+    "Interner": "_intern", "intern": "_intern",
+}
+
+__all__ = _function.__all__ + _predicate.__all__ + _curry.__all__ + _pipeline.__all__ + list(features)
+
+def __getattr__(name):
+    if name not in features:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    # Each feature is only imported the first time one of its names is used, then cached as a global
+    from importlib import import_module
+    module = import_module("pfpy." + features[name])
+    return globals().setdefault(name, getattr(module, name))
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
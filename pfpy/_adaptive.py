@@ -0,0 +1,166 @@
+from pfpy._predicate import Predicate
+from pfpy._pipeline import Pipeline
+from pfpy._expression import Operation, Conjunction, Disjunction
+from pfpy._compile import resolve
+from collections import namedtuple
+from time import perf_counter
+import operator
+
+__all__ = ["AdaptivePredicate"]
+
+OperandStatistics = namedtuple("OperandStatistics", ["predicate", "samples", "pass_rate", "mean_time"])
+
+class AdaptivePredicate(Predicate):
+    """
+    Represents an unary predicate whose chains of & and | reorder themselves
+    based on how expensive and how selective each operand turns out to be.
+    Only suitable for pure predicates since operands may be evaluated in any order.
+    """
+
+    def __init__(self, f, period=1024, sampling=16):
+        """
+        Create a new AdaptivePredicate for the unary predicate f.
+        One in every sampling calls to each chain of & or | times the operands it evaluates,
+        and operands are reordered every period calls based on the gathered statistics.
+        """
+        check(period, sampling)
+        self.original = f
+        self.period = period
+        self.sampling = sampling
+        self.chains = []
+        super().__init__(self._adapt(f))
+
+    def __reduce__(self):
+        return (AdaptivePredicate, (self.original, self.period, self.sampling))
+
+    def _adapt(self, f):
+        """Return f with every chain of & or | replaced with an equivalent Chain."""
+        node = resolve(f)
+        if isinstance(node, (Conjunction, Disjunction)):
+            operands = [self._adapt(g) for g in flatten(node)]
+            chain = Chain(type(node), operands, self.period, self.sampling)
+            self.chains.append(chain)
+            return chain
+        elif isinstance(node, Operation) and node.op is operator.not_:
+            return Operation(operator.not_, self._adapt(node.operands[0]))
+        elif isinstance(node, Pipeline):
+            return Pipeline(self._adapt(stage) for stage in node.stages)
+        else:
+            return f
+
+    def statistics(self):
+        """
+        Return a list with the statistics of each chain of & or |, where each chain is a list of
+        OperandStatistics(predicate, samples, pass_rate, mean_time) in the current order of evaluation.
+        """
+        return [chain.statistics() for chain in self.chains]
+
+def check(period, sampling):
+    """Raise a ValueError if period or sampling is less than 1."""
+    if period < 1:
+        raise ValueError("period must be at least 1")
+    if sampling < 1:
+        raise ValueError("sampling must be at least 1")
+
+def flatten(node):
+    """Return the operands of a Conjunction or Disjunction with nested ones of the same type spliced in."""
+    operands = []
+    for g in node.operands:
+        child = resolve(g)
+        if type(child) is type(node):
+            operands.extend(flatten(child))
+        else:
+            operands.append(g)
+    return operands
+
+class Chain:
+    """Represents a Conjunction or Disjunction that reorders its operands as it is called."""
+
+    def __init__(self, kind, operands, period, sampling):
+        """
+        Create a new Chain that behaves like kind, which is either Conjunction or Disjunction,
+        applied to the unary predicates in operands.
+        """
+        check(period, sampling)
+        self.conjunction = kind is Conjunction
+        self.operands = tuple(operands)
+        self.order = self.operands
+        self.indices = tuple(range(len(operands)))  # Index of each operand in the current order
+        self.period = period
+        self.sampling = sampling
+        self.calls = 0
+        self.pinned = False  # Whether the operands must stay in the order they were written in
+        self.samples = [0] * len(operands)
+        self.passes = [0] * len(operands)
+        self.times = [0.0] * len(operands)
+
+    def __call__(self, x):
+        self.calls += 1
+        if self.calls % self.period == 0 and not self.pinned:
+            self.reorder()
+        sample = self.calls % self.sampling == 0
+        if self.order is self.operands:
+            return self._evaluate(x, sample)
+        try:
+            return self._evaluate(x, sample)
+        except Exception:
+            # Operands may guard the ones after them, as in contains("a") & (getitem("a") >> gt(0)),
+            # so an error puts the operands back in the order they were written in for good
+            self.pinned = True
+            self.indices, self.order = tuple(range(len(self.operands))), self.operands
+            return self._evaluate(x, False)
+
+    def _evaluate(self, x, sample):
+        """Return the result of evaluating the operands in the current order, timing them if sample is True."""
+        if sample:
+            return self._sample(x)
+        elif self.conjunction:
+            for f in self.order:
+                result = f(x)
+                if not result:
+                    return result
+        else:
+            for f in self.order:
+                result = f(x)
+                if result:
+                    return result
+        return result
+
+    def _sample(self, x):
+        """
+        Evaluate and time the operands up to the one that decides the result, returning the same result
+        as a regular call. Each operand's statistics are therefore over the calls that evaluate it.
+        """
+        for i, f in zip(self.indices, self.order):
+            start = perf_counter()
+            result = f(x)
+            self.times[i] += perf_counter() - start
+            self.samples[i] += 1
+            self.passes[i] += bool(result)
+            if bool(result) != self.conjunction:
+                break
+        return result
+
+    def _rank(self, i):
+        """Return the expected cost of operand i per call whose result it decides."""
+        if not self.samples[i]:
+            return 0.0  # Operands that have never been sampled are tried first to gather statistics
+        cost = self.times[i] / self.samples[i]
+        pass_rate = self.passes[i] / self.samples[i]
+        deciding_rate = 1 - pass_rate if self.conjunction else pass_rate
+        return cost / deciding_rate if deciding_rate else float("inf")
+
+    def reorder(self):
+        """Reorder the operands so that the ones most likely to cheaply decide the result come first."""
+        indices = tuple(sorted(range(len(self.operands)), key=self._rank))
+        self.indices, self.order = indices, tuple(self.operands[i] for i in indices)
+
+    def statistics(self):
+        """Return the OperandStatistics of each operand in the current order of evaluation."""
+        statistics = []
+        for i, f in zip(self.indices, self.order):
+            samples = self.samples[i]
+            statistics.append(OperandStatistics(f, samples,
+                                                self.passes[i] / samples if samples else None,
+                                                self.times[i] / samples if samples else None))
+        return statistics
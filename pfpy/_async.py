@@ -0,0 +1,147 @@
+from pfpy._composable import Composable, is_async
+from pfpy._pipeline import Pipeline
+from pfpy._function import importable
+from functools import update_wrapper
+
+__all__ = ["AsyncFunction", "asynchronous", "amap"]
+
+class AsyncFunction(Composable):
+    """
+    Represents an unary function that returns an awaitable.
+    Composing it with other functions, whether asynchronous or not, results in an AsyncFunction
+    that awaits the result of every asynchronous stage before passing it on to the next one.
+    """
+    __slots__ = ("_f", "__dict__", "__weakref__")  # __dict__ is only created for metadata such as __name__
+
+    asynchronous = True
+
+    def __init__(self, f):
+        """Create a new AsyncFunction to represent the unary function f, which returns an awaitable."""
+        self._f = f
+
+    # === Implement Callable ===
+    def __call__(self, x):
+        return self._f(x)
+
+    def __reduce__(self):
+        if importable(self):
+            return self.__qualname__  # Pickle by reference like a regular function
+        state = {k: v for k, v in self.__dict__.items() if k not in ("_f", "__wrapped__")}
+        return (type(self), (self._f,), state)
+
+    # === Implement Composable ===
+    def __matmul__(self, other):
+        """Return this AsyncFunction composed with other."""
+        if not callable(other):
+            return NotImplemented
+        return AsyncFunction(AsyncPipeline.compose(other, self))
+
+    def __rshift__(self, other):
+        """Return other composed with this AsyncFunction."""
+        if not callable(other):
+            return NotImplemented
+        return AsyncFunction(AsyncPipeline.compose(self, other))
+
+    def __rmatmul__(self, other):
+        """Return other composed with this AsyncFunction."""
+        if not callable(other):
+            return NotImplemented
+        return self >> other
+
+    def __rrshift__(self, other):
+        """Return this AsyncFunction composed with other."""
+        if callable(other):
+            return self @ other
+        else:
+            return self(other)  # Function application
+
+class AsyncPipeline:
+    """Represents a chain of unary functions applied one after the other, some of which are awaited."""
+
+    def __init__(self, stages):
+        """Create a new AsyncPipeline that applies each function in stages in order."""
+        self.stages = tuple(stages)
+        self.awaited = tuple(is_async(stage) for stage in self.stages)
+
+    async def __call__(self, x):
+        for stage, awaited in zip(self.stages, self.awaited):
+            x = stage(x)
+            if awaited:
+                x = await x
+        return x
+
+    @staticmethod
+    def compose(*fs):
+        """
+        Return an AsyncPipeline that applies each function in fs in order.
+        Stages of nested Pipelines and AsyncPipelines are spliced in rather than nested.
+        """
+        stages = []
+        for f in fs:
+            node = getattr(f, "_f", f)  # Look through Function, Predicate and AsyncFunction wrappers
+            if isinstance(node, (Pipeline, AsyncPipeline)):
+                stages.extend(node.stages)
+            else:
+                stages.append(f)
+        return AsyncPipeline(stages)
+
+class AsyncMap:
+    """Represents an unary function that concurrently maps a function over the items of an iterable."""
+    __slots__ = ("func", "limit")
+
+    def __init__(self, f, limit=None):
+        """
+        Create a new AsyncMap that applies the unary function f to every item,
+        with at most limit calls in progress at once if limit is not None.
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.func = f
+        self.limit = limit
+
+    def __reduce__(self):
+        return (AsyncMap, (self.func, self.limit))
+
+    async def __call__(self, iterable):
+        import asyncio  # Already imported whenever a coroutine runs, but slow to import along with pfpy
+        f = self.func
+        if self.limit is None:
+            return list(await asyncio.gather(*(apply(f, x) for x in iterable)))
+
+        # A fixed number of workers take items from a shared iterator so that
+        # no more than limit tasks exist no matter how long the iterable is
+        results = []
+        items = enumerate(iterable)
+
+        async def work():
+            for i, x in items:
+                results.append(None)  # Items are taken in order so this makes room for item i
+                results[i] = await apply(f, x)
+
+        workers = [asyncio.ensure_future(work()) for _ in range(self.limit)]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            raise
+        return results
+
+async def apply(f, x):
+    """Return the result of f applied to x, awaiting it if it is awaitable."""
+    result = f(x)
+    return await result if hasattr(type(result), "__await__") else result
+
+def asynchronous(f):
+    """Decorator that lifts an unary coroutine function into an AsyncFunction."""
+    wrapper = AsyncFunction(f)
+    update_wrapper(wrapper, f)
+    return wrapper
+
+def amap(f, limit=None):
+    """
+    Return an AsyncFunction that concurrently applies the unary function f to every item of an iterable
+    and returns a list of the results in order, with at most limit calls of f in progress at once
+    if limit is not None. f may be asynchronous or not.
+    """
+    return AsyncFunction(AsyncMap(f, limit))
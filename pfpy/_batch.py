@@ -0,0 +1,41 @@
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import islice
+import os
+
+__all__ = ["map_batch"]
+
+# The unary function applied by the current worker process
+function = None
+
+def initialize(f):
+    """Set the unary function applied by the current worker process to f."""
+    global function
+    function = f
+
+def apply(chunk):
+    """Return the results of applying the unary function of the current worker process to chunk."""
+    return [function(x) for x in chunk]
+
+def map_batch(f, iterable, workers=None, chunksize=1):
+    """
+    Return an iterator that applies the unary function f to every item of iterable
+    using a pool of worker processes, yielding results in order.
+    f is pickled once per worker and items are sent to workers in lists of chunksize.
+    At most two chunks per worker are in flight at any time.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    return results(f, iterable, workers or os.cpu_count() or 1, chunksize)
+
+def results(f, iterable, workers, chunksize):
+    """Yield the results of map_batch in order while keeping the pool of workers busy."""
+    with ProcessPoolExecutor(workers, initializer=initialize, initargs=(f,)) as executor:
+        iterator = iter(iterable)
+        pending = deque()
+        for chunk in iter(lambda: list(islice(iterator, chunksize)), []):
+            pending.append(executor.submit(apply, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
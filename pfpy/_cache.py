@@ -0,0 +1,77 @@
+from pfpy._structure import fingerprint
+from pfpy._compile import export, restore_exported
+import os
+
+__all__ = ["PipelineCache"]
+
+class PipelineCache:
+    """
+    Represents a directory of compiled pipelines keyed by the structure of the pipelines
+    they were compiled from, or by names given by the caller, so that they can be loaded instead
+    of compiled again. Loading runs arbitrary code in the same way as unpickling,
+    so only trusted directories should be used.
+    """
+
+    def __init__(self, directory):
+        """Create a new PipelineCache that stores compiled pipelines in directory, creating it if needed."""
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+    def compile(self, f, cse=False):
+        """
+        Return f.compile(cse), loading it from this PipelineCache if a pipeline with the same structure
+        was compiled before. Pipelines built from functions that cannot be pickled are compiled without being cached.
+        Since f is fingerprinted before anything is looked up, get is faster when f is costly to build or large.
+        """
+        import pickle
+        try:
+            name = fingerprint(f)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return f.compile(cse)
+        return self._load(name, cse, lambda: f.compile(cse))
+
+    def get(self, key, build, cse=False):
+        """
+        Return build().compile(cse), loading it from this PipelineCache if it was stored under the str key before,
+        in which case build is not called at all. The key must change whenever build would return a pipeline
+        built differently, such as by including the version of a rule, since entries are not checked against it.
+        """
+        import hashlib  # Slow to import and only needed by caches
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self._load("key-" + name, cse, lambda: build().compile(cse))
+
+    def _load(self, name, cse, build):
+        """Return the result of build, loading it from the file for name and cse if there is one."""
+        import pickle
+        path = os.path.join(self.directory, "{}.{}.pickle".format(name, "compiled-cse" if cse else "compiled"))
+        try:
+            with open(path, "rb") as file:
+                kind, exported = pickle.load(file)
+            return kind(restore_exported(exported))
+        except FileNotFoundError:
+            pass
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+            pass  # Entries that are corrupt or refer to functions that changed are compiled and written again
+
+        import tempfile
+        result = build()
+        try:
+            data = pickle.dumps((type(result), export(result._f)), protocol=4)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return result
+        # Written to a temporary file first so that concurrent readers never see partial files
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        return result
+
+    def clear(self):
+        """Remove every compiled pipeline from this PipelineCache."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".pickle"):
+                os.unlink(os.path.join(self.directory, name))
@@ -0,0 +1,336 @@
+from pfpy._function import Function, identity
+from pfpy._predicate import Predicate
+from pfpy._pipeline import Pipeline
+from pfpy._expression import Constant, Operation, Polynomial, Conjunction, Disjunction
+from collections import Counter
+import marshal
+import operator
+
+__all__ = ["Compiled"]
+
+# Python source templates for the operators that can be inlined into generated code
+templates = {
+    operator.pos: "(+{})",
+    operator.neg: "(-{})",
+    operator.not_: "(not {})",
+    operator.truth: "(not not {})",
+    operator.add: "({} + {})",
+    operator.sub: "({} - {})",
+    operator.mul: "({} * {})",
+    operator.truediv: "({} / {})",
+    operator.floordiv: "({} // {})",
+    operator.pow: "({} ** {})",
+}
+
+# Chains of more operands than this are not emitted as a single nested expression
+max_nesting = 32
+
+# Marks a shared subexpression that has not been evaluated yet
+missing = object()
+
+class Compiled:
+    """Represents an unary function lowered into a single generated Python function."""
+    pickled_node = None  # Pickle of node until it is first needed, if this Compiled was exported
+
+
+    def __init__(self, node, eager=False, cse=False):
+        """
+        Create a new Compiled for the unary function node.
+        Unless eager is True, code is only generated the first time the Compiled is called.
+        If cse is True, shared subexpressions are only evaluated once per call.
+        """
+        self.node = node
+        self.cse = cse
+        self.source = None
+        if eager:
+            self._generate()
+        else:
+            self.code = self._compile
+
+    def __reduce__(self):
+        if self.source is None:
+            return (Compiled, (self.node, False, self.cse))  # Code is generated when first needed
+        # Bytecode is kept so that unpickling skips both generating and parsing the source,
+        # unless it comes from a different version of Python
+        from importlib.util import MAGIC_NUMBER
+        return (restore, (self.node, self.cse, self.source, self.bindings,
+                          MAGIC_NUMBER, marshal.dumps(self.factory)))
+
+    def __getattr__(self, name):
+        if name != "node" or self.pickled_node is None:
+            raise AttributeError(name)
+        import pickle
+        self.node = pickle.loads(self.pickled_node)
+        return self.node
+
+    def _generate(self):
+        """Generate the code of this Compiled."""
+        self.source, self.bindings = generate(self.node, self.cse)
+        self.factory = compile(self.source, "<pfpy.compiled>", "exec")
+        self.code = load(self.factory, self.bindings)
+
+    def _compile(self, x):
+        self._generate()
+        return self.code(x)
+
+    def __call__(self, x):
+        return self.code(x)
+
+def restore(node, cse, source, bindings, magic, factory):
+    """Return a Compiled for node with the code that was generated for it before being pickled."""
+    from importlib.util import MAGIC_NUMBER
+    compiled = Compiled(node, cse=cse)
+    compiled.source, compiled.bindings = source, bindings
+    if magic == MAGIC_NUMBER:
+        compiled.factory = marshal.loads(factory)
+    else:
+        compiled.factory = compile(source, "<pfpy.compiled>", "exec")
+    compiled.code = load(compiled.factory, bindings)
+    return compiled
+
+def export(compiled):
+    """
+    Return a picklable tuple from which restore_exported returns a copy of compiled, whose code must have
+    been generated. Its node is pickled on its own, since calling the copy does not need it.
+    """
+    import pickle
+    from importlib.util import MAGIC_NUMBER
+    return (pickle.dumps(compiled.node, protocol=4), compiled.cse, compiled.source, compiled.bindings,
+            MAGIC_NUMBER, marshal.dumps(compiled.factory))
+
+def restore_exported(exported):
+    """Return a Compiled for a tuple returned by export, which only unpickles its node once it is needed."""
+    pickled_node, *state = exported
+    compiled = restore(None, *state)
+    del compiled.node
+    compiled.pickled_node = pickled_node
+    return compiled
+
+def generate(f, cse=False):
+    """
+    Return the source code of a factory that returns a Python function computing the same results
+    as the unary function f, together with the closure variables the factory should be called with.
+    Arithmetic and logical operators, compositions, identity and constants are inlined while
+    every other callable is bound to a closure variable of the generated function and called directly.
+    Independent operands are not guaranteed to be evaluated in their original order.
+    If cse is True, every subexpression that is reachable more than once (by identity)
+    from f is evaluated at most once per call, which is only safe when they are pure.
+    """
+    generator = Generator(f if cse else None)
+    result = generator.emit(f, "x", "x")
+    names = ", ".join(generator.bindings)
+    body = "".join("        {}{}\n".format("    " * level, line)
+                   for level, line in generator.preamble + generator.lines)
+    source = ("def factory({}):\n"
+              "    def compiled(x):\n"
+              "{}"
+              "        return {}\n"
+              "    return compiled\n").format(names, body, result)
+    return source, generator.bindings
+
+def load(factory, bindings):
+    """Return the function generated by factory, a code object or source string, with bindings as its closure variables."""
+    namespace = {}
+    exec(factory, namespace)
+    return namespace["factory"](*bindings.values())  # Matching many keyword arguments by name is slow
+
+def resolve(f):
+    """Return the node that determines the behaviour of f by looking through any wrappers."""
+    while True:
+        if type(f) in (Function, Predicate):
+            f = f._f
+        elif isinstance(f, Compiled):
+            f = f.node
+        else:
+            return f
+
+def is_inlined(node):
+    """Return whether node is inlined into generated code rather than called as is."""
+    return (node is identity._f
+            or isinstance(node, (Constant, Pipeline, Polynomial, Conjunction, Disjunction))
+            or (isinstance(node, Operation) and node.op in templates))
+
+def children(node, source):
+    """
+    Yield each unary function node is built from along with a key identifying the argument
+    it is applied to when node is applied to the argument identified by source.
+    """
+    if isinstance(node, Pipeline):
+        for i, stage in enumerate(node.stages):
+            yield stage, source if i == 0 else (id(node), i, source)
+    elif isinstance(node, Polynomial):
+        yield node.f, source
+    elif is_inlined(node) and not isinstance(node, Constant) and node is not identity._f:
+        for operand in node.operands:
+            yield operand, source
+
+class Generator:
+    """Accumulates the source code and closure variables of a generated function."""
+
+    def __init__(self, root=None):
+        """
+        Create a new Generator.
+        If root is given, the subexpressions that are shared within it are evaluated only once.
+        """
+        self.preamble = []  # Lines of (indentation level, statement) run before everything else
+        self.lines = []
+        self.level = 0
+        self.bindings = {}  # Maps closure variable names to their values
+        self.names = {}     # Maps ids of bound values to their closure variable names
+        self.temps = 0
+        self.values = {}    # Maps keys of shared subexpressions to the locals holding their values
+        self.guards = {}    # Maps keys of conditionally evaluated shared subexpressions to their code
+        self.definite = set()  # Keys of shared subexpressions that are always evaluated before use
+        self.shared = set()
+        if root is not None:
+            counts = Counter()
+            self.count(root, "x", counts)
+            self.shared = {key for key, n in counts.items() if n > 1}
+
+    def count(self, f, source, counts):
+        """Count how many times each subexpression of f is reachable from distinct parents."""
+        node = resolve(f)
+        if node is identity._f or isinstance(node, Constant):
+            return
+        key = (id(node), source)
+        counts[key] += 1
+        if counts[key] == 1:
+            for child, child_source in children(node, source):
+                self.count(child, child_source, counts)
+
+    def bind(self, value):
+        """Return the name of the closure variable bound to value."""
+        if id(value) not in self.names:
+            name = "_{}".format(len(self.bindings))
+            self.bindings[name] = value
+            self.names[id(value)] = name
+        return self.names[id(value)]
+
+    def temp(self):
+        """Return the name of a new local variable."""
+        name = "t{}".format(self.temps)
+        self.temps += 1
+        return name
+
+    def assign(self, expression):
+        """Emit a statement assigning expression to a new local variable and return its name."""
+        name = self.temp()
+        self.lines.append((self.level, "{} = {}".format(name, expression)))
+        return name
+
+    def nested(self, build):
+        """
+        Return the expression returned by build together with the statements it emitted,
+        which are removed from the output so they can be placed in a nested block.
+        """
+        mark = len(self.lines)
+        self.level += 1
+        expression = build()
+        self.level -= 1
+        block = self.lines[mark:]
+        del self.lines[mark:]
+        return expression, block
+
+    def emit(self, f, arg, source):
+        """
+        Return a Python expression that evaluates to the unary function f applied to arg,
+        where source is a key identifying arg.
+        """
+        node = resolve(f)
+        key = (id(node), source)
+        if key not in self.shared:
+            return self.expression(node, arg, source)
+        elif key in self.definite:
+            return self.values[key]
+        elif self.level == 0 and key not in self.values:
+            self.values[key] = self.assign(self.expression(node, arg, source))
+            self.definite.add(key)
+            return self.values[key]
+
+        # Shared subexpressions first reached inside a conditional block are guarded
+        # so that they are evaluated once no matter which branches are taken
+        if key not in self.values:
+            self.values[key] = self.temp()
+            self.preamble.append((0, "{} = {}".format(self.values[key], self.bind(missing))))
+            expression, block = self.nested(lambda: self.expression(node, arg, source))
+            self.guards[key] = ([(level - self.level, line) for level, line in block], expression)
+        name = self.values[key]
+        block, expression = self.guards[key]
+        self.lines.append((self.level, "if {} is {}:".format(name, self.bind(missing))))
+        self.lines.extend((self.level + level, line) for level, line in block)
+        self.lines.append((self.level + 1, "{} = {}".format(name, expression)))
+        if self.level == 0:
+            self.definite.add(key)
+        return name
+
+    def expression(self, node, arg, source):
+        """Return a Python expression that evaluates to node applied to arg."""
+        if node is identity._f:
+            return arg
+        elif isinstance(node, Constant):
+            return self.bind(node.value)
+        elif isinstance(node, Operation) and node.op in templates:
+            if len(node.operands) > 2:
+                return self.chain(node, arg, source)
+            return templates[node.op].format(*(self.emit(g, arg, source) for g in node.operands))
+        elif isinstance(node, (Conjunction, Disjunction)):
+            return self.logical(node, arg, source)
+        elif isinstance(node, Polynomial):
+            return self.horner(node, arg, source)
+        elif isinstance(node, Pipeline):
+            for (stage, stage_source) in children(node, source):
+                if not arg.isidentifier() and is_inlined(resolve(stage)):
+                    arg = self.assign(arg)  # Inlined stages may use their argument many times
+                arg = self.emit(stage, arg, stage_source)
+            return arg
+        else:
+            return "{}({})".format(self.bind(node), arg)
+
+    def chain(self, node, arg, source):
+        """
+        Return a Python expression for a binary operator folded over more than two operands.
+        Long chains are emitted as one statement per operand since Python limits how deeply
+        the generated expression could otherwise be nested.
+        """
+        first, *rest = node.operands
+        result = self.emit(first, arg, source)
+        if len(rest) > max_nesting:
+            result = self.assign(result)
+        for g in rest:
+            expression = templates[node.op].format(result, self.emit(g, arg, source))
+            if len(rest) > max_nesting:
+                self.lines.append((self.level, "{} = {}".format(result, expression)))
+            else:
+                result = expression
+        return result
+
+    def horner(self, node, arg, source):
+        """Return a Python expression for a Polynomial, emitting one statement per coefficient."""
+        y = self.emit(node.f, arg, source)
+        if not y.isidentifier():
+            y = self.assign(y)
+        leading, *rest = node.coefficients
+        result = self.assign(self.bind(leading))
+        for c in rest:
+            addend = " + {}".format(self.bind(c)) if c != 0 else ""
+            self.lines.append((self.level, "{0} = {0} * {1}{2}".format(result, y, addend)))
+        return result
+
+    def logical(self, node, arg, source):
+        """Return a Python expression for a short-circuiting Conjunction or Disjunction."""
+        keyword, test = ("and", "if {}:") if isinstance(node, Conjunction) else ("or", "if not {}:")
+        first, *rest = node.operands
+        terms = [self.emit(first, arg, source)]  # Joined into a single flat boolean expression
+        join = lambda: terms[0] if len(terms) == 1 else "({})".format(" {} ".format(keyword).join(terms))
+        for g in rest:
+            expression, block = self.nested(lambda: self.emit(g, arg, source))
+            if not block:
+                terms.append(expression)
+            else:
+                # Statements needed by later operands must only run when they are reached
+                result = self.assign(join())
+                self.lines.append((self.level, test.format(result)))
+                self.lines.extend(block)
+                self.lines.append((self.level + 1, "{} = {}".format(result, expression)))
+                terms = [result]
+        return join()
@@ -1,24 +1,39 @@
-from abc import ABC, abstractmethod
-
 __all__ = ["Composable"]
 
-class Composable(ABC):
-    @abstractmethod
+# Flag of the code of coroutine functions, the same as inspect.CO_COROUTINE which is slow to import
+CO_COROUTINE = 0x80
+
+class Composable:
+    """
+    Informal interface for unary functions that can be composed with @ and >>, which subclasses implement
+    by overriding the composition operators below. This is deliberately not an ABC so that checking whether
+    an object is Composable and creating instances of its subclasses avoid the overhead of ABCMeta,
+    so nothing enforces the overrides and the operators of Composable itself return NotImplemented.
+    """
+    __slots__ = ()
+
+    # Whether calling this Composable returns an awaitable
+    asynchronous = False
+
     def __matmul__(self, other):
         """Return this Composable composed with other."""
-        pass
+        return NotImplemented
 
-    @abstractmethod
     def __rshift__(self, other):
         """Return other composed with this Composable."""
-        pass
+        return NotImplemented
 
-    @abstractmethod
     def __rmatmul__(self, other):
         """Return other composed with this Composable."""
-        pass
+        return NotImplemented
 
-    @abstractmethod
     def __rrshift__(self, other):
         """Return this Composable composed with other."""
-        pass
+        return NotImplemented
+
+def is_async(f):
+    """Return whether calling f returns an awaitable, as with AsyncFunctions and coroutine functions."""
+    if isinstance(f, Composable):
+        return f.asynchronous
+    code = getattr(getattr(f, "__func__", f), "__code__", None)  # Look through bound methods
+    return code is not None and bool(code.co_flags & CO_COROUTINE)
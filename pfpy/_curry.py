@@ -1,15 +1,114 @@
-from pfpy._function import Function
+from pfpy._function import Function, importable
 from pfpy._predicate import Predicate
-from functools import update_wrapper, partial
+from functools import update_wrapper, WRAPPER_UPDATES
 
-__all__ = ["rpartial", "curry", "rcurry"]
+__all__ = ["rpartial", "curry", "rcurry", "Curried"]
 
-def rpartial(f, *args):
+class rpartial:
     """
     Return f with arguments bound from the right.
     Similar to functools.partial but in reverse.
     """
-    return lambda *a: f(*(a + args))
+    __slots__ = ("func", "args")
+
+    def __init__(self, f, *args):
+        self.func = f
+        self.args = args
+
+    def __call__(self, *args):
+        return self.func(*(args + self.args))
+
+    def __reduce__(self):
+        return (rpartial, (self.func,) + self.args)
+
+class Curried(Function):
+    """
+    Represents a curried function that still needs more than one argument.
+    Several arguments can be bound at once, so f(a, b) is equivalent to f(a)(b).
+    """
+    __slots__ = ()
+
+    def __call__(self, *args):
+        return self._f(*args)
+
+class Curry:
+    """Represents how the arguments of a curried function are bound."""
+    __slots__ = ("func", "arity", "cls", "reverse", "wrapper")
+
+    def __init__(self, f, n, cls, reverse):
+        """
+        Create a new Curry for the n-ary function f whose last unary function is of type cls.
+        If reverse is True, arguments are bound from right to left.
+        """
+        self.func = f
+        self.arity = n
+        self.cls = cls
+        self.reverse = reverse
+
+        # The curried function with no arguments bound yet is the only one that copies
+        # the metadata of f, although the namespace of a class such as map is not meant to be
+        self.wrapper = self.wrap(())
+        update_wrapper(self.wrapper, f, updated=() if isinstance(f, type) else WRAPPER_UPDATES)
+
+    def __reduce__(self):
+        if importable(self.wrapper):
+            return (curry_of, (self.wrapper,))  # Avoids pickling func if its name was rebound to wrapper
+        return (Curry, (self.func, self.arity, self.cls, self.reverse))
+
+    def wrap(self, args):
+        """Return the curried function for when the arguments in args are bound."""
+        if self.arity - len(args) > 1:
+            return Curried(Partial(self, args))
+        elif self.arity - len(args) == 1:
+            return self.cls(Last(self, args))
+        return self.cls(Partial(self, args))
+
+def curry_of(wrapper):
+    """Return the Curry of a curried function with no arguments bound yet."""
+    return wrapper._f.curry
+
+class Partial:
+    """Represents a curried function with some of its arguments bound."""
+    __slots__ = ("curry", "args")
+
+    def __init__(self, curry, args):
+        """Create a new Partial for the Curry curry with the arguments in args bound."""
+        self.curry = curry
+        self.args = args
+
+    def __reduce__(self):
+        return (Partial, (self.curry, self.args))
+
+    def __call__(self, *xs):
+        curry, args = self.curry, self.args
+        if curry.arity == len(args):  # No parameters. Ignore dummy argument and call function.
+            return curry.func(*args)
+        args = xs[::-1] + args if curry.reverse else args + xs
+        if curry.arity == len(args):  # Last parameters. Call function with all arguments directly.
+            return curry.func(*args)
+        elif curry.arity < len(args):
+            raise TypeError("{} takes {} arguments but {} were given".format(
+                getattr(curry.func, "__name__", "curried function"), curry.arity, len(args)))
+        return curry.wrap(args)
+
+class Last(Partial):
+    """Represents a curried function with all but its last argument bound."""
+    __slots__ = ("func", "reverse")
+
+    def __init__(self, curry, args):
+        """Create a new Last for the Curry curry with all arguments but one in args bound."""
+        self.curry = curry
+        self.args = args
+        self.func = curry.func
+        self.reverse = curry.reverse
+
+    def __reduce__(self):
+        return (Last, (self.curry, self.args))
+
+    def __call__(self, x):
+        if self.reverse:
+            return self.func(x, *self.args)
+        return self.func(*self.args, x)
 
 def curry(n, cls=Function):
     """
@@ -19,16 +118,7 @@ def curry(n, cls=Function):
     be of type cls.
     """
     def curry(f):
-        def curry(g, n):
-            if n == 0:  # No parameters. Pass in dummy argument in order to call function.
-                wrapper = cls(lambda x: g())
-            elif n == 1:  # 1 parameters left. Pass in argument to call function with.
-                wrapper = cls(lambda x: g(x))
-            else:  # >1 parameters left. Pass in argument for first unbound parameter in function.
-                wrapper = Function(lambda x: curry(partial(g, x), n - 1))
-            update_wrapper(wrapper, f)
-            return wrapper
-        return curry(f, n)
+        return Curry(f, n, cls, False).wrapper
     return curry
 
 def rcurry(n, cls=Function):
@@ -39,14 +129,5 @@ def rcurry(n, cls=Function):
     be of type cls.
     """
     def rcurry(f):
-        def rcurry(g, n):
-            if n == 0:  # No parameters. Pass in dummy argument in order to call function.
-                wrapper = cls(lambda x: g())
-            elif n == 1:  # 1 parameters left. Pass in argument to call function with.
-                wrapper = cls(lambda x: g(x))
-            else:  # >1 parameters left. Pass in argument for last unbound parameter in function.
-                wrapper = Function(lambda x: rcurry(rpartial(g, x), n - 1))
-            update_wrapper(wrapper, f)
-            return wrapper
-        return rcurry(f, n)
+        return Curry(f, n, cls, True).wrapper
     return rcurry
@@ -0,0 +1,177 @@
+from pfpy._pipeline import Pipeline
+from pfpy._expression import Conjunction, Disjunction
+from pfpy._curry import Last
+from pfpy._compile import resolve
+from bisect import bisect_left, bisect_right
+import builtins
+import operator
+
+__all__ = ["Dataset"]
+
+# Comparisons that can be answered with an index
+comparisons = {operator.eq, operator.ne, operator.lt, operator.le, operator.gt, operator.ge}
+
+# Functions that get a field of a record
+getters = {operator.getitem, builtins.getattr}
+
+class Dataset:
+    """
+    Represents a collection of records, such as dicts or objects, that answers queries expressed as Predicates.
+    Comparisons of a field with a value, such as getitem(k) >> eq(v) or getattr(a) >> gt(v),
+    and combinations of them with & and | are answered with hash and sorted indexes that are
+    built the first time a field is queried. Any other Predicate is answered by checking every record.
+    """
+
+    def __init__(self, records):
+        """Create a new Dataset of the records in the iterable records."""
+        self.records = list(records)
+        self.hash_indexes = {}    # Maps field paths to dicts from values to the positions of records
+        self.sorted_indexes = {}  # Maps field paths to sorted values and the positions of their records
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def filter(self, p):
+        """
+        Return a list of the records that satisfy the unary predicate p, in their original order.
+        Only suitable for pure predicates since the parts of p that cannot be answered with an index
+        are only checked against the records that the other parts of p select.
+        """
+        positions = self._plan(p)
+        if positions is None:
+            return [record for record in self.records if p(record)]
+        return [self.records[i] for i in sorted(positions)]
+
+    def _plan(self, p):
+        """Return the set of positions of the records that satisfy p, or None if it needs a full scan."""
+        selection = self._select(p)
+        return None if selection is None else selection[1]()
+
+    def _select(self, p):
+        """
+        Return the number of records that satisfy p together with a function returning the set of their positions,
+        or None if p needs a full scan.
+        """
+        node = resolve(p)
+        if isinstance(node, Conjunction):
+            selections = [(g, self._select(g)) for g in node.operands]
+            known = sorted((selection for _, selection in selections if selection is not None), key=lambda s: s[0])
+            if not known:
+                return None
+            rest = [g for g, selection in selections if selection is None]
+            positions = known[0][1]()
+            for (g, selection) in selections:
+                if selection is not None and selection is not known[0]:
+                    if selection[0] < 4 * len(positions):
+                        positions &= selection[1]()
+                    else:
+                        rest.append(g)  # Cheaper to check the few remaining records than to build a large set
+            if rest:
+                positions = {i for i in positions if all(g(self.records[i]) for g in rest)}
+            return len(positions), lambda: positions
+        elif isinstance(node, Disjunction):
+            positions = set()
+            for g in node.operands:
+                selection = self._select(g)
+                if selection is None:
+                    return None  # Every record has to be checked anyway
+                positions |= selection[1]()
+            return len(positions), lambda: positions
+
+        compared = comparison(node)
+        if compared is None:
+            return None
+        path, op, value = compared
+        if not reflexive(value):
+            return None  # NaN is equal to nothing, but a dict finds it by identity and bisect orders it anywhere
+        try:
+            if op in (operator.eq, operator.ne):
+                index = self._hash_index(path)
+                if index is None:
+                    return None
+                matches = index.get(value, ())
+                if op is operator.eq:
+                    return len(matches), lambda: set(matches)
+                return len(self.records) - len(matches), lambda: set(range(len(self.records))).difference(matches)
+            index = self._sorted_index(path)
+            if index is None:
+                return None
+            keys, order = index
+            if op is operator.lt:
+                start, stop = 0, bisect_left(keys, value)
+            elif op is operator.le:
+                start, stop = 0, bisect_right(keys, value)
+            elif op is operator.gt:
+                start, stop = bisect_right(keys, value), len(keys)
+            else:
+                start, stop = bisect_left(keys, value), len(keys)
+            return stop - start, lambda: set(order[start:stop])
+        except TypeError:
+            return None  # Values that cannot be hashed or compared with the field are left to a scan
+
+    def _hash_index(self, path):
+        """Return a dict from the values of the field at path to the positions of their records, or None."""
+        if path not in self.hash_indexes:
+            index = {}
+            try:
+                for i, record in enumerate(self.records):
+                    index.setdefault(extract(record, path), []).append(i)
+            except Exception:
+                index = None  # Missing fields must raise the same errors as a scan would
+            self.hash_indexes[path] = index
+        return self.hash_indexes[path]
+
+    def _sorted_index(self, path):
+        """Return the sorted values of the field at path together with the positions of their records, or None."""
+        if path not in self.sorted_indexes:
+            try:
+                values = [extract(record, path) for record in self.records]
+                order = sorted(range(len(values)), key=values.__getitem__)
+                keys = [values[i] for i in order]
+                if any(key != key for key in keys):
+                    raise ValueError("NaN values are not ordered")
+                index = (keys, order)
+            except Exception:
+                index = None  # Missing or unordered fields must behave the same way as a scan
+            self.sorted_indexes[path] = index
+        return self.sorted_indexes[path]
+
+def reflexive(value):
+    """Return whether value is equal to itself, which NaN is not."""
+    try:
+        return bool(value == value)
+    except Exception:
+        return False
+
+def extract(record, path):
+    """Return the field of record at path, a tuple of (getter, key) pairs applied in order."""
+    for getter, key in path:
+        record = getter(record, key)
+    return record
+
+def stages(node):
+    """Return the stages of node with nested Pipelines spliced in."""
+    if not isinstance(node, Pipeline):
+        return [node]
+    return [stage for g in node.stages for stage in stages(resolve(g))]
+
+def comparison(node):
+    """
+    Return a tuple of the path of a field, a comparison operator and a value if node compares
+    a field of a record with a value using the curried getitem, getattr and comparison operators,
+    otherwise None.
+    """
+    if not isinstance(node, Pipeline):
+        return None
+    *fields, compare = stages(node)
+    if not (isinstance(compare, Last) and compare.reverse and compare.func in comparisons) or not fields:
+        return None
+    path = []
+    for field in fields:
+        if not (isinstance(field, Last) and field.reverse and field.func in getters):
+            return None
+        path.append((field.func, field.args[0]))
+    return tuple(path), compare.func, compare.args[0]
@@ -0,0 +1,199 @@
+from bisect import bisect_right
+from _thread import allocate_lock
+
+__all__ = ["Constant", "Operation", "Polynomial", "Conjunction", "Disjunction", "Membership", "Intervals"]
+
+class Constant:
+    """Represents an unary function that always returns the same value."""
+
+    def __init__(self, value):
+        """Create a new Constant that always returns value."""
+        self.value = value
+
+    def __call__(self, _):
+        return self.value
+
+class Variadic:
+    """
+    Base of the nodes that apply an operator to a chain of unary functions. A node built by extending another
+    one shares its lists of operands and adds to their ends in place if no other node has added to them yet,
+    so a chain of n operands built one operand at a time takes O(n) time rather than O(n²).
+    Nodes created directly only hold the tuple operands.
+    """
+    before = ()    # Operands put before the first operand of the node this one extends, last first
+    after = ()     # Operands of the node this one extends followed by the ones put after them
+    counts = None  # Numbers of the items of before and after that are operands of this node, if it extends another
+
+    def __len__(self):
+        return sum(self.counts) if self.counts else len(self.operands)
+
+    def __getattr__(self, name):
+        if name != "operands" or not self.counts:
+            raise AttributeError(name)
+        before, after = self.counts
+        self.operands = tuple(self.before[before - 1::-1] if before else ()) + tuple(self.after[:after])
+        return self.operands
+
+    def __getstate__(self):
+        state = {k: v for k, v in self.__dict__.items() if k not in ("before", "after", "counts")}
+        state["operands"] = self.operands
+        return state
+
+    def extended(self, before=(), after=()):
+        """
+        Return a copy of this node whose operands are the ones in the sequence before,
+        followed by the operands of this node and then by the ones in the sequence after.
+        """
+        node = object.__new__(type(self))
+        node.__dict__.update(self.__dict__)
+        node.__dict__.pop("operands", None)
+        if self.counts:
+            (count_before, count_after), items_before, items_after = self.counts, self.before, self.after
+        else:
+            (count_before, count_after), items_before, items_after = (0, len(self.operands)), (), self.operands
+        node.before, node.after = items_before, items_after
+        with lock:
+            if before:
+                if type(items_before) is not list or len(items_before) != count_before:
+                    node.before = list(items_before[:count_before])  # Another node already added to the list
+                node.before.extend(reversed(before))
+            if after:
+                if type(items_after) is not list or len(items_after) != count_after:
+                    node.after = list(items_after[:count_after])
+                node.after.extend(after)
+        node.counts = (count_before + len(before), count_after + len(after))
+        return node
+
+# Guards the lists of operands shared by Variadic nodes, without importing threading
+lock = allocate_lock()
+
+def concatenate(f, left, g, right):
+    """
+    Return a Variadic node with the operands of left followed by those of right, which are Variadic nodes of
+    the same kind or None if the unary functions f and g they were taken from are single operands,
+    or None if both of them are. The longer chain is extended so a chain grows in amortized O(1) time.
+    """
+    if left is not None and (right is None or len(left) >= len(right)):
+        return left.extended(after=right.operands if right is not None else (g,))
+    elif right is not None:
+        return right.extended(before=left.operands if left is not None else (f,))
+    return None
+
+class Operation(Variadic):
+    """Represents an operator applied to the results of unary functions."""
+
+    def __init__(self, op, *operands):
+        """
+        Create a new Operation that calls op with the result of applying each
+        unary function in operands to the same argument.
+        A binary op applied to more than two operands is folded over their results from left to right,
+        so an Operation can stand for a whole chain such as f + g + h without nesting.
+        """
+        self.op = op
+        self.operands = operands
+
+    def __call__(self, x):
+        if len(self.operands) == 1:
+            (f,) = self.operands
+            return self.op(f(x))
+        elif len(self.operands) == 2:
+            f, g = self.operands
+            return self.op(f(x), g(x))
+        first, *rest = self.operands
+        result = first(x)
+        for f in rest:
+            result = self.op(result, f(x))
+        return result
+
+class Polynomial:
+    """Represents a polynomial with constant coefficients applied to the result of an unary function."""
+
+    def __init__(self, coefficients, f):
+        """
+        Create a new Polynomial that evaluates the polynomial with the coefficients in the tuple coefficients,
+        highest degree first, at the result of the unary function f using Horner's method.
+        """
+        self.coefficients = coefficients
+        self.f = f
+
+    def __call__(self, x):
+        y = self.f(x)
+        coefficients = iter(self.coefficients)
+        result = next(coefficients)
+        for c in coefficients:
+            result = result * y + c
+        return result
+
+class Conjunction(Variadic):
+    """Represents the short-circuiting logical and of unary predicates."""
+
+    def __init__(self, *operands):
+        """Create a new Conjunction of the unary predicates in operands."""
+        self.operands = operands
+
+    def __call__(self, x):
+        for f in self.operands:
+            result = f(x)
+            if not result:
+                return result
+        return result
+
+class Disjunction(Variadic):
+    """Represents the short-circuiting logical or of unary predicates."""
+
+    def __init__(self, *operands):
+        """Create a new Disjunction of the unary predicates in operands."""
+        self.operands = operands
+
+    def __call__(self, x):
+        for f in self.operands:
+            result = f(x)
+            if result:
+                return result
+        return result
+
+class Membership:
+    """Represents whether the result of an unary function is equal to one of a set of values."""
+
+    def __init__(self, f, values, negated=False):
+        """
+        Create a new Membership that checks whether the result of the unary function f is equal
+        to one of the hashable values, or to none of them if negated is True.
+        """
+        self.f = f
+        self.values = frozenset(values)
+        self.negated = negated
+
+    def __call__(self, x):
+        y = self.f(x)
+        try:
+            found = y in self.values
+        except TypeError:
+            found = any(y == value for value in self.values)  # Unhashable results may still be equal to a value
+        return not found if self.negated else found
+
+class Intervals:
+    """Represents whether the result of an unary function lies within one of a sequence of disjoint intervals."""
+
+    def __init__(self, f, intervals):
+        """
+        Create a new Intervals for the unary function f and the disjoint intervals in intervals,
+        sorted by their lower bounds. Each interval is a tuple of (low, low_closed, high, high_closed)
+        where low or high is None if that end is unbounded and a closed end includes its bound.
+        """
+        self.f = f
+        self.intervals = tuple(intervals)
+        self.lows = [interval[0] for interval in self.intervals if interval[0] is not None]
+        self.unbounded = len(self.intervals) - len(self.lows)  # Only the first interval can start unbounded
+
+    def __call__(self, x):
+        y = self.f(x)
+        if len(self.intervals) == 1:
+            i = 0
+        else:
+            i = bisect_right(self.lows, y) + self.unbounded - 1  # The only interval that can hold y
+            if i < 0:
+                return False
+        low, low_closed, high, high_closed = self.intervals[i]
+        return ((low is None or low < y or (low_closed and low == y))
+                and (high is None or y < high or (high_closed and y == high)))
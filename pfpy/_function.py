@@ -1,118 +1,296 @@
-from collections.abc import Callable
-from pfpy._composable import Composable
+from pfpy._composable import Composable, is_async
+from pfpy._pipeline import compose
+from pfpy._expression import Constant, Operation, concatenate
 from numbers import Real
 from functools import update_wrapper
+import operator
+import sys
 
 __all__ = ["Function", "unary", "identity", "constant"]
 
-class Function(Callable, Composable):
+class Function(Composable):
     """Represents an unary function."""
+    __slots__ = ("_f", "__dict__", "__weakref__")  # __dict__ is only created for metadata such as __name__
+
+    # When True, Functions built with the arithmetic operators compile themselves on first call
+    autocompile = False
 
     def __init__(self, f):
         """Create a new Function to represent unary function f."""
         self._f = f
 
-    # === Implement Callable ====
+    # === Implement Callable ===
     def __call__(self, x):
         return self._f(x)
 
+    def __reduce__(self):
+        if importable(self):
+            return self.__qualname__  # Pickle by reference like a regular function
+        state = {k: v for k, v in self.__dict__.items() if k not in ("_f", "__wrapped__")}
+        return (type(self), (self._f,), state)
+
+    def map_batch(self, iterable, workers=None, chunksize=1):
+        """
+        Return an iterator that applies this Function to every item of iterable
+        using a pool of worker processes, yielding results in order.
+        Items are sent to workers in lists of chunksize and at most two chunks per worker
+        are in flight at any time so memory use stays bounded for long iterables.
+        """
+        from pfpy._batch import map_batch
+        return map_batch(self, iterable, workers, chunksize)
+
+    def stream(self, chunksize=1024):
+        """
+        Return an equivalent Function whose adjacent curried map and filter stages, along with
+        a curried reduce stage that follows them, are fused into a single loop over the iterable.
+        Fused stages that are not followed by a reduce lazily compute chunksize items at a time.
+        """
+        from pfpy._stream import Stream
+        return Function(Stream(self._f, chunksize))
+
+    def memoize(self, maxsize=128, policy="lru", ttl=None):
+        """
+        Return an equivalent Function that caches its results for hashable arguments.
+        At most maxsize results are kept, or any number of them if maxsize is None,
+        and policy decides which ones are evicted: "lru" evicts the least recently used,
+        "lfu" the least frequently used and "ttl" also expires results after ttl seconds.
+        The cache is thread-safe and acts as a boundary that compile() and vectorize() call as is.
+        """
+        from pfpy._memoize import Memoized
+        wrapper = Function(Memoized(self._f, maxsize, policy, ttl))
+        if hasattr(self, "__wrapped__"):
+            update_wrapper(wrapper, self)  # Keeps the metadata given by @unary
+        return wrapper
+
+    def cache_info(self):
+        """
+        Return the CacheInfo(hits, misses, evictions, maxsize, currsize) of a Function returned by memoize(),
+        or raise TypeError for any other Function.
+        """
+        from pfpy._memoize import memoized
+        return memoized(self).cache_info()
+
+    def cache_clear(self):
+        """
+        Remove every result cached by a Function returned by memoize() and reset its statistics,
+        or raise TypeError for any other Function.
+        """
+        from pfpy._memoize import memoized
+        memoized(self).cache_clear()
+
+    def profile(self):
+        """
+        Return a Profile holding an instrumented copy of this Function, which can be called in its place,
+        that records the calls, cumulative and self time and exceptions of every node it is built from.
+        This Function itself is left untouched.
+        """
+        from pfpy._profile import Profile
+        return Profile(self)
+
+    def optimize(self):
+        """
+        Return an equivalent Function rewritten to do less work, or this Function if nothing can be rewritten.
+        Compositions with identity are removed, operators applied to constants are folded,
+        -(-f), ~~p, (f ** a) ** b and repeated scalar multiplications are collapsed, p & p becomes p,
+        polynomials of a function are evaluated with Horner's method,
+        comparisons of a function against constants chained with & or | become one set or interval check
+        and a curried sorted followed by a stage that takes its first k items becomes bottom_k.
+        Only suitable for pure functions since fewer calls may be made.
+        """
+        from pfpy._optimize import optimize
+        return optimize(self)
+
+    def explain(self):
+        """Return a description of the tree of this Function before and after optimize()."""
+        from pfpy._optimize import explain
+        return explain(self)
+
+    def intern(self):
+        """
+        Return the Function built the same way as this one from the shared table of interned functions,
+        interning this Function and every function it is built from if needed. Interned functions built
+        from the same operators, constants, functions and curried functions with equal arguments
+        are the same object, so they share memory and can be compared and hashed by identity.
+        """
+        from pfpy._intern import intern
+        return intern(self)
+
+    def compile(self, cse=False):
+        """
+        Return an equivalent Function whose arithmetic operators and compositions
+        are lowered into a single generated Python function.
+        If cse is True, shared subexpressions are only evaluated once per call.
+        """
+        from pfpy._compile import Compiled
+        return Function(Compiled(self._f, eager=True, cse=cse))
+
+    def vectorize(self):
+        """
+        Return an equivalent Function that is applied to every element of a numpy array at once.
+        Arithmetic operators, compositions, identity and constants are evaluated with ufuncs
+        while every other function is called once per element. Requires numpy.
+        """
+        from pfpy._vectorize import Vectorized
+        return Function(Vectorized(self._f))
+
     # === Implement Composable ===
     def __matmul__(self, other):
         """Return this Function composed with other."""
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
-        return Function(lambda x: self(other(x)))
+        elif is_async(other):
+            return compose_async(other, self)
+        return Function(compose(other, self))
 
     def __rshift__(self, other):
         """Return other composed with this Function."""
         if isinstance(other, Composable):
             return other @ self
-        elif isinstance(other, Callable):
-            return Function(lambda x: other(self(x)))
+        elif is_async(other):
+            return compose_async(self, other)
+        elif callable(other):
+            return Function(compose(self, other))
         else:
             return NotImplemented
 
     def __rmatmul__(self, other):
         """Return other composed with this Function."""
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
         return self >> other
 
     def __rrshift__(self, other):
         """Return this Function composed with other."""
-        if isinstance(other, Callable):
+        if callable(other):
             return self @ other
         else:
             return self(other)  # function application
 
     # === Arithmetic operators ===
     def __pos__(self):
-        return Function(lambda x: +self(x))
+        return _operation(operator.pos, self)
 
     def __neg__(self):
-        return Function(lambda x: -self(x))
+        return _operation(operator.neg, self)
 
     def __add__(self, other):
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
-        return Function(lambda x: self(x) + other(x))
+        return _operation(operator.add, self, other)
 
     def __sub__(self, other):
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
-        return Function(lambda x: self(x) - other(x))
+        return _operation(operator.sub, self, other)
 
     def __mul__(self, other):
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
-        return Function(lambda x: self(x) * other(x))
+        return _operation(operator.mul, self, other)
 
     def __truediv__(self, other):
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
-        return Function(lambda x: self(x) / other(x))
+        return _operation(operator.truediv, self, other)
 
     def __floordiv__(self, other):
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
-        return Function(lambda x: self(x) // other(x))
+        return _operation(operator.floordiv, self, other)
 
     def __pow__(self, other):
-        if not isinstance(other, Real):
+        if not is_real(other):
             return NotImplemented
-        return Function(lambda x: self(x) ** other)
+        return _operation(operator.pow, self, Constant(other))
 
     # === Reflected arithmetic operators ===
     def __radd__(self, other):
-        if other == 0:
-            return self  # Allows sum() to work
-        elif isinstance(other, Callable):
+        if callable(other):
             return self + other
+        elif other == 0:
+            return self  # Allows sum() to work
         else:
             return NotImplemented
 
     def __rsub__(self, other):
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
-        return Function(lambda x: other(x) - self(x))
+        return _operation(operator.sub, other, self)
 
     def __rmul__(self, other):
-        if isinstance(other, Real):
-            return Function(lambda x: other * self(x))  # Scalar multiplication
-        elif isinstance(other, Callable):
+        if is_real(other):
+            return _operation(operator.mul, Constant(other), self)  # Scalar multiplication
+        elif callable(other):
             return self * other
         else:
             return NotImplemented
 
     def __rtruediv__(self, other):
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
-        return Function(lambda x: other(x) / self(x))
+        return _operation(operator.truediv, other, self)
 
     def __rfloordiv__(self, other):
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
-        return Function(lambda x: other(x) // self(x))
+        return _operation(operator.floordiv, other, self)
+
+def is_real(x):
+    """Return whether x is a real number, checking the common built-in types before the ABC."""
+    return type(x) in (int, float) or isinstance(x, Real)
+
+def importable(obj):
+    """Return whether obj can be found by importing its qualified name from its module."""
+    module = sys.modules.get(getattr(obj, "__module__", None))
+    path = getattr(obj, "__qualname__", None)
+    if module is None or path is None:
+        return False
+    for name in path.split("."):
+        module = getattr(module, name, None)
+    return module is obj
+
+# Operators whose chains are flattened into a single Operation
+chained_operators = {operator.add, operator.mul}
+
+def _operation(op, *operands):
+    """
+    Return a Function that applies op to the results of operands.
+    Applying + or * to Functions that apply the same operator extends their chains of operands
+    rather than nesting them, so building a sum of many Functions does not build a deep tree.
+    Chains are folded from left to right, so f + (g + h) is computed as (f + g) + h.
+    """
+    node = None
+    if op in chained_operators:
+        f, g = operands
+        # Checked here first since calling _chain() for every operand would slow down building small trees
+        left = _chain(op, f) if type(f) is Function and (type(f._f) is Operation or Function.autocompile) else None
+        right = _chain(op, g) if type(g) is Function and (type(g._f) is Operation or Function.autocompile) else None
+        if left is not None or right is not None:
+            node = concatenate(f, left, g, right)
+    if node is None:
+        node = Operation(op, *operands)
+    if Function.autocompile:
+        from pfpy._compile import Compiled
+        node = Compiled(node)
+    return Function(node)
+
+def _chain(op, f):
+    """Return the Operation of f if it is a Function that applies the binary operator op, otherwise None."""
+    if type(f) is not Function:
+        return None
+    node = f._f
+    if Function.autocompile:
+        from pfpy._compile import Compiled
+        if isinstance(node, Compiled):
+            node = node.node
+    if type(node) is Operation and node.op is op and (node.counts or len(node.operands) > 1):
+        return node
+    return None
+
+def compose_async(*fs):
+    """Return an AsyncFunction that applies each function in fs in order, awaiting asynchronous ones."""
+    from pfpy._async import AsyncFunction, AsyncPipeline
+    return AsyncFunction(AsyncPipeline.compose(*fs))
 
 def unary(f):
     """Decorator that lifts an unary function into a Function."""
@@ -128,4 +306,5 @@ def identity(x):
 @unary
 def constant(x):
     """Return an unary function that always returns x."""
-    return Function(lambda _: x) 
+    return Function(Constant(x))
+
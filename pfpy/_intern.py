@@ -0,0 +1,102 @@
+from pfpy._function import Function
+from pfpy._predicate import Predicate
+from pfpy._curry import Curried, Partial, Last
+from pfpy._pipeline import Pipeline
+from pfpy._expression import Constant, Operation, Polynomial, Conjunction, Disjunction
+from threading import Lock
+from weakref import WeakValueDictionary
+
+__all__ = ["Interner", "intern"]
+
+# Wrappers whose nodes are interned
+wrappers = (Function, Predicate, Curried)
+
+class Interner:
+    """
+    Represents a table in which unary functions built the same way, from the same operators, constants
+    and functions and from the same curried functions with equal arguments, share a single object.
+    Interned functions are therefore equal, and hash the same, exactly when they are built the same way.
+    Entries are dropped once the functions they hold are no longer used anywhere else.
+    """
+
+    def __init__(self):
+        """Create a new empty Interner."""
+        self.table = WeakValueDictionary()  # Maps structural keys to interned Functions and Predicates
+        self.lock = Lock()
+
+    def __len__(self):
+        return len(self.table)
+
+    def intern(self, f):
+        """
+        Return the interned unary function built the same way as f, which is f itself
+        if no such function was interned before, and intern every function f is built from.
+        Functions with metadata, such as the ones decorated with @unary, and callables that are not
+        Functions or Predicates are never replaced since they are only equal to themselves.
+        """
+        if type(f) not in wrappers or hasattr(f, "__wrapped__"):
+            return f
+        node, key = self._node(f._f)
+        key = (type(f),) + key
+        with self.lock:
+            interned = self.table.get(key)
+            if interned is None:
+                interned = f if node is f._f else type(f)(node)
+                self.table[key] = interned
+        return interned
+
+    def _node(self, node):
+        """
+        Return node with every function it is built from interned, together with a key that is the same
+        for nodes built the same way. Keys refer to interned functions by id since the interned node that
+        is stored along with a key keeps them alive.
+        """
+        if isinstance(node, Pipeline):
+            children = tuple(self.intern(g) for g in node.stages)
+            key = (Pipeline,) + tuple(map(id, children))
+            return rebuild(node, node.stages, children, Pipeline(children)), key
+        elif isinstance(node, Operation):
+            children = tuple(self.intern(g) for g in node.operands)
+            key = (Operation, node.op) + tuple(map(id, children))
+            return rebuild(node, node.operands, children, Operation(node.op, *children)), key
+        elif isinstance(node, (Conjunction, Disjunction)):
+            children = tuple(self.intern(g) for g in node.operands)
+            key = (type(node),) + tuple(map(id, children))
+            return rebuild(node, node.operands, children, type(node)(*children)), key
+        elif isinstance(node, Polynomial):
+            child = self.intern(node.f)
+            key = (Polynomial, id(child), value_key(node.coefficients))
+            return rebuild(node, (node.f,), (child,), Polynomial(node.coefficients, child)), key
+        elif isinstance(node, Constant):
+            return node, (Constant, value_key(node.value))
+        elif type(node) in (Partial, Last):
+            return node, (type(node), id(node.curry), value_key(node.args))
+        return node, (id(node),)  # Other functions are only equal to themselves
+
+def rebuild(node, children, interned, rebuilt):
+    """Return node if every one of its children was already interned, otherwise rebuilt."""
+    if all(g is h for g, h in zip(children, interned)):
+        return node
+    return rebuilt
+
+def value_key(value):
+    """
+    Return a hashable key that is the same for values of the same type that are equal,
+    or a key that is only the same for value itself if it is not hashable.
+    """
+    if type(value) is tuple:
+        return (tuple,) + tuple(value_key(item) for item in value)
+    elif type(value) is float:
+        return (float, value.hex())  # Tells 0.0 and -0.0 apart
+    try:
+        hash(value)
+    except TypeError:
+        return (id(value),)  # Kept alive by the interned node holding it
+    return (type(value), value)
+
+# Interner shared by intern() and the intern() methods of Function and Predicate
+default = Interner()
+
+def intern(f):
+    """Return the unary function built the same way as f from the shared Interner, interning it if needed."""
+    return default.intern(f)
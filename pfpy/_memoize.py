@@ -0,0 +1,192 @@
+from collections import OrderedDict, namedtuple
+from threading import Lock
+from time import monotonic
+
+__all__ = ["CacheInfo"]
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+class LRUCache:
+    """Represents a cache that evicts the least recently used entry first."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default):
+        """Return the value cached for key, or default if there is none."""
+        value = self.entries.get(key, default)
+        if value is not default:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Cache value for key, evicting the least recently used entry if the cache is full."""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if self.maxsize is not None and len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+class LFUCache:
+    """Represents a cache that evicts the least frequently used entry first, oldest first among ties."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = {}   # Maps keys to [value, frequency]
+        self.buckets = {}   # Maps frequencies to the ordered keys used that many times
+        self.lowest = 0     # Lowest frequency of any entry
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _touch(self, key, entry):
+        """Move key to the bucket for one more use than it currently has."""
+        frequency = entry[1]
+        bucket = self.buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[frequency]
+            if self.lowest == frequency:
+                self.lowest = frequency + 1
+        entry[1] = frequency + 1
+        self.buckets.setdefault(frequency + 1, OrderedDict())[key] = None
+
+    def get(self, key, default):
+        """Return the value cached for key, or default if there is none."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return default
+        self._touch(key, entry)
+        return entry[0]
+
+    def put(self, key, value):
+        """Cache value for key, evicting the least frequently used entry if the cache is full."""
+        if key in self.entries:
+            self.entries[key][0] = value
+            self._touch(key, self.entries[key])
+            return
+        if self.maxsize is not None and len(self.entries) >= self.maxsize:
+            bucket = self.buckets[self.lowest]
+            victim, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self.buckets[self.lowest]
+            del self.entries[victim]
+            self.evictions += 1
+        self.entries[key] = [value, 1]
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.lowest = 1
+
+class TTLCache:
+    """Represents a cache whose entries expire ttl seconds after they were stored."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()  # Maps keys to (value, expiry time) in order of expiry
+        self.evictions = 0  # Including the entries removed because they expired
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _expire(self, now):
+        """Remove every entry that has expired by now."""
+        while self.entries:
+            key, (_, expiry) = next(iter(self.entries.items()))
+            if expiry > now:
+                break
+            del self.entries[key]
+            self.evictions += 1
+
+    def get(self, key, default):
+        """Return the value cached for key, or default if there is none or it has expired."""
+        self._expire(monotonic())
+        entry = self.entries.get(key)
+        return default if entry is None else entry[0]
+
+    def put(self, key, value):
+        """Cache value for key, evicting the entry that expires first if the cache is full."""
+        now = monotonic()
+        self._expire(now)
+        self.entries[key] = (value, now + self.ttl)
+        self.entries.move_to_end(key)
+        if self.maxsize is not None and len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+# Marks a key that is not in a cache
+missing = object()
+
+class Memoized:
+    """Represents an unary function whose results are cached for hashable arguments."""
+
+    def __init__(self, f, maxsize=128, policy="lru", ttl=None):
+        """
+        Create a new Memoized for the unary function f that caches up to maxsize results,
+        or an unbounded number of results if maxsize is None. Like functools.lru_cache,
+        nothing is cached if maxsize is 0 or negative.
+        policy is one of "lru", "lfu" or "ttl", where the latter expires results after ttl seconds.
+        """
+        if policy not in ("lru", "lfu", "ttl"):
+            raise ValueError("policy must be one of 'lru', 'lfu' or 'ttl', not {!r}".format(policy))
+        elif policy == "ttl" and ttl is None:
+            raise ValueError("ttl must be given for the ttl policy")
+        self.f = f
+        self.maxsize = maxsize if maxsize is None else max(maxsize, 0)
+        self.policy = policy
+        self.ttl = ttl
+        self.lock = Lock()
+        self.cache = self._new_cache()
+        self.hits = self.misses = 0
+
+    def _new_cache(self):
+        """Return an empty cache with the eviction policy of this Memoized."""
+        if self.policy == "lru":
+            return LRUCache(self.maxsize)
+        elif self.policy == "lfu":
+            return LFUCache(self.maxsize)
+        return TTLCache(self.maxsize, self.ttl)
+
+    def __reduce__(self):
+        return (Memoized, (self.f, self.maxsize, self.policy, self.ttl))  # Caches start out empty
+
+    def __call__(self, x):
+        try:
+            hash(x)
+        except TypeError:
+            return self.f(x)  # Unhashable arguments are never cached
+
+        with self.lock:
+            result = self.cache.get(x, missing)
+            if result is not missing:
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        result = self.f(x)  # Computed without holding the lock so other arguments are not blocked
+        if self.maxsize != 0:
+            with self.lock:
+                self.cache.put(x, result)
+        return result
+
+    def cache_info(self):
+        """Return the CacheInfo(hits, misses, evictions, maxsize, currsize) of this Memoized."""
+        with self.lock:
+            return CacheInfo(self.hits, self.misses, self.cache.evictions, self.maxsize, len(self.cache))
+
+    def cache_clear(self):
+        """Remove every cached result and reset the statistics."""
+        with self.lock:
+            self.cache = self._new_cache()
+            self.hits = self.misses = 0
+
+def memoized(f):
+    """Return the Memoized node of the Function or Predicate f, or raise TypeError if f was not returned by memoize()."""
+    if not isinstance(f._f, Memoized):
+        raise TypeError("{} was not returned by memoize(), so it has no cache".format(type(f).__name__))
+    return f._f
@@ -0,0 +1,531 @@
+from pfpy._function import Function, identity, is_real, chained_operators
+from pfpy._predicate import Predicate
+from pfpy._pipeline import Pipeline
+from pfpy._expression import Constant, Operation, Polynomial, Conjunction, Disjunction, Membership, Intervals
+from pfpy._curry import Partial, Last
+from pfpy._compile import resolve
+from pfpy._sorting import take
+from functools import reduce
+import builtins
+import operator
+
+__all__ = ["optimize", "explain"]
+
+def optimize(f):
+    """Return an unary function equivalent to the Function or Predicate f with every rewrite rule applied."""
+    node = Optimizer().rewrite(f)
+    if node is f:
+        return f
+    return Predicate(node) if isinstance(f, Predicate) else Function(node)
+
+class Optimizer:
+    """Rewrites the nodes of an unary function, rewriting every node that is shared only once."""
+
+    def __init__(self):
+        self.rewritten = {}  # Maps ids of rewritten nodes to their rewrites so sharing is preserved
+
+    def rewrite(self, f):
+        """Return f with every rewrite rule applied, or f itself if none of them apply."""
+        if id(f) not in self.rewritten:
+            self.rewritten[id(f)] = (f, self._rewrite(f))  # Keeps f alive so its id is not reused
+        return self.rewritten[id(f)][1]
+
+    def _rewrite(self, f):
+        node = resolve(f)
+        if isinstance(node, Pipeline):
+            stages = [self.rewrite(stage) for stage in node.stages]
+            stages = rewrite_stages([stage for stage in stages if resolve(stage) is not identity._f])
+            if len(stages) <= 1:
+                return stages[0] if stages else identity
+            changed = len(stages) != len(node.stages) or any(g is not h for g, h in zip(stages, node.stages))
+            return Pipeline(stages) if changed else f
+        elif isinstance(node, Operation):
+            expanded = polynomial(node)
+            if expanded is not None:
+                coefficients, variable = expanded
+                return Polynomial(coefficients, self.rewrite(variable))
+            operands = [self.rewrite(g) for g in node.operands]
+            if node.op in chained_operators and len(operands) > 1 and any(is_chain(g, node.op) for g in operands):
+                # f + (g + h) is f + g + h, as when it is built
+                operands = [h for g in operands for h in (resolve(g).operands if is_chain(g, node.op) else (g,))]
+            simplified = simplify(node.op, operands)
+            if simplified is not None:
+                return self.rewrite(simplified)  # Simplifying may allow more simplifications
+            elif len(operands) == len(node.operands) and all(g is h for g, h in zip(operands, node.operands)):
+                return f
+            return Operation(node.op, *operands)
+        elif isinstance(node, Polynomial):
+            variable = self.rewrite(node.f)
+            return f if variable is node.f else Polynomial(node.coefficients, variable)
+        elif isinstance(node, (Conjunction, Disjunction)):
+            operands, seen = [], {}  # Maps shapes to the operands kept with that shape
+            for g in node.operands:
+                g = self.rewrite(g)
+                nested = resolve(g)
+                for h in (nested.operands if type(nested) is type(node) else (g,)):  # p & (q & r) is p & q & r
+                    kept = seen.setdefault(shape(h), [])
+                    if not any(equivalent(h, k) for k in kept):
+                        kept.append(h)
+                        operands.append(h)  # p & p is p for pure predicates
+            operands = merge_comparisons(type(node), operands)
+            if len(operands) == 1:
+                return operands[0]
+            elif len(operands) == len(node.operands) and all(g is h for g, h in zip(operands, node.operands)):
+                return f
+            return type(node)(*operands)
+        return f
+
+def equivalent(f, g):
+    """Return whether the unary functions f and g are built the same way from the same functions and constants."""
+    f, g = resolve(f), resolve(g)
+    if f is g:
+        return True
+    elif type(f) is not type(g):
+        return False
+    elif isinstance(f, Constant):
+        return equal(f.value, g.value)
+    elif isinstance(f, Operation):
+        return f.op is g.op and all(map(equivalent, f.operands, g.operands))
+    elif isinstance(f, (Conjunction, Disjunction)):
+        return len(f.operands) == len(g.operands) and all(map(equivalent, f.operands, g.operands))
+    elif isinstance(f, Pipeline):
+        return len(f.stages) == len(g.stages) and all(map(equivalent, f.stages, g.stages))
+    elif isinstance(f, Polynomial):
+        return len(f.coefficients) == len(g.coefficients) and all(map(equal, f.coefficients, g.coefficients)) \
+            and equivalent(f.f, g.f)
+    elif isinstance(f, Partial):
+        return f.curry is g.curry and len(f.args) == len(g.args) and all(map(equal, f.args, g.args))
+    return False
+
+def shape(f):
+    """
+    Return a hashable key that is the same for equivalent unary functions,
+    so that only the functions with the same shape have to be compared.
+    """
+    node = resolve(f)
+    if isinstance(node, Constant):
+        return (Constant, type(node.value)) + hashable(node.value)
+    elif isinstance(node, Operation):
+        return (Operation, node.op) + tuple(shape(g) for g in node.operands)
+    elif isinstance(node, (Conjunction, Disjunction)):
+        return (type(node),) + tuple(shape(g) for g in node.operands)
+    elif isinstance(node, Pipeline):
+        return (Pipeline,) + tuple(shape(g) for g in node.stages)
+    elif isinstance(node, Polynomial):
+        return (Polynomial, len(node.coefficients), shape(node.f))
+    elif isinstance(node, Partial):
+        return (Partial, node.curry) + hashable(node.args)
+    return (id(node),)  # Other functions are only equivalent to themselves
+
+def hashable(value):
+    """Return (value,) if value is hashable, otherwise ()."""
+    try:
+        hash(value)
+    except TypeError:
+        return ()
+    return (value,)
+
+def equal(a, b):
+    """Return whether the values a and b are of the same type and equal, without raising exceptions."""
+    try:
+        return a is b or (type(a) is type(b) and bool(a == b))
+    except Exception:
+        return False
+
+def is_operation(node, op):
+    """Return whether node applies the operator op."""
+    return isinstance(node, Operation) and node.op is op
+
+def is_chain(f, op):
+    """Return whether f applies the binary operator op to more than one operand."""
+    node = resolve(f)
+    return is_operation(node, op) and len(node.operands) > 1
+
+def is_natural(x):
+    """Return whether x is a non-negative int."""
+    return type(x) is int and x >= 0
+
+def simplify(op, operands):
+    """Return a simpler unary function equivalent to op applied to the results of operands, or None if there is none."""
+    nodes = [resolve(g) for g in operands]
+    if all(isinstance(node, Constant) for node in nodes):
+        try:
+            return Constant(reduce(op, (node.value for node in nodes)) if len(nodes) > 2
+                            else op(*(node.value for node in nodes)))
+        except Exception:
+            return None  # Errors are left to be raised when called
+    elif op is operator.neg and is_operation(nodes[0], operator.neg):
+        return nodes[0].operands[0]  # -(-f) is f
+    elif op is operator.not_ and is_operation(nodes[0], operator.not_):
+        return Operation(operator.truth, nodes[0].operands[0])  # ~~p is bool(p)
+    elif op is operator.not_ and is_operation(nodes[0], operator.truth):
+        return Operation(operator.not_, nodes[0].operands[0])
+    elif op is operator.truth and (is_operation(nodes[0], operator.truth) or is_operation(nodes[0], operator.not_)):
+        return nodes[0]
+    elif op is operator.pow and is_operation(nodes[0], operator.pow):
+        # (f ** a) ** b is f ** (a * b), which is only exact for non-negative integer exponents
+        inner = resolve(nodes[0].operands[1])
+        if isinstance(inner, Constant) and isinstance(nodes[1], Constant) \
+                and is_natural(inner.value) and is_natural(nodes[1].value):
+            return Operation(operator.pow, nodes[0].operands[0], Constant(inner.value * nodes[1].value))
+    elif op in chained_operators and len(nodes) > 2 and isinstance(nodes[0], Constant) and isinstance(nodes[1], Constant):
+        # A chain is folded from left to right, so the constants it starts with can be folded first
+        count = next(i for i, node in enumerate(nodes) if not isinstance(node, Constant))
+        folded = simplify(op, nodes[:count])
+        if folded is not None:
+            return Operation(op, folded, *operands[count:])
+    elif op is operator.mul and len(nodes) == 2 and isinstance(nodes[0], Constant) and is_operation(nodes[1], operator.mul):
+        # a * (b * f) is (a * b) * f for the scalar multiplications built by a * Function
+        inner = resolve(nodes[1].operands[0])
+        if isinstance(inner, Constant):
+            return Operation(operator.mul, Constant(nodes[0].value * inner.value), *nodes[1].operands[1:])
+    return None
+
+# Operators that keep a polynomial a polynomial
+polynomial_operators = {operator.pos, operator.neg, operator.add, operator.sub, operator.mul, operator.pow}
+
+# Polynomials of a higher degree are left as they are
+max_degree = 1000
+
+def polynomial(node):
+    """
+    Return the coefficients, highest degree first, of the polynomial computed by the Operation node
+    together with the unary function it is a polynomial of, or None if node is not worth evaluating
+    with Horner's method. node must only add, subtract, negate, multiply and raise to constant
+    non-negative integer powers the same unary function and real constants. Sums raised to powers, such as
+    (f - constant(a)) ** k, count as that unary function themselves since expanding them loses precision.
+    """
+    variables, operations = [], [0]
+    terms = expand(node, variables, operations)
+    if terms is None:
+        return None
+    degree = max((k for k, c in terms.items() if c != 0), default=0)
+    if degree < 2 or operations[0] <= degree:
+        return None  # Horner's method takes about degree multiplications and fewer additions
+    return tuple(terms.get(k, 0) for k in range(degree, -1, -1)), variables[0]
+
+def expand(f, variables, operations):
+    """
+    Return a dict from degrees to the coefficients of the polynomial computed by f, or None if it is not one.
+    The first other unary function found is appended to variables and every other one must be equivalent to it,
+    and the number of operators applied is added to operations[0].
+    """
+    node = resolve(f)
+    if isinstance(node, Constant):
+        return {0: node.value} if is_real(node.value) else None
+    elif not (isinstance(node, Operation) and node.op in polynomial_operators):
+        return variable(f, variables)
+
+    operations[0] += 1
+    if node.op is operator.pow:
+        exponent = resolve(node.operands[1])
+        if not (isinstance(exponent, Constant) and is_natural(exponent.value) and exponent.value <= max_degree):
+            return None
+        inner = []
+        base = expand(node.operands[0], inner, operations)
+        if base is not None and len(base) > 1:
+            # Expanding powers of sums such as (x - a) ** k cancels out catastrophically away from 0,
+            # so the sum is computed once and the polynomial is one of it instead
+            base = variable(node.operands[0], variables)
+        elif inner and variable(inner[0], variables) is None:
+            return None
+        if base is None:
+            return None
+        result = {0: 1}
+        for _ in range(exponent.value):
+            result = multiply(result, base)
+            if result is None:
+                return None
+        return result
+
+    operands = []
+    for g in node.operands:
+        terms = expand(g, variables, operations)
+        if terms is None:
+            return None
+        operands.append(terms)
+    if node.op is operator.pos:
+        return operands[0]
+    elif node.op is operator.neg:
+        return {k: -c for k, c in operands[0].items()}
+    elif node.op is operator.mul:
+        return reduce(lambda a, b: a and multiply(a, b), operands)
+    result = dict(operands[0])
+    for terms in operands[1:]:
+        for k, c in terms.items():
+            result[k] = node.op(result.get(k, 0), c)
+    return result
+
+def variable(f, variables):
+    """
+    Return the polynomial of degree 1 computed by the unary function f if it is the first one in variables,
+    which it is appended to if variables is empty, otherwise None.
+    """
+    if not variables:
+        variables.append(f)
+    return {1: 1} if equivalent(f, variables[0]) else None
+
+def multiply(a, b):
+    """Return the product of the polynomials a and b, dicts from degrees to coefficients, or None if it is too large."""
+    result = {}
+    for i, c in a.items():
+        for j, d in b.items():
+            if i + j > max_degree:
+                return None
+            result[i + j] = result.get(i + j, 0) + c * d
+    return result
+
+# Comparisons that bound the values an interval holds
+bounds = {operator.lt, operator.le, operator.gt, operator.ge, operator.eq}
+
+def comparison(f):
+    """
+    Return a tuple of the unary function whose result f compares with a value, the comparison and the value
+    if f is a curried comparison operator, possibly composed after other functions, otherwise None.
+    """
+    node = resolve(f)
+    stages = node.stages if isinstance(node, Pipeline) else (f,)
+    last = resolve(stages[-1])
+    if not (isinstance(last, Last) and last.reverse and (last.func in bounds or last.func is operator.ne)):
+        return None
+    prefix = identity if len(stages) == 1 else stages[0] if len(stages) == 2 else Pipeline(stages[:-1])
+    return prefix, last.func, last.args[0]
+
+def interval(op, value):
+    """Return the interval of the values x for which op(x, value) is true."""
+    if op is operator.lt:
+        return (None, False, value, False)
+    elif op is operator.le:
+        return (None, False, value, True)
+    elif op is operator.gt:
+        return (value, False, None, False)
+    elif op is operator.ge:
+        return (value, True, None, False)
+    return (value, True, value, True)
+
+def terms(f):
+    """
+    Return a tuple of the unary function whose result f checks, whether it checks that the result
+    is equal to none of some values, a tuple of those values or None, and a tuple of the intervals
+    it checks the result is within or None, or None if f is not such a check. Checks against None have
+    no intervals, since None also marks their unbounded ends.
+    """
+    node = resolve(f)
+    if isinstance(node, Membership):
+        values = tuple(node.values)
+        bounded = not node.negated and all(v is not None for v in values)
+        return node.f, node.negated, values, tuple(interval(operator.eq, v) for v in values) if bounded else None
+    elif isinstance(node, Intervals):
+        return node.f, False, None, node.intervals
+    compared = comparison(node)
+    if compared is None:
+        return None
+    prefix, op, value = compared
+    if op is operator.ne:
+        return prefix, True, (value,), None
+    return prefix, False, (value,) if op is operator.eq else None, None if value is None else (interval(op, value),)
+
+def is_set_value(value):
+    """Return whether value is of a built-in type whose equality agrees with its hash."""
+    return type(value) in (str, bytes, int, float, bool, type(None)) and value == value
+
+def are_ordered(values):
+    """Return whether the values are all numbers, all str or all bytes, and none of them is NaN."""
+    kinds = {str if type(value) is str else bytes if type(value) is bytes else
+             float if type(value) in (int, float, bool) and value == value else None for value in values}
+    return len(kinds) <= 1 and None not in kinds
+
+def merge_comparisons(kind, operands):
+    """
+    Return the list operands of a Conjunction or Disjunction, as given by kind, with every run of adjacent
+    checks of the same function against constants replaced by a single Membership or Intervals
+    in the position of the first one that is merged. Checks are equalities, inequalities and order comparisons
+    with the curried comparison operators, possibly composed after the same function.
+    """
+    groups, seen = [], {}  # Lists of the positions and terms of checks of the same function
+    for i, g in enumerate(operands):
+        found = terms(g)
+        if found is None:
+            continue
+        prefix, negated = found[0], found[1]
+        if negated and kind is Disjunction:
+            continue  # Only p & q of inequalities is a single check
+        key = (shape(prefix), negated)
+        group = next((group for group in seen.get(key, ()) if equivalent(group[0][1][0], prefix)), None)
+        if group is None:
+            group = []
+            seen.setdefault(key, []).append(group)
+            groups.append(group)
+        group.append((i, found))
+
+    replaced = {}
+    for group in groups:
+        for members, merged in merge_group(kind, group):
+            replaced.update((i, None) for i, _ in members)
+            replaced[members[0][0]] = merged
+    return [replaced.get(i, g) for i, g in enumerate(operands) if replaced.get(i, g) is not None]
+
+def merge_group(kind, group):
+    """
+    Yield tuples of the checks of the same function in group, a list of their positions and terms, that can be
+    merged into a single Membership or Intervals equivalent to kind of them, together with that Membership or Intervals.
+    """
+    # The checks in between may decide the result or raise errors first, so only adjacent checks are merged
+    run = group[:1]
+    for member in group[1:] + [None]:
+        if member is not None and member[0] == run[-1][0] + 1:
+            run.append(member)
+            continue
+        merged = merge_values(kind, run) or merge_intervals(kind, run)
+        if merged is not None:
+            yield merged
+        run = [member]
+
+def merge_values(kind, run):
+    """
+    Return a tuple of the adjacent checks in run, a list of their positions and terms, together with
+    a single Membership equivalent to kind of them if they are all equalities or all inequalities, or None.
+    """
+    prefix, negated = run[0][1][0], run[0][1][1]
+    if len(run) < 2 or any(values is None for _, (_, _, values, _) in run):
+        return None
+    values = [value for _, (_, _, values, _) in run for value in values]
+    if not (all(map(is_set_value, values)) and (negated or kind is Disjunction)):
+        return None
+    return run, Membership(prefix, values, negated)
+
+def merge_intervals(kind, run):
+    """
+    Return a tuple of the adjacent checks in run, a list of their positions and terms, that can be
+    merged into a single Intervals equivalent to kind of them, together with that Intervals, or None.
+    """
+    prefix = run[0][1][0]
+    ordered = [n for n, (_, (_, _, values, _)) in enumerate(run) if values is None]
+    if not ordered:
+        return None
+    if kind is Conjunction:
+        run = run[ordered[0]:]  # Equalities before the first order comparison are false for other types
+    if len(run) < 2 or any(intervals is None for _, (_, _, _, intervals) in run):
+        return None
+    ends = [end for _, (_, _, _, intervals) in run for low, _, high, _ in intervals
+            for end in (low, high) if end is not None]
+    if not are_ordered(ends):
+        return None
+    if kind is Disjunction:
+        result = union([i for _, (_, _, _, intervals) in run for i in intervals])
+    else:
+        result = run[0][1][3]
+        for _, (_, _, _, intervals) in run[1:]:
+            result = union([intersection(a, b) for a in result for b in intervals])
+    if not result or result[0][0] is None and result[0][2] is None:
+        return None  # Checks that never or always hold would no longer compare anything, not even NaN
+    return run, Intervals(prefix, result)
+
+def lower(interval):
+    """Return a key that sorts intervals by their lower bounds, with unbounded and closed ends first."""
+    low, low_closed, _, _ = interval
+    return (low is not None, low if low is not None else 0, not low_closed)
+
+def intersection(a, b):
+    """Return the interval of the values within both intervals a and b."""
+    (low, low_closed, high, high_closed), (b_low, b_low_closed, b_high, b_high_closed) = a, b
+    if low is None or (b_low is not None and (b_low > low or (b_low == low and not b_low_closed))):
+        low, low_closed = b_low, b_low_closed
+    if high is None or (b_high is not None and (b_high < high or (b_high == high and not b_high_closed))):
+        high, high_closed = b_high, b_high_closed
+    return (low, low_closed, high, high_closed)
+
+def is_empty(interval):
+    """Return whether no value is within interval."""
+    low, low_closed, high, high_closed = interval
+    return low is not None and high is not None and (low > high or (low == high and not (low_closed and high_closed)))
+
+def union(intervals):
+    """Return the sorted disjoint intervals holding the values within any of the intervals."""
+    result = []
+    for interval in sorted((i for i in intervals if not is_empty(i)), key=lower):
+        if result:
+            low, low_closed, high, high_closed = result[-1]
+            next_low, next_low_closed, next_high, next_high_closed = interval
+            if high is None or next_low is None or high > next_low \
+                    or (high == next_low and (high_closed or next_low_closed)):
+                # Overlapping or touching intervals are merged into one
+                if high is not None and (next_high is None or next_high > high):
+                    high, high_closed = next_high, next_high_closed
+                elif high is not None and next_high == high:
+                    high_closed = high_closed or next_high_closed
+                result[-1] = (low, low_closed, high, high_closed)
+                continue
+        result.append(interval)
+    return result
+
+def rewrite_stages(stages):
+    """Return the list stages with every pair of adjacent stages that a rule applies to replaced."""
+    i = 0
+    while i < len(stages) - 1:
+        for rule in stage_rules:
+            replacement = rule(stages[i], stages[i + 1])
+            if replacement is not None:
+                stages[i:i + 2] = [replacement]
+                break
+        else:
+            i += 1
+    return stages
+
+def curried_args(f, func):
+    """Return the arguments bound to f if it is func curried with only its last argument missing, otherwise None."""
+    node = resolve(f)
+    if isinstance(node, Last) and node.func is func:
+        return node.args
+    return None
+
+def sorted_key(f):
+    """Return a tuple of the key of f if it is the curried sorted, otherwise None."""
+    from pfpy.curried import call_with_key
+    args = curried_args(f, call_with_key)
+    if args is not None and args[0] is builtins.sorted:
+        return (args[1],)
+    return None
+
+def prefix_length(f):
+    """Return k if f takes the first k items of a sequence or iterable, otherwise None."""
+    args = curried_args(f, take)
+    if args is not None:
+        return args[0]
+    args = curried_args(f, operator.getitem)
+    if args is not None and isinstance(args[0], slice):
+        start, stop, step = args[0].start, args[0].stop, args[0].step
+        if start in (None, 0) and step in (None, 1) and stop is not None and stop >= 0:
+            return stop
+    return None
+
+def sorted_then_take(first, second):
+    """Return bottom_k(key, k) if first is sorted(key) and second takes its first k items."""
+    key, k = sorted_key(first), prefix_length(second)
+    if key is None or k is None:
+        return None
+    from pfpy.curried import bottom_k
+    return bottom_k(key[0], k)
+
+# Rules that replace two adjacent stages of a Pipeline with a single one, or return None
+stage_rules = [sorted_then_take]
+
+def explain(f):
+    """Return a description of the tree of the Function or Predicate f before and after optimizing it."""
+    return "Before:\n{}\nAfter:\n{}".format(describe(f), describe(optimize(f)))
+
+def describe(f, depth=0):
+    """Return a description of the tree of f with one indented line per node."""
+    from pfpy._profile import label
+    node = resolve(f)
+    lines = ["  " * depth + label(node)]
+    if isinstance(node, Pipeline):
+        children = node.stages
+    elif isinstance(node, (Operation, Conjunction, Disjunction)):
+        children = node.operands
+    elif isinstance(node, (Polynomial, Membership, Intervals)):
+        children = (node.f,)
+    else:
+        children = ()
+    lines.extend(describe(child, depth + 1) for child in children)
+    return "\n".join(lines)
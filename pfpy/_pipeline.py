@@ -0,0 +1,28 @@
+__all__ = ["Pipeline"]
+
+class Pipeline:
+    """Represents a chain of unary functions applied one after the other."""
+
+    def __init__(self, stages):
+        """Create a new Pipeline that applies each function in stages in order."""
+        self.stages = tuple(stages)
+
+    def __call__(self, x):
+        for stage in self.stages:
+            x = stage(x)
+        return x
+
+def compose(*fs):
+    """
+    Return a Pipeline that applies each function in fs in order.
+    Stages of nested Pipelines are spliced in rather than nested so that
+    calling the result never needs more than one stack frame per stage.
+    """
+    stages = []
+    for f in fs:
+        node = getattr(f, "_f", f)  # Look through Function and Predicate wrappers
+        if isinstance(node, Pipeline):
+            stages.extend(node.stages)
+        else:
+            stages.append(f)
+    return Pipeline(stages)
@@ -1,12 +1,15 @@
-from collections.abc import Callable
-from pfpy._composable import Composable
+from pfpy._composable import Composable, is_async
+from pfpy._pipeline import compose
 from functools import update_wrapper
-from pfpy._function import Function
+from pfpy._function import Function, importable, compose_async
+from pfpy._expression import Operation, Conjunction, Disjunction, concatenate
+import operator
 
 __all__ = ["Predicate", "predicate"]
 
-class Predicate(Callable, Composable):
+class Predicate(Composable):
     """Represent an unary predicate."""
+    __slots__ = ("_f", "__dict__", "__weakref__")  # __dict__ is only created for metadata such as __name__
 
     def __init__(self, f):
         """Create a new Predicate to represent unary predicate f."""
@@ -16,31 +19,137 @@ class Predicate(Callable, Composable):
     def __call__(self, x):
         return self._f(x)
 
+    def __reduce__(self):
+        if importable(self):
+            return self.__qualname__  # Pickle by reference like a regular function
+        state = {k: v for k, v in self.__dict__.items() if k not in ("_f", "__wrapped__")}
+        return (type(self), (self._f,), state)
+
+    def mask(self, data):
+        """
+        Return a boolean numpy array of whether each element of the array data, or each row
+        of data if it is a dict of column arrays, satisfies this Predicate.
+        Logical operators, compositions and the curried comparison operators are evaluated
+        with vectorized numpy operations while every other predicate is called once per element.
+        Requires numpy.
+        """
+        from pfpy._vectorize import mask
+        return mask(self, data)
+
+    def adaptive(self, period=1024, sampling=16):
+        """
+        Return an equivalent AdaptivePredicate that reorders the operands of its chains of & and |
+        at runtime so that cheap and selective operands are evaluated first.
+        Only suitable for pure predicates since operands may be evaluated in any order.
+        """
+        from pfpy._adaptive import AdaptivePredicate
+        return AdaptivePredicate(self, period, sampling)
+
+    def memoize(self, maxsize=128, policy="lru", ttl=None):
+        """
+        Return an equivalent Predicate that caches its results for hashable arguments.
+        At most maxsize results are kept, or any number of them if maxsize is None,
+        and policy decides which ones are evicted: "lru" evicts the least recently used,
+        "lfu" the least frequently used and "ttl" also expires results after ttl seconds.
+        The cache is thread-safe and acts as a boundary that compile() and vectorize() call as is.
+        """
+        from pfpy._memoize import Memoized
+        wrapper = Predicate(Memoized(self._f, maxsize, policy, ttl))
+        if hasattr(self, "__wrapped__"):
+            update_wrapper(wrapper, self)  # Keeps the metadata given by @predicate
+        return wrapper
+
+    def cache_info(self):
+        """
+        Return the CacheInfo(hits, misses, evictions, maxsize, currsize) of a Predicate returned by memoize(),
+        or raise TypeError for any other Predicate.
+        """
+        from pfpy._memoize import memoized
+        return memoized(self).cache_info()
+
+    def cache_clear(self):
+        """
+        Remove every result cached by a Predicate returned by memoize() and reset its statistics,
+        or raise TypeError for any other Predicate.
+        """
+        from pfpy._memoize import memoized
+        memoized(self).cache_clear()
+
+    def profile(self):
+        """
+        Return a Profile holding an instrumented copy of this Predicate, which can be called in its place,
+        that records the calls, cumulative and self time and exceptions of every node it is built from.
+        This Predicate itself is left untouched.
+        """
+        from pfpy._profile import Profile
+        return Profile(self)
+
+    def optimize(self):
+        """
+        Return an equivalent Predicate rewritten to do less work, or this Predicate if nothing can be rewritten.
+        Compositions with identity are removed, operators applied to constants are folded,
+        -(-f), ~~p, (f ** a) ** b and repeated scalar multiplications are collapsed, p & p becomes p,
+        polynomials of a function are evaluated with Horner's method,
+        comparisons of a function against constants chained with & or | become one set or interval check
+        and a curried sorted followed by a stage that takes its first k items becomes bottom_k.
+        Only suitable for pure functions since fewer calls may be made.
+        """
+        from pfpy._optimize import optimize
+        return optimize(self)
+
+    def explain(self):
+        """Return a description of the tree of this Predicate before and after optimize()."""
+        from pfpy._optimize import explain
+        return explain(self)
+
+    def intern(self):
+        """
+        Return the Predicate built the same way as this one from the shared table of interned functions,
+        interning this Predicate and every function it is built from if needed. Interned functions built
+        from the same operators, constants, functions and curried functions with equal arguments
+        are the same object, so they share memory and can be compared and hashed by identity.
+        """
+        from pfpy._intern import intern
+        return intern(self)
+
+    def compile(self, cse=False):
+        """
+        Return an equivalent Predicate whose logical operators and compositions
+        are lowered into a single generated Python function.
+        If cse is True, shared subexpressions are only evaluated once per call.
+        """
+        from pfpy._compile import Compiled
+        return Predicate(Compiled(self._f, eager=True, cse=cse))
+
     # === Implement Composable ===
     def __matmul__(self, other):
         """Return this Predicate composed with other."""
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
-        return Predicate(lambda x: self(other(x)))
+        elif is_async(other):
+            return compose_async(other, self)
+        return Predicate(compose(other, self))
 
     def __rshift__(self, other):
         """Return other composed with this Predicate."""
         if isinstance(other, Composable):
             return other @ self
-        elif isinstance(other, Callable):
-            return Function(lambda x: other(self(x)))
+        elif is_async(other):
+            return compose_async(self, other)
+        elif callable(other):
+            return Function(compose(self, other))
         else:
             return NotImplemented
 
     def __rmatmul__(self, other):
         """Return other composed with this Predicate."""
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
         return self >> other
 
     def __rrshift__(self, other):
         """Return this Predicate composed with other."""
-        if isinstance(other, Callable):
+        if callable(other):
             return self @ other
         else:
             return self(other)  # Function application
@@ -48,28 +157,43 @@ class Predicate(Callable, Composable):
 
     # === Logical operators ===
     def __invert__(self):
-        return Predicate(lambda x: not self(x))
+        return Predicate(Operation(operator.not_, self))
 
     def __and__(self, other):
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
-        return Predicate(lambda x: self(x) and other(x))
+        return Predicate(join(Conjunction, self, other))
 
     def __or__(self, other):
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
-        return Predicate(lambda x: self(x) or other(x))
+        return Predicate(join(Disjunction, self, other))
 
     # === Reflected logical operators ===
     def __rand__(self, other):
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
-        return Predicate(lambda x: other(x) and self(x))
+        return Predicate(join(Conjunction, other, self))
 
     def __ror__(self, other):
-        if not isinstance(other, Callable):
+        if not callable(other):
             return NotImplemented
-        return Predicate(lambda x: other(x) or self(x))
+        return Predicate(join(Disjunction, other, self))
+
+def join(kind, p, q):
+    """
+    Return a node of the logical operator that kind implements applied to p and q. The operands of
+    a Predicate built with the same operator are spliced in, keeping chains of & and | flat however
+    many predicates they combine, and a chain is extended in amortized O(1) time.
+    """
+    node = concatenate(p, chain(kind, p), q, chain(kind, q))
+    return node if node is not None else kind(p, q)
+
+def chain(kind, p):
+    """Return the node of p if it is a Predicate built with the logical operator that kind implements, otherwise None."""
+    if type(p) is Predicate and type(p._f) is kind:
+        return p._f
+    return None
 
 def predicate(f):
     """Decorator that lifts an unary predicate into a Predicate."""
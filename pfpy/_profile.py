@@ -0,0 +1,150 @@
+from pfpy._function import Function, identity
+from pfpy._predicate import Predicate
+from pfpy._pipeline import Pipeline
+from pfpy._expression import Constant, Operation, Polynomial, Conjunction, Disjunction, Membership, Intervals
+from pfpy._curry import Partial
+from collections import namedtuple
+from threading import local
+from time import perf_counter
+import operator
+
+__all__ = ["Profile"]
+
+NodeStatistics = namedtuple("NodeStatistics", ["label", "depth", "calls", "cumulative_time", "self_time", "exceptions"])
+
+# Labels of the operators that have a symbol
+symbols = {
+    operator.pos: "+", operator.neg: "-", operator.not_: "~", operator.truth: "bool",
+    operator.add: "+", operator.sub: "-", operator.mul: "*",
+    operator.truediv: "/", operator.floordiv: "//", operator.pow: "**",
+}
+
+class Profile:
+    """
+    Represents the call statistics of every node of an instrumented copy of an unary function.
+    The original function is left untouched so it does not pay for any instrumentation.
+    """
+
+    def __init__(self, f):
+        """Create a new Profile with an instrumented copy of the Function or Predicate f."""
+        self.local = local()  # Each thread keeps its own stack of running nodes
+        self.root = self._instrument(f)
+        self.function = (Predicate if isinstance(f, Predicate) else Function)(self.root)
+
+    def __call__(self, x):
+        return self.function(x)
+
+    def _instrument(self, f, name=None):
+        """Return a Probe that records the calls of f and of every node it is built from."""
+        while type(f) in (Function, Predicate):
+            name = name or getattr(f, "__name__", None)  # Prefer names given by update_wrapper
+            f = f._f
+
+        if f is identity._f or isinstance(f, Constant):
+            return f  # Too cheap to be worth recording
+        elif isinstance(f, Pipeline):
+            children = [self._instrument(stage) for stage in f.stages]
+            node = Pipeline(children)
+        elif isinstance(f, Operation):
+            children = [self._instrument(g) for g in f.operands]
+            node = Operation(f.op, *children)
+        elif isinstance(f, Polynomial):
+            children = [self._instrument(f.f)]
+            node = Polynomial(f.coefficients, children[0])
+        elif isinstance(f, (Conjunction, Disjunction)):
+            children = [self._instrument(g) for g in f.operands]
+            node = type(f)(*children)
+        else:
+            children, node = [], f
+        return Probe(node, name or label(f), [child for child in children if isinstance(child, Probe)], self.local)
+
+    def table(self):
+        """
+        Return a list with the NodeStatistics(label, depth, calls, cumulative_time, self_time, exceptions)
+        of every instrumented node, listed depth first so that depth describes the tree they form.
+        """
+        rows = []
+
+        def visit(probe, depth):
+            rows.append(NodeStatistics(probe.label, depth, probe.calls, probe.cumulative_time,
+                                       probe.self_time, probe.exceptions))
+            for child in probe.children:
+                visit(child, depth + 1)
+        visit(self.root, 0)
+        return rows
+
+    def tree(self):
+        """Return the statistics of every instrumented node as nested dicts that mirror how the function was built."""
+        def visit(probe):
+            return {"label": probe.label, "calls": probe.calls, "cumulative_time": probe.cumulative_time,
+                    "self_time": probe.self_time, "exceptions": probe.exceptions,
+                    "children": [visit(child) for child in probe.children]}
+        return visit(self.root)
+
+    def __str__(self):
+        lines = ["{:40} {:>10} {:>14} {:>14} {:>10}".format("node", "calls", "cumulative", "self", "exceptions")]
+        for row in self.table():
+            lines.append("{:40} {:>10} {:>14.6f} {:>14.6f} {:>10}".format(
+                ("  " * row.depth + row.label)[:40], row.calls, row.cumulative_time, row.self_time, row.exceptions))
+        return "\n".join(lines)
+
+def label(node):
+    """Return a short description of the unary function node, which is not wrapped in a Function or Predicate."""
+    if node is identity._f:
+        return "identity"
+    elif isinstance(node, Constant):
+        return "constant({!r})".format(node.value)
+    elif isinstance(node, Pipeline):
+        return ">>"
+    elif isinstance(node, Operation):
+        return symbols.get(node.op) or node.op.__name__
+    elif isinstance(node, Polynomial):
+        return "polynomial(degree {})".format(len(node.coefficients) - 1)
+    elif isinstance(node, Membership):
+        return "{}({} values)".format("not in" if node.negated else "in", len(node.values))
+    elif isinstance(node, Intervals):
+        return "intervals({})".format(len(node.intervals))
+    elif isinstance(node, (Conjunction, Disjunction)):
+        return "&" if isinstance(node, Conjunction) else "|"
+    elif isinstance(node, Partial):
+        from pfpy.curried import call_with_key
+        func, args = node.curry.func, node.args
+        if func is call_with_key and args:
+            func, args = args[0], args[1:]  # The curried sorted, max and min are named after the built-in
+        return "{}({})".format(getattr(func, "__name__", "curried"),
+                               ", ".join(getattr(arg, "__name__", None) or repr(arg) for arg in args))
+    return getattr(node, "__name__", None) or type(node).__name__
+
+class Probe:
+    """Represents an unary function that records how often it is called and how long it takes."""
+
+    def __init__(self, f, label, children, state):
+        """
+        Create a new Probe for the unary function f, labeled label, that is built from the Probes in children.
+        state is the thread local namespace holding the stack of running Probes.
+        """
+        self.f = f
+        self.label = label
+        self.children = children
+        self.state = state
+        self.calls = self.exceptions = 0
+        self.cumulative_time = self.self_time = 0.0
+
+    def __call__(self, x):
+        stack = getattr(self.state, "stack", None)
+        if stack is None:
+            stack = self.state.stack = []
+        self.calls += 1
+        stack.append(0.0)  # Time spent in nested Probes
+        start = perf_counter()
+        try:
+            return self.f(x)
+        except BaseException:
+            self.exceptions += 1
+            raise
+        finally:
+            elapsed = perf_counter() - start
+            self.cumulative_time += elapsed
+            self.self_time += elapsed - stack.pop()
+            if stack:
+                stack[-1] += elapsed
@@ -0,0 +1,73 @@
+from itertools import islice
+import heapq
+
+__all__ = ["external_sorted"]
+
+def top_k(key, k, iterable):
+    """
+    Return a list of the k largest items of iterable by key, largest first.
+    Equivalent to sorted(iterable, key=key, reverse=True)[:k] but only ever holds k items.
+    """
+    return heapq.nlargest(k, iterable, key=key)
+
+def bottom_k(key, k, iterable):
+    """
+    Return a list of the k smallest items of iterable by key, smallest first.
+    Equivalent to sorted(iterable, key=key)[:k] but only ever holds k items.
+    """
+    return heapq.nsmallest(k, iterable, key=key)
+
+def take(k, iterable):
+    """Return a list of the first k items of iterable."""
+    return list(islice(iterable, k))
+
+def external_sorted(iterable, key=None, reverse=False, chunksize=100000, directory=None):
+    """
+    Return an iterator over the items of iterable in the same order as sorted(iterable, key=key, reverse=reverse).
+    At most chunksize items are sorted in memory at a time. If there are more, each sorted chunk is pickled
+    to a temporary file in directory and the chunks are merged as the iterator is consumed.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    return merged(iterable, key, reverse, chunksize, directory)
+
+def merged(iterable, key, reverse, chunksize, directory):
+    """Yield the items of iterable for external_sorted, sorting and spilling them once iteration starts."""
+    iterator = iter(iterable)
+    chunk = sorted(islice(iterator, chunksize), key=key, reverse=reverse)
+    if len(chunk) < chunksize:
+        yield from chunk  # Fits in memory
+        return
+
+    import tempfile  # Only needed for inputs that are spilled
+    files = []
+    try:
+        while chunk:
+            file = tempfile.TemporaryFile(dir=directory)
+            files.append(file)
+            spill(chunk, file)
+            chunk = sorted(islice(iterator, chunksize), key=key, reverse=reverse)
+        yield from heapq.merge(*(unspill(file) for file in files), key=key, reverse=reverse)
+    finally:
+        for file in files:
+            file.close()
+
+# Number of items pickled together when spilling, which is much faster than pickling them one by one
+block_size = 1024
+
+def spill(items, file):
+    """Write the list items to file in blocks of pickled items."""
+    import pickle
+    for i in range(0, len(items), block_size):
+        pickle.dump(items[i:i + block_size], file, protocol=pickle.HIGHEST_PROTOCOL)
+    file.seek(0)
+
+def unspill(file):
+    """Yield the items written to file by spill one block at a time."""
+    import pickle
+    while True:
+        try:
+            block = pickle.load(file)
+        except EOFError:
+            return
+        yield from block
@@ -0,0 +1,103 @@
+from itertools import chain
+import mmap
+
+__all__ = ["read_lines", "read_records", "read_chunks"]
+
+# Number of bytes read at a time when splitting a file into records, small enough for blocks to stay in cache
+block_size = 1 << 16
+
+def read_lines(path, encoding=None):
+    """
+    Return an iterator over the lines of the file at path without their line terminators, \n or \r\n.
+    Lines are bytes unless encoding is given, which must be compatible with ASCII such as "utf-8".
+    The file is read lazily in large blocks so only one block and its lines are held in memory at a time.
+    """
+    return chain.from_iterable(split(blocks(path, block_size), b"\n", encoding, crlf=True))
+
+def read_records(path, delimiter, encoding=None):
+    """
+    Return an iterator over the records of the file at path separated by delimiter, without the delimiter.
+    Records are bytes unless encoding is given, which must be compatible with ASCII such as "utf-8",
+    in which case delimiter may also be a str. A delimiter at the very end of the file does not start
+    another record. The file is read lazily in large blocks so only one block and its records are
+    held in memory at a time.
+    """
+    if isinstance(delimiter, str):
+        delimiter = delimiter.encode(encoding or "utf-8")
+    if not delimiter:
+        raise ValueError("delimiter must not be empty")
+    return chain.from_iterable(split(blocks(path, block_size), delimiter, encoding))
+
+def read_chunks(path, size):
+    """
+    Return an iterator over consecutive chunks of size bytes of the file at path, the last of which may be shorter.
+    Regular files are memory mapped and every chunk is a read-only memoryview into the mapping,
+    so nothing is copied and only the pages being used are loaded. Other files, such as pipes, yield bytes.
+    """
+    if size < 1:
+        raise ValueError("size must be at least 1")
+    return blocks(path, size, copy=False)
+
+def blocks(path, size, copy=True):
+    """
+    Yield consecutive blocks of size bytes of the file at path, memory mapping it if possible.
+    If copy is False, the blocks of a memory mapped file are memoryviews into the mapping.
+    """
+    with open(path, "rb") as file:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):  # Empty files and pipes cannot be mapped
+            yield from iter(lambda: file.read(size), b"")
+            return
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        mapped.madvise(mmap.MADV_SEQUENTIAL)  # Lets the kernel read ahead
+    if copy:
+        with mapped:
+            for start in range(0, len(mapped), size):
+                yield mapped[start:start + size]
+    else:
+        # The mapping is closed once the last memoryview into it is garbage collected
+        view = memoryview(mapped)
+        for start in range(0, len(mapped), size):
+            yield view[start:start + size]
+
+def split(blocks, delimiter, encoding=None, crlf=False):
+    """
+    Yield lists of the records separated by delimiter in the concatenation of the bytes in blocks,
+    decoded with encoding if it is given. If crlf is True, every \r\n is treated as \n.
+    Each block is split at once so that records are not found, nor yielded, one by one.
+    """
+    pieces, rest = [], b""  # Pieces of the record that rest ends, joined once the record is complete
+    overlapping = any(delimiter[:n] == delimiter[-n:] for n in range(1, len(delimiter)))
+    for block in blocks:
+        data = rest + block
+        if crlf:
+            data = data.replace(b"\r\n", b"\n")  # A \r at the end is kept in rest until the next block
+        cut = last_boundary(data, delimiter) if overlapping else data.rfind(delimiter)
+        if cut < 0:
+            # Records longer than a block are put together over several blocks, keeping the end of data
+            # in rest in case the next block starts with the rest of a delimiter or a \n after a \r
+            pieces.append(data[:-len(delimiter)])
+            rest = data[-len(delimiter):]
+            continue
+        records, rest = data[:cut], data[cut + len(delimiter):]
+        if pieces:
+            pieces.append(records)
+            records = b"".join(pieces)
+            pieces = []
+        if encoding is not None:
+            yield records.decode(encoding).split(delimiter.decode(encoding))
+        else:
+            yield records.split(delimiter)
+    if pieces or rest:
+        pieces.append(rest)
+        rest = b"".join(pieces)
+        yield [rest.decode(encoding) if encoding is not None else rest]
+
+def last_boundary(data, delimiter):
+    """
+    Return the position of the last delimiter in data found by scanning from the start, as split does, or -1.
+    Unlike rfind, this does not start a delimiter within the previous one, such as the last two of b"\n\n\n".
+    """
+    last = len(data.split(delimiter)[-1])
+    return -1 if last == len(data) else len(data) - last - len(delimiter)
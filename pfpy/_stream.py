@@ -0,0 +1,120 @@
+from pfpy._pipeline import Pipeline
+from pfpy._curry import Last
+from pfpy._compile import resolve
+from functools import reduce
+from itertools import chain, islice
+import builtins
+
+__all__ = ["Stream"]
+
+class Stream:
+    """
+    Represents a Pipeline whose adjacent curried map and filter stages, along with a reduce stage
+    that follows them, are fused into a single loop over the items of an iterable.
+    """
+
+    def __init__(self, node, chunksize=1024):
+        """
+        Create a new Stream for the unary function node.
+        Fused map and filter stages read chunksize items of their iterable at a time.
+        """
+        if chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+        self.node = node
+        self.chunksize = chunksize
+        node = resolve(node)
+        self.stages = fuse_stages(node.stages if isinstance(node, Pipeline) else (node,), chunksize)
+
+    def __reduce__(self):
+        return (Stream, (self.node, self.chunksize))  # Fused loops are regenerated when unpickled
+
+    def __call__(self, x):
+        for stage in self.stages:
+            x = stage(x)
+        return x
+
+def stream_function(node):
+    """Return the builtin among map, filter and reduce that the curried function node applies, if any."""
+    if isinstance(node, Last) and not node.reverse and len(node.args) == 1:
+        for f in (builtins.map, builtins.filter, reduce):
+            if node.func is f:
+                return f
+    return None
+
+def fuse_stages(stages, chunksize):
+    """Return stages with every run of at least two map, filter and trailing reduce stages fused."""
+    fused = []
+    run = []
+    for stage in stages + (None,):
+        node = resolve(stage)
+        kind = stream_function(node)
+        if kind is not None and kind is not reduce:
+            run.append(node)
+            continue
+        if kind is reduce:
+            run.append(node)
+        if len(run) > 1:
+            fused.append(fuse(run, chunksize))
+        else:
+            fused.extend(run)
+        if kind is not reduce and stage is not None:
+            fused.append(stage)
+        run = []
+    return fused
+
+def fuse(nodes, chunksize):
+    """
+    Return a function equivalent to the curried map and filter functions in nodes applied one
+    after the other, followed by the curried reduce function that may be the last one of them.
+    Without a reduce, the result lazily yields items that are computed chunksize items at a time.
+    """
+    bindings = {"chain": chain, "islice": islice, "chunksize": chunksize}
+    body = []
+    for i, node in enumerate(nodes):
+        name = "_{}".format(i)
+        kind, (f,) = stream_function(node), node.args
+        bindings[name] = f
+        if kind is builtins.map:
+            body.append("x = {}(x)".format(name))
+        elif kind is builtins.filter:
+            body.append("if not {}:".format("x" if f is None else "{}(x)".format(name)))
+            body.append("    continue")
+
+    if stream_function(nodes[-1]) is reduce:
+        source = ("def factory({names}):\n"
+                  "    def fused(iterable):\n"
+                  "        it = iter(iterable)\n"
+                  "        for x in it:\n"
+                  "{body}"
+                  "            result = x\n"
+                  "            break\n"
+                  "        else:\n"
+                  "            raise TypeError('reduce() of empty iterable with no initial value')\n"
+                  "        for x in it:\n"
+                  "{body}"
+                  "            result = {reduce}(result, x)\n"
+                  "        return result\n"
+                  "    return fused\n")
+    else:
+        source = ("def factory({names}):\n"
+                  "    def chunks(iterable):\n"
+                  "        it = iter(iterable)\n"
+                  "        chunk = list(islice(it, chunksize))\n"
+                  "        while chunk:\n"
+                  "            results = []\n"
+                  "            append = results.append\n"
+                  "            for x in chunk:\n"
+                  "{body}"
+                  "                append(x)\n"
+                  "            yield results\n"
+                  "            chunk = list(islice(it, chunksize))\n"
+                  "    def fused(iterable):\n"
+                  "        return chain.from_iterable(chunks(iterable))\n"
+                  "    return fused\n")
+    indent = " " * (12 if stream_function(nodes[-1]) is reduce else 16)
+    source = source.format(names=", ".join(bindings),
+                           body="".join(indent + line + "\n" for line in body),
+                           reduce="_{}".format(len(nodes) - 1))
+    namespace = {}
+    exec(compile(source, "<pfpy.stream>", "exec"), namespace)
+    return namespace["factory"](**bindings)
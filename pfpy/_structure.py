@@ -0,0 +1,135 @@
+from pfpy._function import Function, importable
+from pfpy._predicate import Predicate
+from pfpy._curry import Curried, Partial, Last
+from pfpy._async import AsyncFunction, AsyncPipeline
+from pfpy._pipeline import Pipeline
+from pfpy._expression import Constant, Operation, Polynomial, Conjunction, Disjunction, Membership, Intervals
+from pfpy._compile import Compiled
+from pfpy._memoize import Memoized
+from pfpy._stream import Stream
+from collections import namedtuple
+
+__all__ = ["structure", "rebuild", "fingerprint"]
+
+# Tags of the wrappers that are looked through
+wrappers = {Function: "function", Predicate: "predicate", Curried: "curried", AsyncFunction: "async"}
+wrapper_types = {tag: cls for cls, tag in wrappers.items()}
+
+# Tags of the nodes that apply a sequence of stages
+pipelines = {Pipeline: "pipeline", AsyncPipeline: "async_pipeline"}
+pipeline_types = {tag: cls for cls, tag in pipelines.items()}
+
+# Tags of the nodes that combine the results of a sequence of operands
+logical = {Conjunction: "and", Disjunction: "or"}
+logical_types = {tag: cls for cls, tag in logical.items()}
+
+def structure(f):
+    """
+    Return a nested tuple describing how the unary function f is built.
+    Each tuple starts with a tag naming the kind of node it describes, and the functions
+    that f is built from and that cannot be described any further are tagged "leaf".
+    Functions that can be imported by name, such as identity or functions decorated with @unary,
+    are always leaves so they are pickled by reference.
+    """
+    if importable(f):
+        return ("leaf", f)
+    kind = type(f)
+    if kind in wrappers:
+        return (wrappers[kind], structure(f._f))
+    elif kind in pipelines:
+        return (pipelines[kind],) + tuple(structure(g) for g in f.stages)
+    elif kind in logical:
+        return (logical[kind],) + tuple(structure(g) for g in f.operands)
+    elif kind is Constant:
+        return ("constant", f.value)
+    elif kind is Operation:
+        return ("operation", f.op) + tuple(structure(g) for g in f.operands)
+    elif kind is Polynomial:
+        return ("polynomial", f.coefficients, structure(f.f))
+    elif kind is Membership:
+        return ("membership", f.values, f.negated, structure(f.f))
+    elif kind is Intervals:
+        return ("intervals", f.intervals, structure(f.f))
+    elif kind is Partial:
+        return ("partial", f.curry, f.args)
+    elif kind is Last:
+        return ("last", f.curry, f.args)
+    elif kind is Compiled:
+        return ("compiled", f.cse, structure(f.node))
+    elif kind is Memoized:
+        return ("memoized", f.maxsize, f.policy, f.ttl, structure(f.f))
+    elif kind is Stream:
+        return ("stream", f.chunksize, structure(f.node))
+    else:
+        return ("leaf", f)
+
+def rebuild(s):
+    """
+    Return an unary function built as described by s, a structure returned by structure().
+    Metadata such as __name__ is only kept for leaves, and caches start out empty.
+    """
+    tag, *rest = s
+    if tag == "leaf":
+        return rest[0]
+    elif tag in wrapper_types:
+        return wrapper_types[tag](rebuild(rest[0]))
+    elif tag in pipeline_types:
+        return pipeline_types[tag](rebuild(child) for child in rest)
+    elif tag in logical_types:
+        return logical_types[tag](*(rebuild(child) for child in rest))
+    elif tag == "constant":
+        return Constant(rest[0])
+    elif tag == "operation":
+        op, *operands = rest
+        return Operation(op, *(rebuild(child) for child in operands))
+    elif tag == "polynomial":
+        coefficients, child = rest
+        return Polynomial(coefficients, rebuild(child))
+    elif tag == "membership":
+        values, negated, child = rest
+        return Membership(rebuild(child), values, negated)
+    elif tag == "intervals":
+        intervals, child = rest
+        return Intervals(rebuild(child), intervals)
+    elif tag == "partial":
+        return Partial(*rest)
+    elif tag == "last":
+        return Last(*rest)
+    elif tag == "compiled":
+        cse, child = rest
+        return Compiled(rebuild(child), cse=cse)
+    elif tag == "memoized":
+        maxsize, policy, ttl, child = rest
+        return Memoized(rebuild(child), maxsize, policy, ttl)
+    elif tag == "stream":
+        chunksize, child = rest
+        return Stream(rebuild(child), chunksize)
+    raise ValueError("unknown structure tag {!r}".format(tag))
+
+def fingerprint(f):
+    """
+    Return a hexadecimal digest of the structure of the unary function f, which is the same for
+    functions built the same way from the same leaves. Every leaf must be picklable.
+    """
+    import hashlib, pickle  # Slow to import and only needed by caches
+    return hashlib.sha256(pickle.dumps(canonical(structure(f)), protocol=4)).hexdigest()
+
+# Stands for a set or frozenset in a canonical structure, with its items sorted
+Unordered = namedtuple("Unordered", ["kind", "items"])
+
+def canonical(value):
+    """
+    Return value with every set and frozenset in it, including the ones nested in tuples, lists
+    and dicts, replaced by an Unordered with its items sorted by their pickles. Sets are otherwise
+    pickled in the order of the hashes of their items, which differ between processes for str and bytes.
+    """
+    import pickle
+    kind = type(value)
+    if kind in (tuple, list):
+        return kind(canonical(item) for item in value)
+    elif kind is dict:
+        return {key: canonical(item) for key, item in value.items()}
+    elif kind in (set, frozenset):
+        items = sorted((canonical(item) for item in value), key=lambda item: pickle.dumps(item, protocol=4))
+        return Unordered(kind.__name__, tuple(items))
+    return value
@@ -0,0 +1,255 @@
+from pfpy._function import identity
+from pfpy._pipeline import Pipeline
+from pfpy._expression import Constant, Operation, Polynomial, Conjunction, Disjunction, Membership, Intervals
+from pfpy._curry import Partial
+from pfpy._compile import resolve
+from collections.abc import Mapping
+from functools import reduce
+import operator
+import numpy
+
+__all__ = ["Vectorized"]
+
+# Operators that numpy implements as ufuncs when applied to arrays
+ufunc_operators = {operator.pos, operator.neg, operator.add, operator.sub, operator.mul,
+                   operator.truediv, operator.floordiv, operator.pow}
+
+# Binary functions that can be curried and still work elementwise when applied to arrays
+array_functions = {operator.lt, operator.le, operator.eq, operator.ne, operator.gt, operator.ge,
+                   operator.add, operator.sub, operator.mul, operator.truediv, operator.floordiv,
+                   operator.mod, operator.pow, operator.and_, operator.or_, operator.xor,
+                   operator.lshift, operator.rshift}
+
+# Arithmetic operators whose results are checked against Python's, as applied to every element
+arithmetic_operators = {operator.pos, operator.neg, operator.add, operator.sub, operator.mul, operator.truediv,
+                        operator.floordiv, operator.mod, operator.pow, operator.lshift}
+
+# Arithmetic operators that raise ZeroDivisionError in Python
+division_operators = {operator.truediv, operator.floordiv, operator.mod}
+
+class Vectorized:
+    """Represents an unary function applied to every element of an array at once."""
+
+    def __init__(self, node):
+        """Create a new Vectorized that applies the unary function node to arrays."""
+        self.node = node
+
+    def __call__(self, array):
+        array = as_array(array)
+        result = evaluate(self.node, array)
+        if numpy.ndim(result) == 0:
+            return numpy.full(shape(array), result)  # Constant functions still map every element
+        return result
+
+def as_array(data):
+    """Return data as a numpy array, or as a dict of numpy arrays if it is a mapping of columns."""
+    if isinstance(data, Mapping):
+        return {key: numpy.asarray(column) for key, column in data.items()}
+    return numpy.asarray(data)
+
+def shape(data):
+    """Return the shape of an array or the shared shape of the columns in a dict of arrays."""
+    if isinstance(data, Mapping):
+        return next(iter(data.values())).shape if data else (0,)
+    return data.shape
+
+def mask(p, data):
+    """
+    Return a boolean numpy array of whether each element of an array, or each row
+    of a dict of column arrays, satisfies the unary predicate p.
+    """
+    data = as_array(data)
+    result = numpy.asarray(evaluate(p, data), dtype=bool)
+    return numpy.broadcast_to(result, shape(data)).copy() if result.shape != shape(data) else result
+
+def evaluate(f, array):
+    """
+    Return the result of applying the unary function f to every element of array.
+    Arithmetic and logical operators, compositions, identity, constants, the set and interval checks
+    built by optimize() and the curried forms of operators with an elementwise meaning for arrays
+    are evaluated with ufuncs
+    while every other callable is called once per element.
+    """
+    node = resolve(f)
+    if node is identity._f:
+        return array
+    elif isinstance(node, Constant):
+        return node.value
+    elif isinstance(node, Operation) and node.op in ufunc_operators:
+        return arithmetic(node.op, [evaluate(g, array) for g in node.operands])
+    elif isinstance(node, Operation) and node.op is operator.not_:
+        return numpy.logical_not(evaluate(node.operands[0], array))
+    elif isinstance(node, Operation) and node.op is operator.truth:
+        return numpy.asarray(evaluate(node.operands[0], array), dtype=bool)
+    elif isinstance(node, Polynomial):
+        return polynomial(node, array)
+    elif isinstance(node, Membership):
+        return membership(node, array)
+    elif isinstance(node, Intervals):
+        return intervals(node, array)
+    elif isinstance(node, Conjunction):
+        return numpy.logical_and.reduce([evaluate(g, array) for g in node.operands])
+    elif isinstance(node, Disjunction):
+        return numpy.logical_or.reduce([evaluate(g, array) for g in node.operands])
+    elif isinstance(node, Pipeline):
+        for stage in node.stages:
+            array = evaluate(stage, array)
+        return array
+    elif isinstance(node, Partial) and node.curry.arity - len(node.args) == 1:
+        return curried(node, array)
+    else:
+        return elementwise(node, array)
+
+def curried(node, array):
+    """Return the result of applying the last argument of a curried function to every element of array."""
+    func, args = node.curry.func, node.args
+    if not isinstance(array, Mapping):
+        array = numpy.asarray(array)
+    if func in array_functions:
+        operands = (array,) + args if node.curry.reverse else args + (array,)
+        return arithmetic(func, list(operands)) if func in arithmetic_operators else func(*operands)
+    elif func is operator.getitem and node.curry.reverse and is_column(array, args[0]):
+        return array[args[0]]  # Selecting a column selects the field from every row at once
+    elif func is operator.contains and node.curry.reverse and not isinstance(array, Mapping):
+        (item,) = args
+        if array.dtype.kind in "US" and isinstance(item, (str, bytes)):
+            return numpy.char.find(array, item) >= 0
+    return elementwise(node, array)
+
+def arithmetic(op, operands):
+    """
+    Return the result of the arithmetic operator op applied to the arrays and scalars in operands, from left
+    to right, with the same results for every element as in Python: integers do not overflow, and dividing
+    by zero or a float power that overflows raises the same error instead of giving inf.
+    """
+    if op in division_operators and any(numpy.any(numpy.asarray(divisor) == 0) for divisor in operands[1:]):
+        raise ZeroDivisionError("division by zero")
+    if op is operator.pow:
+        base, exponent = operands
+        if numpy.size(exponent) and numpy.min(exponent) < 0 and numpy.asarray(base).dtype.kind in "biu":
+            operands[0] = numpy.asarray(base, dtype=float)  # Match Python's int ** -int -> float
+    operands = exact(op, operands)
+    if op is operator.pow:
+        with numpy.errstate(over="raise"):
+            try:
+                return op(*operands)
+            except FloatingPointError:
+                raise OverflowError("numerical result out of range") from None
+    return op(*operands) if len(operands) <= 2 else reduce(op, operands)
+
+def exact(op, operands):
+    """
+    Return operands with bool arrays converted to int arrays, like Python's bool, and with integer arrays
+    converted to arrays of Python ints if the results of op could overflow their data type.
+    """
+    if not any(isinstance(x, numpy.ndarray) for x in operands):
+        return operands
+    operands = [x.astype(int) if isinstance(x, numpy.ndarray) and x.dtype.kind == "b" else x for x in operands]
+    if not all(x.dtype.kind in "iu" if isinstance(x, numpy.ndarray) else isinstance(x, (int, numpy.integer))
+               for x in operands):
+        return operands
+    info = numpy.iinfo(numpy.result_type(*operands))
+    if info.min == 0 and op in (operator.sub, operator.neg):
+        overflows = True  # Unsigned results cannot be negative
+    else:
+        overflows = largest(op, [magnitude(x) for x in operands], info.bits) > info.max
+    return [numpy.asarray(x).astype(object) for x in operands] if overflows else operands
+
+def largest(op, magnitudes, bits):
+    """
+    Return an upper bound of the magnitude of the result of op applied to integers of at most magnitudes,
+    which is only exact up to integers of the given number of bits.
+    """
+    if op in (operator.add, operator.sub):
+        return sum(magnitudes)
+    elif op is operator.mul:
+        return reduce(operator.mul, magnitudes)
+    elif op in (operator.neg, operator.floordiv):
+        return magnitudes[0]  # The most negative integer negated, or floor divided by -1
+    elif op is operator.pow:
+        base, exponent = magnitudes
+        return base ** exponent if base <= 1 or base.bit_length() * exponent <= bits + 1 else 1 << (bits + 1)
+    elif op is operator.lshift:
+        return magnitudes[0] << min(magnitudes[1], bits + 1)
+    return 0
+
+def magnitude(x):
+    """Return the largest absolute value of the elements of the integer array x, or of the integer x, as a Python int."""
+    if not isinstance(x, numpy.ndarray):
+        return abs(int(x))
+    return max(int(x.max()), -int(x.min())) if x.size else 0
+
+def polynomial(node, array):
+    """Return the result of the Polynomial node for every element of array, with Python's integer arithmetic."""
+    y = numpy.asarray(evaluate(node.f, array))
+    if y.dtype.kind == "b":
+        y = y.astype(int)
+    dtype = numpy.result_type(y, numpy.asarray(node.coefficients))
+    if dtype.kind == "O" and y.dtype.kind in "iu":
+        y = y.astype(object)  # Coefficients too large for any integer data type
+    elif dtype.kind in "iu":
+        x = magnitude(y)
+        bound = sum(abs(int(c)) * x ** k for k, c in enumerate(reversed(node.coefficients)))
+        if bound > numpy.iinfo(dtype).max:
+            y = y.astype(object)
+    return numpy.polyval(node.coefficients, y)
+
+def kinds(values):
+    """
+    Return the numpy dtype kinds of the arrays whose elements compare with all of values the same way
+    as they would in Python, or an empty string if values are not all numbers, all str or all bytes.
+    """
+    types = {str if type(value) is str else bytes if type(value) is bytes else
+             int if type(value) in (int, float, bool) else None for value in values}
+    if len(types) != 1:
+        return ""
+    return {int: "biuf", str: "U", bytes: "S"}.get(types.pop(), "")
+
+def membership(node, array):
+    """Return whether the result of the Membership node for every element of array is one of its values."""
+    y = numpy.asarray(evaluate(node.f, array))
+    if y.dtype.kind not in kinds(node.values):
+        return elementwise(node, array)
+    found = numpy.isin(y, list(node.values))
+    return numpy.logical_not(found) if node.negated else found
+
+def intervals(node, array):
+    """Return whether the result of the Intervals node for every element of array lies within one of its intervals."""
+    y = numpy.asarray(evaluate(node.f, array))
+    ends = [end for low, _, high, _ in node.intervals for end in (low, high) if end is not None]
+    if not ends:
+        return numpy.ones(y.shape, dtype=bool) if node.intervals else numpy.zeros(y.shape, dtype=bool)
+    if y.dtype.kind not in kinds(ends):
+        return elementwise(node, array)
+
+    # Like Intervals itself, find the only interval that can hold each element and check its ends
+    if len(node.intervals) == 1:
+        i = numpy.zeros(y.shape, dtype=int)
+    else:
+        i = numpy.searchsorted(numpy.array(node.lows), y, side="right") + node.unbounded - 1
+    inside = i >= 0
+    i = numpy.maximum(i, 0)
+    lows, low_closed, highs, high_closed = (numpy.array([end if end is not None else ends[0] for end in column])
+                                            for column in zip(*node.intervals))
+    has_low = numpy.array([low is not None for low, _, _, _ in node.intervals])[i]
+    has_high = numpy.array([high is not None for _, _, high, _ in node.intervals])[i]
+    lows, highs, low_closed, high_closed = lows[i], highs[i], low_closed[i].astype(bool), high_closed[i].astype(bool)
+    above = ~has_low | (lows < y) | (low_closed & (lows == y))
+    below = ~has_high | (y < highs) | (high_closed & (y == highs))
+    return inside & above & below
+
+def is_column(array, key):
+    """Return whether key names a column of a dict of arrays or a field of a structured array."""
+    if isinstance(array, Mapping):
+        return key in array
+    return array.dtype.names is not None and key in array.dtype.names
+
+def elementwise(f, array):
+    """Return the result of calling f on every element of array, or every row of a dict of arrays."""
+    if isinstance(array, Mapping):
+        keys = list(array)
+        return numpy.array([f(dict(zip(keys, row))) for row in zip(*array.values())])
+    array = numpy.asarray(array)
+    if array.ndim == 0:
+        return f(array.item())
+    return numpy.array(numpy.frompyfunc(f, 1, 1)(array).tolist())
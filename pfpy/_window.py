@@ -0,0 +1,92 @@
+from collections import deque
+from itertools import islice
+
+__all__ = ["SlidingWindow"]
+
+class SlidingWindow:
+    """
+    Represents the reduction with an associative binary function of the last n items pushed into it.
+    Each push takes O(1) amortized calls of the function, however large n is, since the window is kept
+    as two stacks: the newest items with their running reduction, and the oldest items with the
+    reductions of every suffix. The state is kept between calls to feed so a stream can be fed in chunks.
+    """
+
+    def __init__(self, op, n=None):
+        """
+        Create a new empty SlidingWindow reducing the last n items with the associative binary function op,
+        or every item pushed so far if n is None.
+        """
+        if n is not None and n < 1:
+            raise ValueError("n must be at least 1")
+        self.op = op
+        self.n = n
+        self.front = []  # Oldest items, newest first, paired with the reduction of themselves and every older item
+        self.back = []   # Newest items, oldest first
+        self.reduction = None  # Reduction of the items in back
+
+    def __len__(self):
+        return len(self.front) + len(self.back)
+
+    def push(self, x):
+        """Add x to the window, dropping the oldest item if the window is already full."""
+        self.reduction = self.op(self.reduction, x) if self.back else x
+        self.back.append(x)
+        if self.n is None:
+            del self.back[:-1]  # Only the running reduction is needed without a window
+        elif len(self) > self.n:
+            self.pop()
+
+    def pop(self):
+        """Remove the oldest item from the window."""
+        if not self.front:
+            if not self.back:
+                raise IndexError("pop from an empty SlidingWindow")
+            reduction = None
+            for i, x in enumerate(reversed(self.back)):
+                reduction = self.op(x, reduction) if i else x
+                self.front.append((x, reduction))
+            self.back.clear()
+            self.reduction = None
+        self.front.pop()
+
+    def value(self):
+        """Return the reduction of the items in the window, oldest first."""
+        if self.front and self.back:
+            return self.op(self.front[-1][1], self.reduction)
+        elif self.front:
+            return self.front[-1][1]
+        elif self.back:
+            return self.reduction
+        raise ValueError("value of an empty SlidingWindow")
+
+    def full(self):
+        """Return whether the window holds n items, which is always the case once an item was pushed if n is None."""
+        return len(self) == self.n if self.n is not None else bool(self.back)
+
+    def feed(self, iterable):
+        """
+        Return an iterator over the reductions of the window after pushing each item of iterable,
+        skipping the ones before the window is full.
+        """
+        for x in iterable:
+            self.push(x)
+            if self.full():
+                yield self.value()
+
+def scan(op, iterable):
+    """Return an iterator over the reductions of every prefix of iterable with the binary function op."""
+    return SlidingWindow(op).feed(iterable)
+
+def window(n, iterable):
+    """Return an iterator over the tuples of n consecutive items of iterable."""
+    if n < 1:
+        raise ValueError("n must be at least 1")
+    iterator = iter(iterable)
+    items = deque(islice(iterator, n - 1), maxlen=n)
+    for x in iterator:
+        items.append(x)
+        yield tuple(items)
+
+def windowed_reduce(op, n, iterable):
+    """Return an iterator over the reductions of n consecutive items of iterable with the associative binary function op."""
+    return SlidingWindow(op, n).feed(iterable)
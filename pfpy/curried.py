@@ -1,8 +1,9 @@
 from pfpy._predicate import Predicate
 from pfpy._curry import curry, rcurry
-from operator import *
-from functools import reduce
-from itertools import groupby
+import builtins as python_builtins
+import functools
+import itertools
+import operator
 
 predicate_operators = ["lt", "le", "eq", "ne", "ge", "gt", "is_", "is_not", "contains"]
 regular_operators =  ["add", "sub", "floordiv", "truediv", "mul", "matmul", "mod", "pow",
@@ -11,19 +12,61 @@ regular_operators =  ["add", "sub", "floordiv", "truediv", "mul", "matmul", "mod
 builtins = ["map", "filter", "reduce"]
 reverse_builtins = ["getattr", "groupby"]
 keyword_builtins = ["sorted", "max", "min"]
+sorting = ["top_k", "bottom_k", "take", "external_sorted"]
+windows = ["scan", "window", "windowed_reduce"]
+sources = ["read_lines", "read_records", "read_chunks"]
 
-__all__ = predicate_operators + regular_operators + builtins + reverse_builtins + keyword_builtins + ["apply"]
+__all__ = (predicate_operators + regular_operators + builtins + reverse_builtins + keyword_builtins + sorting
+           + windows + sources + ["apply", "amap"])
 
-# Reassign each operator to their appropriately curried version
-(lt, le, eq, ne, ge, gt, is_, is_not, contains) = (rcurry(2, Predicate)(eval(op)) for op in predicate_operators)
-(add, sub, floordiv, truediv, mul, matmul, mod, pow,
- and_, or_, xor, lshift, rshift,
- concat, countOf, getitem, indexOf) = (rcurry(2)(eval(op)) for op in regular_operators)
+def call_with_key(f, key, iterable):
+    return f(iterable, key=key)
 
-# Reassign each built-in to their appropriately curried version
-(map, filter, reduce) = (curry(2)(eval(f)) for f in builtins)
-(getattr, groupby) = (rcurry(2)(eval(f)) for f in reverse_builtins)
-(sorted, max, min) = (curry(3)(lambda f, key, iterable: f(iterable, key=key))(eval(f)) for f in keyword_builtins)
+def build(name):
+    """Return the appropriately curried version of the operator or built-in called name."""
+    if name in predicate_operators:
+        return rcurry(2, Predicate)(python_builtins.getattr(operator, name))
+    elif name in regular_operators:
+        return rcurry(2)(python_builtins.getattr(operator, name))
+    elif name == "reduce":
+        return curry(2)(functools.reduce)
+    elif name in builtins:
+        return curry(2)(python_builtins.getattr(python_builtins, name))
+    elif name == "groupby":
+        return rcurry(2)(itertools.groupby)
+    elif name in reverse_builtins:
+        return rcurry(2)(python_builtins.getattr(python_builtins, name))
+    elif name in keyword_builtins:
+        return curry(3)(call_with_key)(python_builtins.getattr(python_builtins, name))
+    elif name == "external_sorted":
+        from pfpy._sorting import external_sorted
+        return curry(3)(call_with_key)(external_sorted)
+    elif name == "take":
+        from pfpy._sorting import take
+        return curry(2)(take)
+    elif name in sorting:
+        from pfpy import _sorting
+        return curry(3)(python_builtins.getattr(_sorting, name))
+    elif name in windows:
+        from pfpy import _window
+        return curry(3 if name == "windowed_reduce" else 2)(python_builtins.getattr(_window, name))
+    elif name == "read_lines":
+        from pfpy._source import read_lines
+        return curry(1)(read_lines)
+    elif name in sources:
+        from pfpy import _source
+        return rcurry(2)(python_builtins.getattr(_source, name))
+    elif name == "amap":
+        from pfpy._async import amap
+        return amap
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+def __getattr__(name):
+    # Each curried function is only built the first time it is used, then cached as a global
+    return globals().setdefault(name, build(name))
+
+def __dir__():
+    return python_builtins.sorted(set(globals()) | set(__all__))
 
 # Manually curry apply
 @curry(2)
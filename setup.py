@@ -5,5 +5,7 @@ setup(
     version="1.0.0",
     description="Add support for pointfree style programming in Python", 
     packages=["pfpy"],
+    python_requires=">=3.7",
+    extras_require={"numpy": ["numpy"]},
     test_suite="tests"
 )
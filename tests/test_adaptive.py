@@ -0,0 +1,86 @@
+import unittest
+import pickle
+from random import sample
+from pfpy import Predicate, AdaptivePredicate
+
+def is_positive(x):
+    return x > 0
+
+def is_even(x):
+    return x % 2 == 0
+
+class AdaptiveTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = sample(range(-10000, 10000), 2000)
+
+        # Predicates
+        self.is_positive = Predicate(is_positive)
+        self.is_even = Predicate(is_even)
+        self.is_small = Predicate(lambda x: abs(x) < 100)
+
+    def test_equivalence(self):
+        is_positive, is_even, is_small = self.is_positive, self.is_even, self.is_small
+
+        for p in [is_positive & is_even & is_small,
+                  is_positive | is_even | is_small,
+                  (is_positive & ~is_even) | (abs >> (is_small & is_even))]:
+            q = p.adaptive(period=64, sampling=4)
+            self.assertIsInstance(q, AdaptivePredicate)
+            self.assertEqual([bool(q(x)) for x in self.data], [bool(p(x)) for x in self.data])
+
+    def test_conjunction_reordering(self):
+        always = Predicate(lambda x: True)
+        never = Predicate(lambda x: False)
+        p = (always & always & never).adaptive(period=64, sampling=4)
+
+        for x in self.data:
+            self.assertFalse(p(x))
+
+        (chain,) = p.statistics()
+        self.assertIs(chain[0].predicate, never)
+        self.assertEqual(chain[0].pass_rate, 0)
+        self.assertEqual([s.pass_rate for s in chain[1:]], [1, 1])
+        self.assertEqual(chain[0].samples, len(self.data) // 4)
+        self.assertLess(sum(s.samples for s in chain), 3 * (len(self.data) // 4))  # Sampling stops at never
+
+    def test_disjunction_reordering(self):
+        always = Predicate(lambda x: True)
+        never = Predicate(lambda x: False)
+        p = (never | self.is_even | always).adaptive(period=64, sampling=4)
+
+        for x in self.data:
+            self.assertTrue(p(x))
+
+        (chain,) = p.statistics()
+        self.assertIs(chain[0].predicate, always)
+        self.assertIs(chain[-1].predicate, never)
+
+    def test_guarded(self):
+        has_a = Predicate(lambda row: "a" in row)
+        positive_a = Predicate(lambda row: row["a"] > 0)
+        p = (has_a & positive_a).adaptive(period=8, sampling=2)
+        q = (~has_a | positive_a).adaptive(period=8, sampling=2)
+
+        rows = [{}] * 50 + [{"a": 1}] * 50 + [{}, {"a": -1}] * 50
+        self.assertEqual([p(row) for row in rows], [bool(row) and row["a"] > 0 for row in rows])
+        self.assertEqual([q(row) for row in rows], [not row or row["a"] > 0 for row in rows])
+
+    def test_flattening(self):
+        is_positive, is_even, is_small = self.is_positive, self.is_even, self.is_small
+        p = ((is_positive & is_even) & (is_small & ~is_even)) | is_small
+
+        chains = p.adaptive().statistics()
+        self.assertEqual([len(chain) for chain in chains], [4, 2])
+
+    def test_invalid(self):
+        p = self.is_positive & self.is_even
+        for arguments in [{"period": 0}, {"sampling": 0}, {"period": -1, "sampling": 4}]:
+            with self.assertRaises(ValueError):
+                p.adaptive(**arguments)
+        with self.assertRaises(ValueError):
+            AdaptivePredicate(self.is_positive, sampling=0)
+
+    def test_pickle(self):
+        p = (Predicate(is_positive) & is_even).adaptive()
+
+        self.assertEqual([pickle.loads(pickle.dumps(p))(x) for x in self.data], [p(x) for x in self.data])
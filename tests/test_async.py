@@ -0,0 +1,85 @@
+import unittest
+import asyncio
+import pickle
+from random import sample
+from pfpy import AsyncFunction, asynchronous, amap
+from pfpy.curried import map, add, gt
+
+@asynchronous
+async def double(x):
+    await asyncio.sleep(0)
+    return x * 2
+
+class AsyncTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = sample(range(-1000, 1000), 100)
+
+        # Functions
+        self.add1 = add(1)
+        self.is_positive = gt(0)
+
+    def run_all(self, f):
+        return [asyncio.run(f(x)) for x in self.data]
+
+    def test_composition(self):
+        add1, is_positive = self.add1, self.is_positive
+
+        async def sub1(x):
+            return x - 1
+
+        for f in [add1 >> double, double >> add1, add1 @ double, double @ add1,
+                  abs >> double, double >> abs, add1 >> sub1 >> double, sub1 >> add1,
+                  double >> is_positive, is_positive @ double]:
+            self.assertIsInstance(f, AsyncFunction)
+
+        self.assertEqual(self.run_all(add1 >> double >> add1), [(x + 1) * 2 + 1 for x in self.data])
+        self.assertEqual(self.run_all(add1 @ double), [x * 2 + 1 for x in self.data])
+        self.assertEqual(self.run_all(abs >> double), [abs(x) * 2 for x in self.data])
+        self.assertEqual(self.run_all(add1 >> sub1 >> double), [x * 2 for x in self.data])
+        self.assertEqual(self.run_all(double >> is_positive), [x > 0 for x in self.data])
+        self.assertEqual(asyncio.run(3 >> double), 6)
+
+    def test_flattening(self):
+        f = (self.add1 >> self.add1) >> double >> (self.add1 >> double)
+        self.assertEqual(len(f._f.stages), 5)
+        self.assertEqual(self.run_all(f), [((x + 2) * 2 + 1) * 2 for x in self.data])
+
+    def test_amap(self):
+        self.assertEqual(asyncio.run(amap(double)(self.data)), [x * 2 for x in self.data])
+        self.assertEqual(asyncio.run(amap(abs, limit=3)(self.data)), [abs(x) for x in self.data])
+        self.assertEqual(asyncio.run((map(abs) >> amap(double, 5) >> sum)(self.data)),
+                         sum(abs(x) * 2 for x in self.data))
+        with self.assertRaises(ValueError):
+            amap(double, 0)
+
+    def test_concurrency(self):
+        running, peak = [0], [0]
+
+        async def lookup(x):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.001)
+            running[0] -= 1
+            return x
+
+        self.assertEqual(asyncio.run(amap(lookup, limit=4)(self.data)), self.data)
+        self.assertEqual(peak[0], 4)
+        peak[0] = 0
+        asyncio.run(amap(lookup)(self.data))
+        self.assertEqual(peak[0], len(self.data))
+
+    def test_errors(self):
+        async def fail(x):
+            if x == self.data[10]:
+                raise KeyError(x)
+            await asyncio.sleep(0)
+            return x
+
+        with self.assertRaises(KeyError):
+            asyncio.run(amap(fail, limit=4)(self.data))
+
+    def test_pickle(self):
+        f = pickle.loads(pickle.dumps(self.add1 >> double))
+        self.assertEqual(self.run_all(f), [(x + 1) * 2 for x in self.data])
+        g = pickle.loads(pickle.dumps(map(abs) >> amap(double, 2)))
+        self.assertEqual(asyncio.run(g(self.data)), [abs(x) * 2 for x in self.data])
@@ -0,0 +1,83 @@
+import unittest
+import os
+import pickle
+import tempfile
+from random import sample
+from pfpy import Function, Predicate, PipelineCache, identity, fingerprint
+from pfpy.curried import add, gt
+
+def square(x):
+    return x * x
+
+class CacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = sample(range(-1000, 1000), 100)
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = PipelineCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def build(self):
+        return (Function(square) + identity) >> add(1), Function(square) >> gt(100)
+
+    def test_compile(self):
+        f, p = self.build()
+        g = self.cache.compile(f)
+        q = self.cache.compile(p, cse=True)
+        self.assertEqual(len(os.listdir(self.directory.name)), 2)
+        self.assertIsInstance(q, Predicate)
+
+        # Pipelines with the same structure are loaded with their generated code
+        f2, p2 = self.build()
+        g2 = self.cache.compile(f2)
+        self.assertIsNot(g2, g)
+        self.assertEqual(g2._f.source, g._f.source)
+        self.assertEqual([g2(x) for x in self.data], [f(x) for x in self.data])
+        self.assertEqual([self.cache.compile(p2, cse=True)(x) for x in self.data], [p(x) for x in self.data])
+        self.assertEqual(len(os.listdir(self.directory.name)), 2)
+
+        self.cache.compile(f2, cse=True)
+        self.assertEqual(len(os.listdir(self.directory.name)), 3)
+
+    def test_get(self):
+        built = []
+
+        def build():
+            built.append(True)
+            return self.build()[1]
+
+        q = self.cache.get("rule-1", build, cse=True)
+        self.assertIsInstance(q, Predicate)
+        q2 = self.cache.get("rule-1", build, cse=True)
+        self.assertEqual(len(built), 1)  # Loaded without building the pipeline again
+        self.assertEqual([q2(x) for x in self.data], [q(x) for x in self.data])
+        self.assertEqual(fingerprint(q2), fingerprint(q))  # Its structure is unpickled once needed
+        self.cache.get("rule-1", build)
+        self.cache.get("rule-2", build)
+        self.assertEqual(len(built), 3)
+
+    def test_corrupt(self):
+        f = self.build()[0]
+        self.cache.compile(f)
+        self.cache.get("f", lambda: f)
+        for data in [b"", b"garbage", pickle.dumps(f.compile()), pickle.dumps(("missing", ()))]:
+            for name in os.listdir(self.directory.name):
+                with open(os.path.join(self.directory.name, name), "wb") as file:
+                    file.write(data)
+            for g in [self.cache.compile(f), self.cache.get("f", lambda: f)]:
+                self.assertEqual([g(x) for x in self.data], [f(x) for x in self.data])
+        self.assertEqual([self.cache.compile(f)(x) for x in self.data], [f(x) for x in self.data])
+        self.assertEqual(len(os.listdir(self.directory.name)), 2)
+
+    def test_unpicklable(self):
+        f = Function(lambda x: x + 1) * identity
+        g = self.cache.compile(f)
+        self.assertEqual([g(x) for x in self.data], [f(x) for x in self.data])
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_clear(self):
+        f, p = self.build()
+        self.cache.compile(f)
+        self.cache.clear()
+        self.assertEqual(os.listdir(self.directory.name), [])
@@ -0,0 +1,112 @@
+import unittest
+from random import randint
+from math import factorial, exp
+from pfpy import Function, Predicate, identity, constant
+from pfpy._compile import Compiled
+
+class CompileTestCase(unittest.TestCase):
+    def setUp(self):
+        # Scalars
+        self.x = randint(-10000, 10000)
+        self.c = randint(1, 10000)
+
+        # Function
+        self.f = Function(lambda x: x + 6)
+
+        # Regular function
+        self.g = (lambda x: 2 * x)
+
+    def tearDown(self):
+        Function.autocompile = False
+
+    def test_arithmetic(self):
+        f, g, x, c = self.f, self.g, self.x, self.c
+
+        for h in [+f, -f, f + g, g - f, f * g, g / f, f // g, c * f, f ** 3, f + 3 * (g - f) ** 2]:
+            self.assertEqual(h.compile()(x), h(x))
+
+    def test_composition(self):
+        f, g, x = self.f, self.g, self.x
+
+        for h in [f @ g, f >> g, (f + g) >> abs, f >> (f * g) >> -f, abs @ (f + g)]:
+            self.assertEqual(h.compile()(x), h(x))
+
+    def test_inlining(self):
+        x = self.x
+        h = (identity ** 2 + identity + constant(1)).compile()
+
+        self.assertEqual(h(x), x ** 2 + x + 1)
+        self.assertIsInstance(h._f, Compiled)
+        self.assertIn("return (((x ** _0) + x) + _1)", h._f.source)
+
+    def test_opaque_stage_order(self):
+        calls = []
+        h = (Function(calls.append) >> constant(1)).compile()
+
+        self.assertEqual(h(self.x), 1)
+        self.assertEqual(calls, [self.x])
+
+    def test_autocompile(self):
+        Function.autocompile = True
+        series = ((1 / factorial(n)) * (identity ** n) for n in range(25))
+        my_exp = sum(series)
+
+        self.assertIsInstance(my_exp._f, Compiled)
+        self.assertIsNone(my_exp._f.source)
+        self.assertAlmostEqual(my_exp(5), exp(5))
+        self.assertIsNotNone(my_exp._f.source)
+
+    def test_logical(self):
+        x = self.x
+        is_positive = Predicate(lambda x: x > 0)
+        is_even = Predicate(lambda x: x % 2 == 0)
+
+        for p in [~is_positive, is_positive & is_even, is_positive | is_even,
+                  ~(is_positive & ~is_even) | (abs >> is_even)]:
+            for y in [x, -x, x + 1, 0]:
+                self.assertEqual(p.compile()(y), p(y))
+                self.assertEqual(p.compile(cse=True)(y), p(y))
+
+    def test_cse(self):
+        calls = []
+
+        @Function
+        def f(x):
+            calls.append(x)
+            return x + 1
+        g = Function(lambda x: 2 * x)
+        h = f + f * g
+
+        self.assertEqual(h.compile(cse=True)(self.x), h(self.x))
+        self.assertEqual(len(calls), 3)  # Twice for h, once for the compiled version
+
+    def test_cse_composition(self):
+        calls = []
+
+        @Function
+        def f(x):
+            calls.append(x)
+            return x + 1
+        ff = f >> f
+        h = f + ff + ff
+
+        self.assertEqual(h.compile(cse=True)(self.x), h(self.x))
+        self.assertEqual(len(calls), 5 + 2)  # f(x) and f(f(x)) are shared
+
+    def test_cse_short_circuit(self):
+        calls = []
+
+        @Predicate
+        def parse(x):
+            calls.append(x)
+            return x
+        is_positive = parse >> Predicate(lambda x: x > 0)
+        is_even = parse >> Predicate(lambda x: x % 2 == 0)
+        p = (is_positive & is_even) | is_even
+
+        q = p.compile(cse=True)
+        for y in [-3, -2, 2, 3]:
+            del calls[:]
+            result = q(y)
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(result, p(y))
@@ -1,4 +1,8 @@
 import unittest
+import os
+import pickle
+import subprocess
+import sys
 from random import randint, sample
 from pfpy.curried import *
 import functools
@@ -80,3 +84,32 @@ class CurriedTestCase(unittest.TestCase):
         self.assertEqual(sorted(abs)(data), __builtins__["sorted"](data, key=abs))
         self.assertEqual(max(abs)(data), __builtins__["max"](data, key=abs))
         self.assertEqual(min(abs)(data), __builtins__["min"](data, key=abs))
+
+    def test_pickle(self):
+        a, data = self.a, self.data
+        pipeline = map(abs) >> filter(gt(10) & ~eq(20)) >> sorted(operator.neg) >> reduce(operator.add)
+
+        self.assertEqual(pickle.loads(pickle.dumps(pipeline))(data), pipeline(data))
+        self.assertEqual(pickle.loads(pickle.dumps(apply(operator.add)))(data[0:2]), apply(operator.add)(data[0:2]))
+        self.assertEqual(pickle.loads(pickle.dumps(getattr("real") >> sub(a)))(1), 1 - a)
+
+    def test_lazy(self):
+        import pfpy.curried as curried
+        self.assertIs(curried.mod, curried.mod)  # Built once, then cached
+        self.assertIn("countOf", dir(curried))
+        self.assertEqual(curried.countOf(3)([3, 1, 3]), 2)
+        with self.assertRaises(AttributeError):
+            curried.not_an_operator
+
+    def test_lazy_features(self):
+        import pfpy
+        self.assertIn("Dataset", dir(pfpy))
+        self.assertIn("read_lines", pfpy.__all__)
+        self.assertIs(pfpy.Dataset, pfpy._dataset.Dataset)
+        self.assertIs(pfpy.intern, pfpy.intern)
+        with self.assertRaises(AttributeError):
+            pfpy.not_a_feature
+
+        code = "import pfpy, sys; print(sorted(m for m in sys.modules if m.startswith('pfpy.')))"
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=os.path.dirname(os.path.dirname(pfpy.__file__)))
+        self.assertNotIn("pfpy._dataset", output.decode())
@@ -1,5 +1,10 @@
 import unittest
-from pfpy import Function, Predicate, rpartial, curry, rcurry
+import pickle
+from pfpy import Function, Predicate, Curried, rpartial, curry, rcurry
+
+@curry(3)
+def triple(a, b, c):
+    return (a, b, c)
 
 class CurryTestCase(unittest.TestCase):
     def setUp(self):
@@ -21,9 +26,9 @@ class CurryTestCase(unittest.TestCase):
         f3 = f2(3)
         f4 = f3(4)
 
-        self.assertIs(type(f), Function)
-        self.assertIs(type(f1), Function)
-        self.assertIs(type(f2), Function)
+        self.assertIs(type(f), Curried)
+        self.assertIs(type(f1), Curried)
+        self.assertIs(type(f2), Curried)
         self.assertIs(type(f3), Function)
         self.assertEqual(f4, (1, 2, 3, 4))
 
@@ -33,7 +38,8 @@ class CurryTestCase(unittest.TestCase):
         g1 = g(1)
         g2 = g1(2)
 
-        self.assertIs(type(g), Function)
+        self.assertIs(type(g), Curried)
+        self.assertIsInstance(g, Function)
         self.assertIs(type(g1), Predicate)
         self.assertFalse(g2)
 
@@ -44,9 +50,9 @@ class CurryTestCase(unittest.TestCase):
         f3 = f2(3)
         f4 = f3(4)
 
-        self.assertIs(type(f), Function)
-        self.assertIs(type(f1), Function)
-        self.assertIs(type(f2), Function)
+        self.assertIs(type(f), Curried)
+        self.assertIs(type(f1), Curried)
+        self.assertIs(type(f2), Curried)
         self.assertIs(type(f3), Function)
         self.assertEqual(f4, (4, 3, 2, 1))
 
@@ -56,6 +62,47 @@ class CurryTestCase(unittest.TestCase):
         g1 = g(1)
         g2 = g1(2)
 
-        self.assertIs(type(g), Function)
+        self.assertIs(type(g), Curried)
+        self.assertIsInstance(g, Function)
         self.assertIs(type(g1), Predicate)
         self.assertTrue(g2)
+
+    def test_curry_several(self):
+        f = curry(4)(self.f)
+
+        self.assertEqual(f(1, 2)(3, 4), (1, 2, 3, 4))
+        self.assertEqual(f(1, 2, 3)(4), (1, 2, 3, 4))
+        self.assertEqual(f(1)(2, 3, 4), (1, 2, 3, 4))
+        self.assertIs(type(f(1, 2, 3)), Function)
+        with self.assertRaises(TypeError):
+            f(1, 2)(3, 4, 5)
+
+    def test_rcurry_several(self):
+        f = rcurry(4)(self.f)
+        g = rcurry(2, Predicate)(self.g)
+
+        self.assertEqual(f(1, 2)(3, 4), f(1)(2)(3)(4))
+        self.assertEqual(f(1, 2, 3, 4), (4, 3, 2, 1))
+        self.assertIs(type(g(1)), Predicate)
+        self.assertTrue(g(1, 2))
+
+    def test_curry_nullary(self):
+        f = curry(0)(lambda: 42)
+
+        self.assertEqual(f(None), 42)
+
+    def test_metadata(self):
+        self.assertEqual(triple.__name__, "triple")
+        self.assertEqual(triple.__wrapped__(1, 2, 3), (1, 2, 3))
+
+    def test_pickle(self):
+        triple1 = pickle.loads(pickle.dumps(triple(1)))
+        rtriple = pickle.loads(pickle.dumps(rcurry(3)(tuple_of)))
+
+        self.assertIs(pickle.loads(pickle.dumps(triple)), triple)
+        self.assertEqual(triple1(2)(3), (1, 2, 3))
+        self.assertEqual(rtriple(3)(2)(1), (1, 2, 3))
+        self.assertEqual(pickle.loads(pickle.dumps(rpartial(tuple_of, 2, 3)))(1), (1, 2, 3))
+
+def tuple_of(*args):
+    return args
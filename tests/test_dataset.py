@@ -0,0 +1,65 @@
+import unittest
+from random import randint, choice
+from types import SimpleNamespace
+from pfpy import Predicate, Dataset
+from pfpy.curried import getitem, getattr, eq, ne, lt, le, gt, ge
+
+class DatasetTestCase(unittest.TestCase):
+    def setUp(self):
+        cities = ["Toronto", "Vancouver", "Montreal", "Calgary"]
+        self.data = [{"name": "Restaurant {}".format(i),
+                      "location": {"city": choice(cities)},
+                      "rating": randint(1, 5)}
+                     for i in range(500)]
+        self.dataset = Dataset(self.data)
+
+        # Getters
+        self.get_city = getitem("location") >> getitem("city")
+        self.get_rating = getitem("rating")
+
+    def assertFiltered(self, p, dataset=None):
+        dataset = dataset or self.dataset
+        self.assertEqual(dataset.filter(p), [r for r in dataset.records if p(r)])
+
+    def test_comparisons(self):
+        get_city, get_rating = self.get_city, self.get_rating
+        for p in [get_city >> eq("Toronto"), get_city >> ne("Toronto"), get_city >> eq("Paris"),
+                  get_rating >> lt(3), get_rating >> le(3), get_rating >> gt(3), get_rating >> ge(3),
+                  get_rating >> eq(4.0), get_city >> gt("M")]:
+            self.assertFiltered(p)
+        self.assertIn(("location", "city"), [tuple(key for _, key in path) for path in self.dataset.hash_indexes])
+        self.assertEqual(len(self.dataset.sorted_indexes), 2)
+
+    def test_combinations(self):
+        get_city, get_rating = self.get_city, self.get_rating
+        for p in [(get_city >> eq("Toronto")) & (get_rating >> ge(4)),
+                  (get_city >> eq("Toronto")) | (get_rating >> ge(4)),
+                  ((get_city >> eq("Toronto")) | (get_city >> eq("Calgary"))) & (get_rating >> lt(2)),
+                  (get_city >> eq("Toronto")) & Predicate(lambda r: r["name"].endswith("7"))]:
+            self.assertFiltered(p)
+
+    def test_scan(self):
+        p = Predicate(lambda r: r["rating"] > 2)
+        self.assertFiltered(p)
+        self.assertFiltered(p | (self.get_city >> eq("Toronto")))
+        self.assertEqual(self.dataset.hash_indexes, {})
+
+    def test_objects(self):
+        dataset = Dataset(SimpleNamespace(**r) for r in self.data)
+        self.assertFiltered(getattr("rating") >> gt(2), dataset)
+        self.assertFiltered((getattr("location") >> getitem("city") >> eq("Toronto")) & (getattr("rating") >> eq(5)),
+                            dataset)
+
+    def test_missing_fields(self):
+        dataset = Dataset(self.data + [{"name": "Unrated"}])
+        with self.assertRaises(KeyError):
+            dataset.filter(self.get_rating >> eq(5))  # Same as filtering without an index
+        self.assertFiltered(self.get_city >> eq("Toronto"), Dataset([{"location": {"city": ["unhashable"]}}]))
+        self.assertFiltered(getitem("x") >> gt(0), Dataset([{"x": 1}, {"x": float("nan")}, {"x": 3}]))
+
+    def test_nan(self):
+        nan = float("nan")
+        dataset = Dataset([{"x": 1.0}, {"x": nan}, {"x": float("nan")}, {"x": 2.5}])
+        for p in [getitem("x") >> eq(nan), getitem("x") >> ne(nan), getitem("x") >> le(nan), getitem("x") >> ge(nan),
+                  getitem("x") >> eq(1.0), getitem("x") >> ne(1.0), (getitem("x") >> eq(nan)) | (getitem("x") >> eq(2.5))]:
+            self.assertFiltered(p, dataset)
@@ -1,7 +1,14 @@
 import unittest
+import pickle
 from random import randint, sample
 from math import factorial, exp, sqrt
-from pfpy import Function, identity, constant
+from pfpy import Function, Pipeline, identity, constant
+
+def add6(x):
+    return x + 6
+
+def double(x):
+    return 2 * x
 
 class FunctionTestCase(unittest.TestCase):
     def setUp(self):
@@ -63,11 +70,43 @@ class FunctionTestCase(unittest.TestCase):
         self.assertEqual((g @ f)(x), g(f(x)))
         self.assertEqual((f >> g)(x), g(f(x)))
 
+    def test_deep_composition(self):
+        f, x = self.f, self.x
+        n = 5000
+
+        h = identity
+        for _ in range(n):
+            h = h >> f
+        self.assertEqual(h(x), x + 6 * n)
+
+        h = identity
+        for _ in range(n):
+            h = f @ h
+        self.assertEqual(h(x), x + 6 * n)
+
+    def test_composition_flattening(self):
+        f, g, x = self.f, self.g, self.x
+
+        h = (f >> g) >> (g @ f)
+
+        self.assertIsInstance(h._f, Pipeline)
+        self.assertEqual(h._f.stages, (f, g, f, g))
+        self.assertEqual(h(x), g(f(g(f(x)))))
+
     def test_application(self):
         f, x = self.f, self.x
 
         self.assertEqual(x >> f, f(x))
 
+    def test_unsupported_operands(self):
+        f = self.f
+
+        for op in [lambda: f + 1, lambda: 1 - f, lambda: f * "a", lambda: f ** f, lambda: f @ 1, lambda: f >> 1]:
+            with self.assertRaises(TypeError):
+                op()
+        self.assertIs(0 + f, f)
+        self.assertEqual((2.5 * f)(self.x), 2.5 * f(self.x))
+
     def test_identity_and_constant(self):
         x = self.x
 
@@ -102,9 +141,58 @@ class FunctionTestCase(unittest.TestCase):
         my_exp = sum(series)
         self.assertAlmostEqual(my_exp(5), exp(5))
 
+    def test_deep_sum(self):
+        f, x = self.f, self.x
+        n = 5000
+
+        h = sum(f for _ in range(n))
+        self.assertEqual(len(h._f.operands), n)
+        self.assertEqual(h(x), (x + 6) * n)
+        self.assertEqual(h.compile()(x), (x + 6) * n)
+
+        h = identity * f * f
+        self.assertEqual(len(h._f.operands), 3)
+        self.assertEqual(h(x), x * (x + 6) ** 2)
+
+        h = identity
+        for _ in range(n):
+            h = f + h  # Nested on the right
+        self.assertEqual(len(h._f.operands), n + 1)
+        self.assertEqual(h(x), (x + 6) * n + x)
+
+    def test_shared_chains(self):
+        f, g, x = self.f, self.g, self.x
+        h = f + f + f
+        a, b, c = h + g, h + identity, identity + h
+        self.assertEqual(a._f.operands, (f, f, f, g))
+        self.assertEqual(b._f.operands, (f, f, f, identity))
+        self.assertEqual(c._f.operands, (identity, f, f, f))
+        self.assertEqual((c + b)._f.operands, (identity, f, f, f, f, f, f, identity))
+        self.assertEqual(len(h._f.operands), 3)
+        self.assertEqual(h(x), 3 * (x + 6))
+
     def test_mapping(self):
         f, g = self.f, self.g
         data = sample(range(-10000, 10000), 50)
 
         self.assertEqual(list(map(f >> g >> abs >> sqrt, data)),
                          [sqrt(abs(g(f(x)))) for x in data])
+
+    def test_pickle(self):
+        x = self.x
+        f, g = Function(add6), Function(double)
+
+        for h in [f, f >> g, g @ f, f + 3 * g ** 2 - (-f) / constant(7), (identity ** 2).compile(), identity,
+                  (f + g + constant(2)) * (identity + (f + g))]:
+            self.assertEqual(pickle.loads(pickle.dumps(h))(x), h(x))
+        self.assertIs(pickle.loads(pickle.dumps(identity)), identity)
+
+    def test_map_batch(self):
+        h = Function(add6) >> double >> abs
+        data = sample(range(-10000, 10000), 50)
+
+        self.assertEqual(list(h.map_batch(data, workers=2, chunksize=7)), [h(x) for x in data])
+        self.assertEqual(list(h.map_batch(iter(data), workers=1)), [h(x) for x in data])
+        self.assertEqual(list(h.map_batch([], workers=2)), [])
+        with self.assertRaises(ValueError):
+            h.map_batch(data, chunksize=0)
@@ -0,0 +1,77 @@
+import unittest
+import gc
+from random import randint
+from pfpy import Function, Predicate, identity, constant, unary, Interner, intern
+from pfpy.curried import getitem, eq, gt, add
+
+def square(x):
+    return x * x
+
+class InternTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = [{"city": "Toronto", "rating": randint(0, 5)} for _ in range(20)]
+        self.interner = Interner()
+
+        # Functions
+        self.square = Function(square)
+
+    def build(self):
+        p = (getitem("city") >> eq("Toronto")) & (getitem("rating") >> gt(3))
+        f = (self.square + identity * constant(3)) >> add(1)
+        return p, f
+
+    def test_shared(self):
+        (p, f), (q, g) = self.build(), self.build()
+        self.assertIsNot(p, q)
+        self.assertIs(self.interner.intern(p), self.interner.intern(q))
+        self.assertIs(self.interner.intern(f), self.interner.intern(g))
+        self.assertIs(self.interner.intern(p), p)  # The first one built is kept
+
+        r = self.interner.intern(q)
+        self.assertIsInstance(r, Predicate)
+        self.assertEqual([r(x) for x in self.data], [q(x) for x in self.data])
+        self.assertEqual(len({r, self.interner.intern(p)}), 1)
+
+    def test_subtrees(self):
+        city = self.interner.intern(getitem("city") >> eq("Toronto"))
+        p = self.interner.intern((getitem("city") >> eq("Toronto")) | gt(0))
+        self.assertIs(p._f.operands[0], city)
+        stage = self.interner.intern(getitem("city"))
+        self.assertIs(city._f.stages[0], stage)
+
+    def test_distinct(self):
+        intern = self.interner.intern
+        for f, g in [(gt(1), gt(True)), (gt(1), gt(1.0)), (add(0.0), add(-0.0)), (gt(1), gt(2)),
+                     (gt(1), eq(1)), (gt(1) & gt(2), gt(2) & gt(1)), (gt(1) & gt(2), gt(1) | gt(2)),
+                     (Function(abs), Function(square)), (self.square + identity, self.square - identity),
+                     (Predicate(gt(1)._f), Function(gt(1)._f))]:
+            self.assertIsNot(intern(f), intern(g))
+
+    def test_unhashable(self):
+        values = [1, 2]
+        f, g = getitem(values), getitem([1, 2])
+        self.assertIs(self.interner.intern(f), self.interner.intern(f))
+        self.assertIsNot(self.interner.intern(f), self.interner.intern(g))
+
+    def test_named(self):
+        named = unary(square)
+        self.assertIs(self.interner.intern(named), named)
+        self.assertIs(self.interner.intern(abs), abs)
+        self.assertIs(self.interner.intern(identity), identity)
+
+    def test_weak(self):
+        p, f = self.build()
+        self.interner.intern(p)
+        self.interner.intern(f)
+        self.assertGreater(len(self.interner), 0)
+        del p, f
+        gc.collect()
+        self.assertEqual(len(self.interner), 1)  # Only self.square is still used
+
+    def test_default(self):
+        p, q = (getitem("city") >> eq("Ottawa")).intern(), intern(getitem("city") >> eq("Ottawa"))
+        self.assertIs(p, q)
+        self.assertIs(self.square.intern(), self.square)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+import pickle
+import threading
+from random import choice, sample
+from pfpy import Function, Predicate, CacheInfo, identity, unary
+
+def square(x):
+    return x ** 2
+
+class MemoizeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.keys = sample(range(-1000, 1000), 10)
+        self.data = [choice(self.keys) for _ in range(500)]
+
+        # Functions
+        self.calls = []
+        self.f = Function(lambda x: self.calls.append(x) or x * 3)
+
+    def test_equivalence(self):
+        f = self.f.memoize()
+        for x in self.data:
+            self.assertEqual(f(x), x * 3)
+        self.assertEqual(sorted(set(self.calls)), sorted(set(self.data)))
+        self.assertEqual(len(self.calls), len(set(self.data)))
+
+        info = f.cache_info()
+        self.assertEqual(info, CacheInfo(len(self.data) - len(self.calls), len(self.calls), 0, 128, len(self.calls)))
+
+    def test_unhashable(self):
+        f = Function(len).memoize()
+        self.assertEqual(f([1, 2, 3]), 3)
+        self.assertEqual(f.cache_info().currsize, 0)
+
+    def test_lru(self):
+        f = self.f.memoize(maxsize=2)
+        f(1), f(2), f(1), f(3)  # Evicts 2
+        self.assertEqual(f.cache_info().evictions, 1)
+        f(1)
+        self.assertEqual(self.calls, [1, 2, 3])
+        f(2)
+        self.assertEqual(self.calls, [1, 2, 3, 2])
+
+    def test_lfu(self):
+        f = self.f.memoize(maxsize=2, policy="lfu")
+        f(1), f(1), f(2), f(3)  # Evicts 2, which was used less often than 1
+        f(1)
+        self.assertEqual(self.calls, [1, 2, 3])
+        f(2)
+        self.assertEqual(self.calls, [1, 2, 3, 2])
+        self.assertEqual(f.cache_info().evictions, 2)
+
+    def test_ttl(self):
+        f = self.f.memoize(policy="ttl", ttl=0)  # Every result expires immediately
+        f(1), f(1)
+        self.assertEqual(self.calls, [1, 1])
+        g = self.f.memoize(policy="ttl", ttl=60)
+        g(2), g(2)
+        self.assertEqual(self.calls, [1, 1, 2])
+
+        with self.assertRaises(ValueError):
+            self.f.memoize(policy="ttl")
+        with self.assertRaises(ValueError):
+            self.f.memoize(policy="fifo")
+
+    def test_expired(self):
+        f = self.f.memoize(policy="ttl", ttl=0)
+        f(1), f(1), f(2)
+        info = f.cache_info()
+        self.assertEqual((info.hits, info.misses, info.evictions), (0, 3, 2))  # Expired when looked up again
+
+    def test_no_cache(self):
+        for policy in ["lru", "lfu", "ttl"]:
+            f = self.f.memoize(maxsize=0, policy=policy, ttl=60)
+            f(1), f(1)
+            self.assertEqual(f.cache_info(), CacheInfo(0, 2, 0, 0, 0))
+        self.assertEqual(self.calls, [1, 1] * 3)
+
+    def test_metadata(self):
+        @unary
+        def triple(x):
+            """Return x times 3."""
+            return x * 3
+        f = triple.memoize()
+        self.assertEqual((f.__name__, f.__doc__), ("triple", "Return x times 3."))
+        self.assertEqual(f(2), 6)
+
+    def test_not_memoized(self):
+        for f in [self.f, Predicate(bool), (self.f.memoize() + identity)]:
+            with self.assertRaises(TypeError):
+                f.cache_info()
+            with self.assertRaises(TypeError):
+                f.cache_clear()
+
+    def test_cache_clear(self):
+        f = self.f.memoize()
+        f(1), f(1)
+        f.cache_clear()
+        self.assertEqual(f.cache_info(), CacheInfo(0, 0, 0, 128, 0))
+        f(1)
+        self.assertEqual(self.calls, [1, 1])
+
+    def test_boundary(self):
+        f = self.f.memoize()
+        g = (f + identity) * f
+        for x in self.data:
+            self.assertEqual(g(x), (x * 3 + x) * x * 3)
+            self.assertEqual(g.compile()(x), (x * 3 + x) * x * 3)
+        self.assertEqual(len(self.calls), len(set(self.data)))
+
+    def test_predicate(self):
+        is_even = Predicate(lambda x: self.calls.append(x) or x % 2 == 0).memoize()
+        self.assertIsInstance(is_even, Predicate)
+        p = is_even & ~is_even
+        for x in self.data:
+            self.assertFalse(p(x))
+        self.assertEqual(len(self.calls), len(set(self.data)))
+
+    def test_threads(self):
+        f = Function(square).memoize(maxsize=4)
+        errors = []
+
+        def work():
+            for x in self.data:
+                if f(x) != x ** 2:
+                    errors.append(x)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        info = f.cache_info()
+        self.assertEqual(info.hits + info.misses, 4 * len(self.data))
+        self.assertLessEqual(info.currsize, 4)
+
+    def test_pickle(self):
+        f = Function(square).memoize(maxsize=16)
+        f(3)
+        g = pickle.loads(pickle.dumps(f))
+        self.assertEqual(g(4), 16)
+        self.assertEqual(g.cache_info(), CacheInfo(0, 1, 0, 16, 1))
@@ -0,0 +1,212 @@
+import unittest
+from random import randint
+from pfpy import Function, Predicate, identity, constant
+from pfpy.curried import sorted, take, getitem, map, bottom_k, eq, ne, lt, le, gt, ge
+from functools import reduce
+import operator
+
+def negate(x):
+    return -x
+
+class OptimizeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = [randint(-1000, 1000) for _ in range(500)]
+
+    def test_sorted_take(self):
+        for f in [sorted(None) >> take(10),
+                  map(abs) >> sorted(negate) >> take(10) >> len,
+                  sorted(negate) >> getitem(slice(None, 25)),
+                  sorted(negate) >> getitem(slice(0, 25, 1))]:
+            g = f.optimize()
+            self.assertIsNot(g, f)
+            self.assertEqual(g(self.data), f(self.data))
+            self.assertNotIn("sorted", g.explain().split("After:")[1])
+
+        g = (map(abs) >> sorted(None) >> take(3)).optimize()
+        self.assertEqual(len(g._f.stages), 2)
+        self.assertIs(g._f.stages[1]._f.func, bottom_k._f.curry.func)
+
+    def test_unchanged(self):
+        for f in [sorted(None) >> getitem(slice(1, 10)),
+                  sorted(None) >> getitem(slice(None, 10, 2)),
+                  sorted(None) >> getitem(0),
+                  take(10) >> sorted(None),
+                  identity + identity]:
+            self.assertIs(f.optimize(), f)
+
+    def test_nested(self):
+        f = (sorted(None) >> take(2) >> sum) + (sorted(None) >> take(2) >> len)
+        g = f.optimize()
+        self.assertEqual(g(self.data), f(self.data))
+
+        p = Predicate(sorted(None) >> take(1) >> getitem(0) >> gt(0)) & gt(5)
+        q = p.optimize()
+        self.assertIsInstance(q, Predicate)
+        self.assertEqual([q([x, -x]) for x in self.data], [p([x, -x]) for x in self.data])
+
+    def test_sharing(self):
+        shared = sorted(None) >> take(5) >> sum
+        f = (shared + shared).optimize()
+        left, right = f._f.operands
+        self.assertIs(left, right)
+
+class SimplifyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = [randint(-1000, 1000) for _ in range(500)]
+
+        # Functions
+        self.f = Function(negate)
+        self.p = gt(0)
+
+    def assertSimplified(self, f, expected):
+        g = f.optimize()
+        self.assertEqual(g.explain().split("After:\n")[1], expected)
+        self.assertEqual([g(x) for x in self.data], [f(x) for x in self.data])
+
+    def test_identity(self):
+        f = self.f
+        self.assertSimplified(f @ identity, "negate")
+        self.assertSimplified(identity >> f >> identity, "negate")
+        self.assertSimplified(identity >> identity, "identity")
+
+    def test_constants(self):
+        self.assertSimplified(constant(2) * constant(3) + identity, "+\n  constant(6)\n  identity")
+        self.assertSimplified(-constant(2) ** 3, "constant(-8)")
+        g = (constant(1) // constant(0)).optimize()  # Errors are raised when called, not when optimizing
+        with self.assertRaises(ZeroDivisionError):
+            g(1)
+
+    def test_operators(self):
+        f, p = self.f, self.p
+        self.assertSimplified(-(-f), "negate")
+        self.assertSimplified(-(-(-f)), "-\n  negate")
+        self.assertSimplified((f ** 2) ** 3, "**\n  negate\n  constant(6)")
+        self.assertSimplified(((identity ** 2) ** 2) ** 2, "**\n  identity\n  constant(8)")
+        self.assertSimplified(2 * (3 * (4 * f)), "*\n  constant(24)\n  negate")
+
+        q = ~~p
+        self.assertSimplified(q, "bool\n  gt(0)")
+        self.assertSimplified(~~~~p, "bool\n  gt(0)")
+        self.assertSimplified(~~~p, "~\n  gt(0)")
+        self.assertEqual([q.optimize().compile()(x) for x in self.data], [q(x) for x in self.data])
+
+    def test_unsafe_powers(self):
+        f = (identity ** 2) ** 0.5
+        self.assertIs(f.optimize(), f)  # Would turn |x| into x
+        f = (identity ** -1) ** -1
+        self.assertIs(f.optimize(), f)
+
+    def test_idempotent(self):
+        p = self.p
+        self.assertSimplified(p & p, "gt(0)")
+        self.assertSimplified(gt(0) | gt(0), "gt(0)")
+        self.assertSimplified(p & gt(1) & p, "intervals(1)\n  identity")
+        self.assertSimplified(~~(p & p) | ~~(gt(0) & gt(0)), "bool\n  gt(0)")
+
+    def test_polynomial(self):
+        from math import factorial, exp
+        taylor = sum((pow(-1, k) / factorial(2 * k + 1)) * (identity ** (2 * k + 1)) for k in range(20))
+        g = taylor.optimize()
+        self.assertEqual(g.explain().split("After:\n")[1], "polynomial(degree 39)\n  identity")
+        for x in [-3, -0.5, 0, 1, 2.5]:
+            self.assertAlmostEqual(g(x), taylor(x), places=12)
+            self.assertAlmostEqual(g.compile()(x), taylor(x), places=12)
+
+        # Shifted series are evaluated in the shifted variable, which expanding would cancel out
+        shifted = sum((exp(30) / factorial(k)) * (identity - constant(30)) ** k for k in range(30))
+        g = shifted.optimize()
+        self.assertEqual(g.explain().split("After:\n")[1],
+                         "polynomial(degree 29)\n  -\n    identity\n    constant(30)")
+        for x in [29, 30, 30.5, 31]:
+            self.assertAlmostEqual(g(x) / shifted(x), 1, places=12)
+            self.assertAlmostEqual(g.compile()(x) / shifted(x), 1, places=12)
+        self.assertNotIn("polynomial", ((identity + constant(1)) ** 2 + identity ** 3 + identity).optimize().explain())
+
+        f = self.f
+        self.assertSimplified(f * f * f + 2 * f ** 2 - f - constant(1), "polynomial(degree 3)\n  negate")
+        self.assertSimplified((identity + constant(1)) * (identity - constant(1)) + identity, "polynomial(degree 2)\n  identity")
+
+    def test_not_polynomial(self):
+        f = self.f
+        for g in [identity + identity, f ** 2, 2 * f ** 3, ((identity ** 2) ** 2) ** 2,
+                  f ** 2 + Function(abs), identity ** 2.0 + identity ** 2 + identity,
+                  identity ** 2 / constant(2) + identity]:
+            self.assertNotIn("polynomial", g.optimize().explain())
+
+    def test_membership(self):
+        words = ["w{}".format(i) for i in range(100)]
+        p = reduce(operator.or_, [getitem("k") >> eq(w) for w in words])
+        q = p.optimize()
+        self.assertEqual(q.explain().split("After:\n")[1], "in(100 values)\n  getitem('k')")
+        for record in [{"k": "w0"}, {"k": "w99"}, {"k": "w100"}, {"k": ["w0"]}]:
+            self.assertEqual(q(record), p(record))
+
+        p = reduce(operator.and_, [ne(w) for w in words])
+        q = p.optimize()
+        self.assertEqual(q.explain().split("After:\n")[1], "not in(100 values)\n  identity")
+        self.assertEqual([q(w) for w in ["w5", "x", 5]], [p(w) for w in ["w5", "x", 5]])
+
+    def test_intervals(self):
+        ps = [(gt(0) & lt(5)) | (ge(10) & le(20)) | eq(30) | (gt(4) & lt(10)) | lt(-100),
+              gt(0) & lt(50) & ge(-10) & le(20) & ne(7),
+              (gt(3) & lt(5)) | ge(40),
+              (lt(0) | gt(10)) & (lt(-5) | gt(20)),
+              le(2) | eq(3) | ge(3)]
+        for p in ps:
+            q = p.optimize()
+            self.assertIn("intervals", q.explain().split("After:")[1])
+            for x in [y / 2 for y in range(-250, 100)] + [float("nan")]:
+                self.assertEqual(q(x), p(x), x)
+
+        p = getitem(0) >> ge("b") & (getitem(0) >> lt("d"))
+        q = p.optimize()
+        self.assertEqual(q.explain().split("After:\n")[1], "intervals(1)\n  getitem(0)")
+        self.assertEqual([q(x) for x in ["a", "b", "c", "d"]], [p(x) for x in ["a", "b", "c", "d"]])
+
+        # Values that cannot be ordered raise errors exactly where they did before
+        is_str = Predicate(lambda x: isinstance(x, str))
+        for p in [eq(1) & is_str & gt(0) & lt(5), eq(1) | is_str | gt(5)]:
+            self.assertTrue(p.optimize()("a") is p("a"))
+        with self.assertRaises(TypeError):
+            (gt(0) & is_str & lt(5)).optimize()("a")
+
+        # Checks in between that raise errors are still short-circuited
+        p = (getitem("kind") >> eq("x")) | (getitem("n") >> gt(0)) | (getitem("kind") >> gt("m"))
+        self.assertTrue(p.optimize()({"kind": "x", "n": None}))
+        self.assertEqual([p.optimize()({"kind": k, "n": 0}) for k in "xyz"], [p({"kind": k, "n": 0}) for k in "xyz"])
+        p = (getitem("kind") >> lt("x")) & (getitem("n") >> gt(0)) & (getitem("kind") >> gt("m"))
+        self.assertFalse(p.optimize()({"kind": "z", "n": None}))
+
+        # None is not an unbounded end when compared with
+        for p in [gt(3) & eq(None), ge(0) & le(None), gt(None) & lt(5), eq(None) & ge(0) & le(5),
+                  eq(None) | gt(3), lt(0) | le(None) | gt(5), gt(None) | lt(3), eq(None) | eq(3) | gt(5)]:
+            q = p.optimize()
+            for x in [None, -1, 1, 5, 10]:
+                try:
+                    expected = p(x)
+                except TypeError:
+                    with self.assertRaises(TypeError):
+                        q(x)
+                else:
+                    self.assertEqual(q(x), expected, (p, x))
+
+    def test_unmerged(self):
+        f = self.f
+        for p in [eq("a") | ne("b"), gt(0) & lt("a"), (getitem(0) >> eq(1)) | (getitem(1) >> eq(2)),
+                  eq([1]) | eq([2]), gt(float("nan")) & lt(1), ne(1) | ne(2),
+                  gt(3) & lt(3), le(2) | eq(2) | ge(2), eq(1) & eq(2)]:
+            self.assertNotIn("in(", p.optimize().explain().split("After:")[1])
+            self.assertNotIn("intervals", p.optimize().explain().split("After:")[1])
+
+        p = eq(1) | eq(2) | Predicate(f >> gt(0)) | eq(3)
+        self.assertEqual(p.optimize().explain().split("After:\n")[1],
+                         "|\n  in(2 values)\n    identity\n  >>\n    negate\n    gt(0)\n  eq(3)")
+
+        # Checks in between that raise errors are still evaluated first
+        for p in [eq(1) | gt(0) | eq(None), ne(1) & lt(0) & ne(None)]:
+            with self.assertRaises(TypeError):
+                p.optimize()(None)
+
+    def test_explain(self):
+        text = (identity >> self.f).explain()
+        self.assertEqual(text, "Before:\n>>\n  identity\n  negate\nAfter:\nnegate")
@@ -1,6 +1,9 @@
 import unittest
 from random import randint, sample
-from pfpy import Predicate
+from functools import reduce
+from pfpy import Predicate, Pipeline
+from pfpy._expression import Conjunction
+import operator
 
 class PredicateTestCase(unittest.TestCase):
     def setUp(self):
@@ -37,6 +40,44 @@ class PredicateTestCase(unittest.TestCase):
         self.assertEqual((is_positive @ abs)(x), is_positive(abs(x)))
         self.assertEqual((abs >> is_positive)(x), is_positive(abs(x)))
 
+    def test_deep_chains(self):
+        x, is_positive, is_even = self.x, self.is_positive, self.is_even
+        n = 5000
+
+        p = reduce(operator.and_, [is_positive] * n + [is_even])
+        self.assertIsInstance(p._f, Conjunction)
+        self.assertEqual(len(p._f.operands), n + 1)
+        self.assertEqual(p(x), is_positive(x) and is_even(x))
+        self.assertEqual(p.compile()(x), p(x))
+
+        p = reduce(operator.or_, [is_even] + [is_positive] * n)
+        self.assertEqual(len(p._f.operands), n + 1)
+        self.assertEqual(p(x), is_even(x) or is_positive(x))
+
+        p = is_even & (is_positive & is_even)
+        self.assertEqual(p._f.operands, (is_even, is_positive, is_even))
+
+        p = is_even
+        for _ in range(n):
+            p = is_positive | p  # Nested on the right
+        self.assertEqual(len(p._f.operands), n + 1)
+        self.assertEqual(p(x), is_positive(x) or is_even(x))
+
+        q = is_even & is_positive
+        a, b = q & is_even, q & is_positive
+        self.assertEqual(a._f.operands, (is_even, is_positive, is_even))
+        self.assertEqual(b._f.operands, (is_even, is_positive, is_positive))
+
+    def test_composition_flattening(self):
+        x, is_positive = self.x, self.is_positive
+
+        p = abs >> (abs >> is_positive)
+
+        self.assertIs(type(p), Predicate)
+        self.assertIsInstance(p._f, Pipeline)
+        self.assertEqual(p._f.stages, (abs, abs, is_positive))
+        self.assertEqual(p(x), is_positive(abs(x)))
+
     def test_application(self):
         x, is_positive = self.x, self.is_positive
 
@@ -0,0 +1,65 @@
+import unittest
+from random import sample
+from pfpy import Function, Predicate, Profile, unary, identity, constant
+from pfpy.curried import add, mul, gt
+
+@unary
+def inverse(x):
+    return 1 / x
+
+class ProfileTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = sample(range(-1000, 1000), 100)
+
+        # Functions
+        self.sqr = identity ** 2
+        self.f = add(1) >> (self.sqr + inverse * constant(2)) >> mul(3)
+
+    def test_equivalence(self):
+        profile = self.f.profile()
+        self.assertIsInstance(profile, Profile)
+        self.assertIsInstance(profile.function, Function)
+        for x in self.data:
+            if x != -1:
+                self.assertEqual(profile(x), self.f(x))
+
+        p = gt(0) & ~Predicate(lambda x: x % 2 == 0)
+        profile = p.profile()
+        self.assertIsInstance(profile.function, Predicate)
+        self.assertEqual([profile(x) for x in self.data], [p(x) for x in self.data])
+
+    def test_table(self):
+        profile = self.f.profile()
+        data = [x for x in self.data if x != -1]
+        for x in data:
+            profile(x)
+
+        table = profile.table()
+        self.assertEqual([(row.label, row.depth) for row in table],
+                         [(">>", 0), ("add(1)", 1), ("+", 1), ("**", 2), ("*", 2), ("inverse", 3), ("mul(3)", 1)])
+        for row in table:
+            self.assertEqual(row.calls, len(data))
+            self.assertGreaterEqual(row.cumulative_time, row.self_time)
+        self.assertAlmostEqual(table[0].cumulative_time, sum(row.self_time for row in table))
+        self.assertIn("inverse", str(profile))
+
+    def test_tree(self):
+        profile = self.f.profile()
+        profile(1)
+        tree = profile.tree()
+        self.assertEqual(tree["label"], ">>")
+        self.assertEqual([child["label"] for child in tree["children"]], ["add(1)", "+", "mul(3)"])
+        self.assertEqual(tree["children"][1]["children"][1]["children"][0]["label"], "inverse")
+
+    def test_exceptions(self):
+        profile = self.f.profile()
+        with self.assertRaises(ZeroDivisionError):
+            profile(-1)
+        self.assertEqual([row.exceptions for row in profile.table()], [1, 0, 1, 0, 1, 1, 0])
+        self.assertEqual([row.calls for row in profile.table()], [1, 1, 1, 1, 1, 1, 0])
+
+    def test_original(self):
+        f = self.f
+        stages = f._f.stages
+        f.profile()
+        self.assertIs(f._f.stages, stages)  # The original Function is not instrumented
@@ -0,0 +1,43 @@
+import unittest
+import tempfile
+import os
+from random import randint
+from pfpy import external_sorted
+from pfpy.curried import top_k, bottom_k, take
+from pfpy.curried import external_sorted as curried_external_sorted
+
+def last_digit(x):
+    return x % 10
+
+class SortingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = [randint(-1000, 1000) for _ in range(2000)]
+
+    def test_top_k(self):
+        for k in [0, 1, 10, 5000]:
+            self.assertEqual(top_k(None, k)(self.data), sorted(self.data, reverse=True)[:k])
+            self.assertEqual(top_k(last_digit)(k)(iter(self.data)), sorted(self.data, key=last_digit, reverse=True)[:k])
+            self.assertEqual(bottom_k(None, k)(self.data), sorted(self.data)[:k])
+            self.assertEqual(bottom_k(last_digit, k)(iter(self.data)), sorted(self.data, key=last_digit)[:k])
+
+    def test_take(self):
+        self.assertEqual(take(10)(self.data), self.data[:10])
+        self.assertEqual(take(10)(iter(self.data)), self.data[:10])
+        self.assertEqual(take(10)([1, 2]), [1, 2])
+
+    def test_external_sorted(self):
+        for chunksize in [1, 7, 500, 5000]:
+            self.assertEqual(list(external_sorted(self.data, chunksize=chunksize)), sorted(self.data))
+            self.assertEqual(list(external_sorted(iter(self.data), key=last_digit, reverse=True, chunksize=chunksize)),
+                             sorted(self.data, key=last_digit, reverse=True))
+        self.assertEqual(list(curried_external_sorted(last_digit)(self.data)), sorted(self.data, key=last_digit))
+        self.assertEqual(list(external_sorted([])), [])
+        with self.assertRaises(ValueError):
+            external_sorted(self.data, chunksize=0)  # Before iterating
+
+    def test_spilling(self):
+        with tempfile.TemporaryDirectory() as directory:
+            items = external_sorted(self.data, chunksize=100, directory=directory)
+            self.assertEqual(next(items), min(self.data))
+            items.close()
+            self.assertEqual(os.listdir(directory), [])
@@ -0,0 +1,108 @@
+import unittest
+import os
+import tempfile
+import threading
+from pfpy import _source, read_lines, read_records, read_chunks
+from pfpy.curried import map, filter
+from pfpy.curried import read_lines as curried_read_lines, read_records as curried_read_records
+from pfpy.curried import read_chunks as curried_read_chunks
+
+class SourceTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.lines = ["{},{}".format(i, "é" * (i % 5)) for i in range(1000)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, data, name="data"):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "wb") as file:
+            file.write(data)
+        return path
+
+    def test_lines(self):
+        text = "\n".join(self.lines)
+        for data in [text, text + "\n", text.replace("\n", "\r\n") + "\r\n"]:
+            path = self.write(data.encode("utf-8"))
+            self.assertEqual(list(read_lines(path, "utf-8")), self.lines)
+            self.assertEqual(list(read_lines(path)), [line.encode("utf-8") for line in self.lines])
+        self.assertEqual(list(read_lines(self.write(b"a\n\nb\r"))), [b"a", b"", b"b\r"])
+
+    def test_small_blocks(self):
+        block_size = _source.block_size
+        _source.block_size = 7  # Splits lines, multi-byte characters and delimiters across blocks
+        try:
+            path = self.write("\r\n".join(self.lines).encode("utf-8"))
+            self.assertEqual(list(read_lines(path, "utf-8")), self.lines)
+            path = self.write("<>".join(self.lines).encode("utf-8"))
+            self.assertEqual(list(read_records(path, "<>", "utf-8")), self.lines)
+
+            # Records many blocks long, ending right before or across a block boundary
+            for n in [69, 70, 71]:
+                lines = ["é" * n, "", "x" * n + "\r", "y"]
+                path = self.write("\r\n".join(lines).encode("utf-8"))
+                self.assertEqual(list(read_lines(path, "utf-8")), lines)
+                path = self.write("<>".join(lines).encode("utf-8"))
+                self.assertEqual(list(read_records(path, "<>", "utf-8")), lines)
+        finally:
+            _source.block_size = block_size
+
+    def test_overlapping_delimiter(self):
+        block_size = _source.block_size
+        try:
+            for _source.block_size in [block_size, 1, 2, 3]:
+                path = self.write(b"a\n\n\nb\n\n\n\n\nc")
+                self.assertEqual(list(read_records(path, b"\n\n")), [b"a", b"\nb", b"", b"\nc"])
+                path = self.write(b"xaaa")
+                self.assertEqual(list(read_records(path, b"aa")), [b"x", b"a"])
+                self.assertEqual(list(read_records(path, "aa", "ascii")), ["x", "a"])
+        finally:
+            _source.block_size = block_size
+
+    def test_records(self):
+        path = self.write(b"a;b;;c;")
+        self.assertEqual(list(read_records(path, b";")), [b"a", b"b", b"", b"c"])
+        self.assertEqual(list(read_records(path, ";", "ascii")), ["a", "b", "", "c"])
+        with self.assertRaises(ValueError):
+            read_records(path, b"")
+
+    def test_empty(self):
+        path = self.write(b"")
+        self.assertEqual(list(read_lines(path)), [])
+        self.assertEqual(list(read_records(path, b";")), [])
+        self.assertEqual(list(read_chunks(path, 10)), [])
+
+    def test_chunks(self):
+        data = bytes(range(256)) * 41
+        path = self.write(data)
+        chunks = list(read_chunks(path, 1000))
+        self.assertIsInstance(chunks[0], memoryview)
+        self.assertTrue(chunks[0].readonly)
+        self.assertEqual([len(chunk) for chunk in chunks], [1000] * 10 + [496])
+        self.assertEqual(b"".join(chunks), data)
+        with self.assertRaises(ValueError):
+            read_chunks(path, 0)
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "requires named pipes")
+    def test_pipe(self):
+        path = os.path.join(self.directory.name, "pipe")
+        os.mkfifo(path)
+
+        def write():
+            with open(path, "wb") as file:
+                file.write("\n".join(self.lines).encode("utf-8"))
+        writer = threading.Thread(target=write)
+        writer.start()
+        self.assertEqual(list(read_lines(path, "utf-8")), self.lines)  # Pipes cannot be memory mapped
+        writer.join()
+
+    def test_curried(self):
+        path = self.write("\n".join(self.lines).encode("utf-8"))
+        count = curried_read_lines >> map(bytes.decode) >> filter(lambda line: line.endswith("é")) >> list >> len
+        self.assertEqual(count(path), 800)
+        self.assertEqual(len(list(curried_read_records(b",")(path))), 1001)
+        self.assertEqual(sum(map(len)(curried_read_chunks(100)(path))), os.path.getsize(path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import pickle
+import operator
+from random import sample
+from pfpy import Function
+from pfpy.curried import map, filter, reduce, add, mul, gt
+
+def is_odd(x):
+    return x % 2 == 1
+
+class StreamTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = sample(range(-10000, 10000), 1000)
+
+    def test_reduce(self):
+        p = map(mul(3)) >> filter(is_odd) >> map(add(1)) >> reduce(operator.add)
+        s = p.stream(chunksize=7)
+        self.assertEqual(len(s._f.stages), 1)  # Every stage is fused into one loop
+        self.assertEqual(s(self.data), p(self.data))
+        with self.assertRaises(TypeError):
+            s([])
+
+    def test_lazy(self):
+        p = map(mul(3)) >> filter(gt(0)) >> filter(None) >> map(abs) >> list
+        for chunksize in [1, 7, 1024]:
+            s = p.stream(chunksize=chunksize)
+            self.assertEqual(len(s._f.stages), 2)
+            self.assertEqual(s(self.data), p(self.data))
+
+        consumed = []
+        s = (map(lambda x: consumed.append(x) or x) >> filter(is_odd)).stream(chunksize=10)
+        it = s(iter(self.data))
+        self.assertEqual(consumed, [])
+        next(it, None)
+        self.assertLessEqual(len(consumed), len(self.data))
+
+    def test_unfused(self):
+        p = Function(sorted) >> map(abs) >> sum
+        s = p.stream()
+        self.assertEqual(len(s._f.stages), 3)  # A single map is left as is
+        self.assertEqual(s(self.data), p(self.data))
+
+        p = reduce(operator.add) >> map(abs) >> list
+        self.assertEqual(p.stream()([[1], [-2]]), p([[1], [-2]]))
+
+    def test_pickle(self):
+        p = (map(mul(3)) >> filter(is_odd) >> reduce(operator.add)).stream()
+        self.assertEqual(pickle.loads(pickle.dumps(p))(self.data), p(self.data))
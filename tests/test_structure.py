@@ -0,0 +1,59 @@
+import unittest
+import os
+import pickle
+import subprocess
+import sys
+import pfpy
+from random import sample
+from pfpy import Function, identity, constant, structure, rebuild, fingerprint
+from pfpy.curried import add, mul, eq, gt, lt, ge, getitem, map
+
+def square(x):
+    return x * x
+
+class StructureTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = sample(range(-1000, 1000), 100)
+
+        # Functions
+        self.square = Function(square)
+
+    def build(self):
+        f = (self.square + identity * constant(3)) >> add(1) >> mul(2)
+        p = (gt(0) & ~lt(100)) | (f >> gt(50))
+        return f, p
+
+    def test_round_trip(self):
+        f, p = self.build()
+        rows = [[x] for x in self.data]
+        for g, data in [(f, self.data), (p, self.data), (f.compile(), self.data), (p.compile(cse=True), self.data),
+                        (f.memoize(maxsize=4), self.data), (self.square ** 3, self.data),
+                        ((self.square ** 2 + 3 * self.square + constant(1)).optimize(), self.data),
+                        (getitem(0) >> self.square, rows), ((map(abs) >> sum).stream(), [self.data]),
+                        ((eq(1) | eq(5) | (gt(10) & lt(20)) | ge(500)).optimize(), self.data)]:
+            h = rebuild(structure(g))
+            self.assertIs(type(h), type(g))
+            self.assertEqual([h(x) for x in data], [g(x) for x in data])
+        self.assertEqual(structure(identity), ("leaf", identity))
+
+    def test_fingerprint(self):
+        (f, p), (g, q) = self.build(), self.build()
+        self.assertIsNot(f, g)
+        self.assertEqual(fingerprint(f), fingerprint(g))
+        self.assertEqual(fingerprint(p), fingerprint(q))
+        self.assertEqual(fingerprint(f), fingerprint(pickle.loads(pickle.dumps(f))))
+        self.assertNotEqual(fingerprint(f), fingerprint(p))
+        self.assertNotEqual(fingerprint(f >> add(1)), fingerprint(f >> add(2)))
+        self.assertNotEqual(fingerprint(f), fingerprint(f.compile()))
+
+    def test_hash_seed(self):
+        code = ("from pfpy import constant, fingerprint\n"
+                "from pfpy.curried import eq, getitem\n"
+                "p = (getitem('city') >> (eq('Toronto') | eq('Ottawa') | eq('Montreal') | eq('Calgary'))).optimize()\n"
+                "print(fingerprint(p), fingerprint(constant(({'a', 'b', 'c'}, [frozenset({b'x', b'y'})]))))")
+        fingerprints = set()
+        for seed in ["1", "2"]:
+            env = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=os.path.dirname(os.path.dirname(pfpy.__file__)))
+            fingerprints.add(subprocess.check_output([sys.executable, "-c", code], env=env))
+        self.assertEqual(len(fingerprints), 1)
+        self.assertNotEqual(fingerprint(constant({1})), fingerprint(constant(("set", (1,)))))
@@ -0,0 +1,138 @@
+import unittest
+from math import factorial
+from pfpy import Function, Predicate, identity, constant
+from pfpy.curried import lt, le, eq, ne, gt, ge, is_, contains, add, mod, getitem
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+@unittest.skipUnless(numpy, "requires numpy")
+class VectorizeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = numpy.linspace(-3, 3, 100)
+
+        # Function
+        self.f = Function(lambda x: x + 6)
+
+    def assertMapsElementwise(self, h):
+        data = self.data
+        numpy.testing.assert_allclose(h.vectorize()(data), [h(x) for x in data.tolist()])
+
+    def test_arithmetic(self):
+        x2 = identity ** 2
+
+        for h in [+x2, -x2, x2 + identity, x2 - identity, x2 * identity, x2 / (identity + constant(10)),
+                  (x2 + constant(10)) // identity, 3 * x2, x2 ** 3, identity ** -1 + constant(1)]:
+            self.assertMapsElementwise(h)
+
+    def test_opaque(self):
+        f = self.f
+
+        for h in [f, f + identity, 2 * f ** 2, (identity >> f) * identity, f >> (identity ** 2)]:
+            self.assertMapsElementwise(h)
+
+    def test_constant(self):
+        data = self.data
+
+        numpy.testing.assert_array_equal(constant(4).vectorize()(data), numpy.full(data.shape, 4))
+
+    def test_integer_power(self):
+        data = numpy.arange(1, 10)
+
+        numpy.testing.assert_allclose((identity ** -2).vectorize()(data),
+                                      [x ** -2 for x in data.tolist()])
+
+    def test_overflow(self):
+        data = numpy.array([3, -2, 0])
+        big = numpy.array([2 ** 62, 1])
+        for h, x in [(identity ** 40, data), (identity * constant(2 ** 62), data), (identity + identity, big),
+                     (-identity, numpy.array([-2 ** 63])), (identity - constant(1), numpy.array([0], dtype=numpy.uint8)),
+                     (identity * identity, numpy.array([True, False])), (add(2 ** 70), data),
+                     ((identity ** 2 + 3 * identity).optimize(), big)]:
+            self.assertEqual(h.vectorize()(x).tolist(), [h(y) for y in x.tolist()])
+        self.assertEqual((identity * constant(2)).vectorize()(data).dtype, data.dtype)  # Kept while results fit
+
+        for h in [identity / constant(0), constant(1) // identity, mod(0), constant(1.0) / identity]:
+            with self.assertRaises(ZeroDivisionError):
+                h.vectorize()(data)
+        with self.assertRaises(OverflowError):
+            (identity ** 2).vectorize()(numpy.array([1e200]))
+
+    def test_taylor_series(self):
+        series = ((pow(-1, k) / factorial(2 * k + 1)) * (identity ** (2 * k + 1))
+                  for k in range(20))
+        my_sin = sum(series).vectorize()
+
+        numpy.testing.assert_allclose(my_sin(self.data), numpy.sin(self.data), atol=1e-12)
+
+    def test_polynomial(self):
+        h = (identity ** 3 - 2 * identity ** 2 + self.f + constant(1)).optimize()
+        self.assertIn("polynomial", h.explain())
+        self.assertMapsElementwise(h)
+
+@unittest.skipUnless(numpy, "requires numpy")
+class MaskTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = numpy.arange(-50, 50)
+        self.columns = {
+            "age": numpy.array([25, 40, 31, 67, 18]),
+            "city": numpy.array(["Toronto", "Vancouver", "Toronto", "Ottawa", "Toronto"]),
+        }
+
+    def assertMasks(self, p, data):
+        if isinstance(data, dict):
+            rows = [dict(zip(data, row)) for row in zip(*data.values())]
+        elif data.dtype.names:
+            rows = list(data)
+        else:
+            rows = data.tolist()
+        numpy.testing.assert_array_equal(p.mask(data), [bool(p(row)) for row in rows])
+
+    def test_comparisons(self):
+        for p in [lt(3), le(3), eq(3), ne(3), gt(3), ge(3), ~gt(3), gt(-10) & lt(10), lt(-10) | ge(10),
+                  ~(gt(-10) & lt(10)) | eq(0), add(3) >> gt(0), mod(2) >> eq(0)]:
+            self.assertMasks(p, self.data)
+
+    def test_columns(self):
+        for p in [getitem("age") >> gt(30),
+                  (getitem("city") >> eq("Toronto")) & (getitem("age") >> lt(35)),
+                  getitem("city") >> contains("onto"),
+                  Predicate(lambda row: row["age"] % 2 == 0) | (getitem("city") >> ne("Toronto"))]:
+            self.assertMasks(p, self.columns)
+
+    def test_merged(self):
+        for p in [eq(3) | eq(7) | eq(2.5), ne(3) & ne(-4), (gt(0) & lt(5)) | (ge(10) & le(20)) | eq(30) | lt(-40),
+                  gt(-10) & le(10) & ne(0), (lt(-10) | gt(10)) & (lt(-20) | gt(20))]:
+            q = p.optimize()
+            self.assertRegex(q.explain().split("After:")[1], r"in\(|intervals")
+            self.assertMasks(q, self.data)
+            self.assertMasks(q, self.data / 2)
+
+        p = ((getitem("city") >> eq("Toronto")) | (getitem("city") >> eq("Ottawa"))) \
+            & (getitem("age") >> ge(20)) & (getitem("age") >> lt(40))
+        self.assertMasks(p.optimize(), self.columns)
+        self.assertMasks(((ge("b") & lt("d")) | eq("z")).optimize(), numpy.array(list("abcdz")))
+        self.assertMasks((eq("a") | eq("b")).optimize(), self.data)
+
+    def test_opaque(self):
+        is_even = Predicate(lambda x: x % 2 == 0)
+
+        for p in [is_even, is_even & gt(0), abs >> (is_even | gt(40)), is_(None)]:
+            self.assertMasks(p, self.data)
+
+    def test_contains(self):
+        words = numpy.array(["apple", "banana", "cherry"])
+
+        self.assertMasks(contains("an"), words)
+        self.assertMasks(getitem(0) >> contains("a"), words)
+
+    def test_constant(self):
+        self.assertMasks(Predicate(constant(True)), self.data)
+
+    def test_structured(self):
+        records = numpy.array([(25, 1.5), (40, 2.5), (31, 0.5)], dtype=[("age", int), ("score", float)])
+
+        self.assertMasks(getitem("age") >> gt(30), records)
+        self.assertMasks((getitem("score") >> lt(2)) & (getitem("age") >> ne(25)), records)
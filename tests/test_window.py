@@ -0,0 +1,75 @@
+import unittest
+import operator
+import pickle
+from functools import reduce
+from itertools import accumulate, islice
+from random import randint
+from pfpy import SlidingWindow
+from pfpy.curried import scan, window, windowed_reduce
+
+def concat(a, b):
+    return a + b
+
+class WindowTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = [randint(-1000, 1000) for _ in range(500)]
+
+    def test_scan(self):
+        self.assertEqual(list(scan(operator.add)(self.data)), list(accumulate(self.data)))
+        self.assertEqual(list(scan(max)(iter(self.data))), list(accumulate(self.data, max)))
+        self.assertEqual(list(scan(operator.add)([])), [])
+
+    def test_window(self):
+        self.assertEqual(list(window(3)([1, 2, 3, 4])), [(1, 2, 3), (2, 3, 4)])
+        self.assertEqual(list(window(1)(iter([1, 2]))), [(1,), (2,)])
+        self.assertEqual(list(window(3)([1, 2])), [])
+        with self.assertRaises(ValueError):
+            list(window(0)([1]))
+
+    def test_windowed_reduce(self):
+        for n in [1, 2, 7, 100]:
+            for op in [max, min, operator.add]:
+                expected = [reduce(op, self.data[i:i + n]) for i in range(len(self.data) - n + 1)]
+                self.assertEqual(list(windowed_reduce(op, n)(self.data)), expected)
+
+    def test_order(self):
+        # Associative but not commutative
+        letters = "abcdefghij"
+        self.assertEqual(list(windowed_reduce(concat, 3)(letters)),
+                         [letters[i:i + 3] for i in range(len(letters) - 2)])
+
+    def test_calls(self):
+        calls = []
+
+        def counted_max(a, b):
+            calls.append(None)
+            return max(a, b)
+        list(windowed_reduce(counted_max, 100)(self.data))
+        self.assertLess(len(calls), 3 * len(self.data))
+
+    def test_resumable(self):
+        n = 10
+        expected = list(windowed_reduce(max, n)(self.data))
+        sliding = SlidingWindow(max, n)
+        chunks = iter(self.data)
+        results = []
+        for chunk in iter(lambda: list(islice(chunks, 37)), []):
+            results.extend(sliding.feed(chunk))
+            sliding = pickle.loads(pickle.dumps(sliding))
+        self.assertEqual(results, expected)
+
+        total = SlidingWindow(operator.add)
+        self.assertEqual(list(total.feed([1, 2])) + list(total.feed([3])), [1, 3, 6])
+        self.assertEqual(total.value(), 6)
+
+    def test_empty(self):
+        sliding = SlidingWindow(max, 2)
+        with self.assertRaises(ValueError):
+            sliding.value()
+        with self.assertRaises(IndexError):
+            sliding.pop()
+        with self.assertRaises(ValueError):
+            SlidingWindow(max, 0)
+
+if __name__ == '__main__':
+    unittest.main()